@@ -0,0 +1,87 @@
+"""
+Compare two result files of ``benchmarks.run``, e.g. of two commits.
+
+Prints the ratio (new / old) of every measurement per query and exits
+with a non-zero status if any timing regressed by more than the threshold.
+
+Usage::
+
+    python -m benchmarks.compare baseline.json results.json --threshold 1.2
+"""
+import json
+import sys
+from argparse import ArgumentParser
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+METRICS = ["planning_time", "execution_time", "peak_memory", "tasks"]
+TIMING_METRICS = ["planning_time", "execution_time"]
+
+
+def compare(old: Dict, new: Dict) -> pd.DataFrame:
+    """Ratio of the measurements (new / old) of all queries which succeeded in both runs"""
+    rows = {}
+    for name in sorted(set(old["queries"]) | set(new["queries"])):
+        old_result = old["queries"].get(name, {"status": "missing"})
+        new_result = new["queries"].get(name, {"status": "missing"})
+
+        row = {"old status": old_result["status"], "new status": new_result["status"]}
+        for metric in METRICS:
+            old_value = old_result.get(metric)
+            new_value = new_result.get(metric)
+            row[metric] = new_value / old_value if old_value and new_value else None
+        rows[name] = row
+
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def find_regressions(
+    ratios: pd.DataFrame, threshold: float
+) -> List[Tuple[str, str, float]]:
+    """Queries which started failing or whose timings grew by more than the threshold"""
+    regressions = []
+    for name, row in ratios.iterrows():
+        if row["old status"] == "ok" and row["new status"] != "ok":
+            regressions.append((name, "status", None))
+            continue
+        for metric in TIMING_METRICS:
+            if pd.notna(row[metric]) and row[metric] > threshold:
+                regressions.append((name, metric, row[metric]))
+    return regressions
+
+
+def main():  # pragma: no cover
+    parser = ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old", help="Result file of the baseline")
+    parser.add_argument("new", help="Result file to compare against the baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Ratio of a timing above which a query counts as regressed",
+    )
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"old: {old['metadata'].get('commit')}, new: {new['metadata'].get('commit')}")
+    ratios = compare(old, new)
+    print(ratios.to_string(float_format="{:.2f}".format))
+
+    regressions = find_regressions(ratios, args.threshold)
+    for name, metric, ratio in regressions:
+        if ratio is None:
+            print(
+                f"{name} fails: {new['queries'].get(name, {}).get('error', 'missing')}"
+            )
+        else:
+            print(f"{name}: {metric} regressed by a factor of {ratio:.2f}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
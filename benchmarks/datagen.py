@@ -0,0 +1,402 @@
+"""
+Generator for TPC-H-like tables, written as local parquet files.
+
+The tables follow the schema, the cardinalities (relative to the scale factor)
+and the value domains of the TPC-H specification closely enough for the
+standard queries to select, join and aggregate realistic amounts of data.
+The data is random (but reproducible for a given seed) and is not meant
+to produce the official answer sets.
+
+Usage::
+
+    python -m benchmarks.datagen --scale-factor 1 --output-dir tpch-sf1
+"""
+import logging
+import os
+from argparse import ArgumentParser
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TABLES = [
+    "region",
+    "nation",
+    "supplier",
+    "customer",
+    "part",
+    "partsupp",
+    "orders",
+    "lineitem",
+]
+
+START_DATE = np.datetime64("1992-01-01")
+END_DATE = np.datetime64("1998-08-02")
+CURRENT_DATE = np.datetime64("1995-06-17")
+
+REGIONS = ["AFRICA", "AMERICA", "ASIA", "EUROPE", "MIDDLE EAST"]
+NATIONS = [
+    ("ALGERIA", 0),
+    ("ARGENTINA", 1),
+    ("BRAZIL", 1),
+    ("CANADA", 1),
+    ("EGYPT", 4),
+    ("ETHIOPIA", 0),
+    ("FRANCE", 3),
+    ("GERMANY", 3),
+    ("INDIA", 2),
+    ("INDONESIA", 2),
+    ("IRAN", 4),
+    ("IRAQ", 4),
+    ("JAPAN", 2),
+    ("JORDAN", 4),
+    ("KENYA", 0),
+    ("MOROCCO", 0),
+    ("MOZAMBIQUE", 0),
+    ("PERU", 1),
+    ("CHINA", 2),
+    ("ROMANIA", 3),
+    ("SAUDI ARABIA", 4),
+    ("VIETNAM", 2),
+    ("RUSSIA", 3),
+    ("UNITED KINGDOM", 3),
+    ("UNITED STATES", 1),
+]
+
+SEGMENTS = ["AUTOMOBILE", "BUILDING", "FURNITURE", "MACHINERY", "HOUSEHOLD"]
+PRIORITIES = ["1-URGENT", "2-HIGH", "3-MEDIUM", "4-NOT SPECIFIED", "5-LOW"]
+SHIP_MODES = ["REG AIR", "AIR", "RAIL", "SHIP", "TRUCK", "MAIL", "FOB"]
+SHIP_INSTRUCTIONS = ["DELIVER IN PERSON", "COLLECT COD", "NONE", "TAKE BACK RETURN"]
+TYPE_SYLLABLES = [
+    ["STANDARD", "SMALL", "MEDIUM", "LARGE", "ECONOMY", "PROMO"],
+    ["ANODIZED", "BURNISHED", "PLATED", "POLISHED", "BRUSHED"],
+    ["TIN", "NICKEL", "BRASS", "STEEL", "COPPER"],
+]
+CONTAINER_SYLLABLES = [
+    ["SM", "LG", "MED", "JUMBO", "WRAP"],
+    ["CASE", "BOX", "BAG", "JAR", "PKG", "PACK", "CAN", "DRUM"],
+]
+COLORS = (
+    "almond antique aquamarine azure beige bisque black blanched blue blush brown "
+    "burlywood burnished chartreuse chiffon chocolate coral cornflower cornsilk cream "
+    "cyan dark deep dim dodger drab firebrick floral forest frosted gainsboro ghost "
+    "goldenrod green grey honeydew hot indian ivory khaki lace lavender lawn lemon "
+    "light lime linen magenta maroon medium metallic midnight mint misty moccasin "
+    "navajo navy olive orange orchid pale papaya peach peru pink plum powder puff "
+    "purple red rose rosy royal saddle salmon sandy seashell sienna sky slate smoke "
+    "snow spring steel tan thistle tomato turquoise violet wheat white yellow"
+).split()
+WORDS = (
+    "furiously carefully quickly slyly blithely final pending express regular ironic "
+    "special bold packages requests deposits accounts foxes ideas theodolites pinto "
+    "beans instructions dependencies excuses platelets asymptotes courts dolphins "
+    "Customer Complaints sleep wake haggle nag use boost affix detect integrate "
+    "cajole among across above"
+).split()
+
+TEXT_POOL_SIZE = 10_000
+
+
+def generate(
+    scale_factor: float,
+    output_dir: str,
+    partition_size: int = 1_000_000,
+    seed: int = 42,
+):
+    """
+    Generate all tables for the given scale factor and write them as
+    ``<output_dir>/<table>/part.<i>.parquet`` files.
+    Orders (and their line items) are generated and written in chunks of
+    ``partition_size`` orders, so the memory usage does not grow with the scale factor.
+    """
+    rng = np.random.default_rng(seed)
+    sizes = table_sizes(scale_factor)
+
+    _write(_region(), output_dir, "region")
+    _write(_nation(rng), output_dir, "nation")
+    _write(_supplier(rng, sizes["supplier"]), output_dir, "supplier")
+    _write(_customer(rng, sizes["customer"]), output_dir, "customer")
+
+    parts = _part(rng, sizes["part"])
+    _write(parts, output_dir, "part")
+    _write(_partsupp(rng, sizes["part"], sizes["supplier"]), output_dir, "partsupp")
+
+    retail_prices = parts["p_retailprice"].to_numpy()
+    for i, first_key in enumerate(range(1, sizes["orders"] + 1, partition_size)):
+        last_key = min(first_key + partition_size, sizes["orders"] + 1)
+        orders, lineitem = _orders_and_lineitem(
+            rng,
+            np.arange(first_key, last_key),
+            sizes["customer"],
+            sizes["supplier"],
+            retail_prices,
+        )
+        _write(orders, output_dir, "orders", i)
+        _write(lineitem, output_dir, "lineitem", i)
+
+
+def table_sizes(scale_factor: float) -> dict:
+    """Number of rows of the generated tables (lineitem is ~4x orders)"""
+    return {
+        "supplier": max(int(10_000 * scale_factor), 1),
+        "customer": max(int(150_000 * scale_factor), 3),
+        "part": max(int(200_000 * scale_factor), 1),
+        "orders": max(int(1_500_000 * scale_factor), 1),
+    }
+
+
+def _write(df: pd.DataFrame, output_dir: str, table_name: str, partition: int = 0):
+    table_dir = os.path.join(output_dir, table_name)
+    os.makedirs(table_dir, exist_ok=True)
+    path = os.path.join(table_dir, f"part.{partition}.parquet")
+    logger.info(f"Writing {len(df)} rows to {path}")
+    df.to_parquet(path, index=False)
+
+
+def _text(rng, n: int, min_words: int = 4, max_words: int = 10) -> np.ndarray:
+    """Random comments, sampled from a pool to keep the generation fast"""
+    pool = np.array(
+        [
+            " ".join(rng.choice(WORDS, size=rng.integers(min_words, max_words + 1)))
+            for _ in range(min(n, TEXT_POOL_SIZE))
+        ]
+    )
+    return pool[rng.integers(0, len(pool), size=n)]
+
+
+def _phone(rng, nation_keys: np.ndarray) -> pd.Series:
+    n = len(nation_keys)
+    return (
+        pd.Series(nation_keys + 10).astype(str)
+        + "-"
+        + pd.Series(rng.integers(100, 1000, size=n)).astype(str)
+        + "-"
+        + pd.Series(rng.integers(100, 1000, size=n)).astype(str)
+        + "-"
+        + pd.Series(rng.integers(1000, 10000, size=n)).astype(str)
+    )
+
+
+def _money(rng, n: int, low: float, high: float) -> np.ndarray:
+    return np.round(rng.uniform(low, high, size=n), 2)
+
+
+def _region() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "r_regionkey": np.arange(len(REGIONS), dtype="int64"),
+            "r_name": REGIONS,
+            "r_comment": "",
+        }
+    )
+
+
+def _nation(rng) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "n_nationkey": np.arange(len(NATIONS), dtype="int64"),
+            "n_name": [name for name, _ in NATIONS],
+            "n_regionkey": np.array([region for _, region in NATIONS], dtype="int64"),
+            "n_comment": _text(rng, len(NATIONS)),
+        }
+    )
+
+
+def _supplier(rng, n: int) -> pd.DataFrame:
+    keys = np.arange(1, n + 1)
+    nation_keys = rng.integers(0, len(NATIONS), size=n)
+    return pd.DataFrame(
+        {
+            "s_suppkey": keys,
+            "s_name": [f"Supplier#{key:09d}" for key in keys],
+            "s_address": _text(rng, n, 1, 3),
+            "s_nationkey": nation_keys,
+            "s_phone": _phone(rng, nation_keys),
+            "s_acctbal": _money(rng, n, -999.99, 9999.99),
+            "s_comment": _text(rng, n),
+        }
+    )
+
+
+def _customer(rng, n: int) -> pd.DataFrame:
+    keys = np.arange(1, n + 1)
+    nation_keys = rng.integers(0, len(NATIONS), size=n)
+    return pd.DataFrame(
+        {
+            "c_custkey": keys,
+            "c_name": [f"Customer#{key:09d}" for key in keys],
+            "c_address": _text(rng, n, 1, 3),
+            "c_nationkey": nation_keys,
+            "c_phone": _phone(rng, nation_keys),
+            "c_acctbal": _money(rng, n, -999.99, 9999.99),
+            "c_mktsegment": rng.choice(SEGMENTS, size=n),
+            "c_comment": _text(rng, n),
+        }
+    )
+
+
+def _part(rng, n: int) -> pd.DataFrame:
+    keys = np.arange(1, n + 1)
+    manufacturers = rng.integers(1, 6, size=n)
+    types = [rng.choice(syllables, size=n) for syllables in TYPE_SYLLABLES]
+    containers = [rng.choice(syllables, size=n) for syllables in CONTAINER_SYLLABLES]
+    names = np.array(
+        [
+            " ".join(rng.choice(COLORS, size=5, replace=False))
+            for _ in range(min(n, TEXT_POOL_SIZE))
+        ]
+    )
+    return pd.DataFrame(
+        {
+            "p_partkey": keys,
+            "p_name": names[rng.integers(0, len(names), size=n)],
+            "p_mfgr": [f"Manufacturer#{m}" for m in manufacturers],
+            "p_brand": [
+                f"Brand#{m}{b}" for m, b in zip(manufacturers, rng.integers(1, 6, n))
+            ],
+            "p_type": pd.Series(types[0]) + " " + types[1] + " " + types[2],
+            "p_size": rng.integers(1, 51, size=n),
+            "p_container": pd.Series(containers[0]) + " " + containers[1],
+            "p_retailprice": (90000 + ((keys // 10) % 20001) + 100 * (keys % 1000))
+            / 100,
+            "p_comment": _text(rng, n, 1, 4),
+        }
+    )
+
+
+def _supplier_of_part(part_keys: np.ndarray, i, n_suppliers: int) -> np.ndarray:
+    """The i-th (of four) supplier of the given parts, as defined by the specification"""
+    return (
+        part_keys + i * ((n_suppliers // 4) + (part_keys - 1) // n_suppliers)
+    ) % n_suppliers + 1
+
+
+def _partsupp(rng, n_parts: int, n_suppliers: int) -> pd.DataFrame:
+    part_keys = np.repeat(np.arange(1, n_parts + 1), 4)
+    n = len(part_keys)
+    return pd.DataFrame(
+        {
+            "ps_partkey": part_keys,
+            "ps_suppkey": _supplier_of_part(
+                part_keys, np.tile(np.arange(4), n_parts), n_suppliers
+            ),
+            "ps_availqty": rng.integers(1, 10_000, size=n),
+            "ps_supplycost": _money(rng, n, 1.0, 1000.0),
+            "ps_comment": _text(rng, n),
+        }
+    )
+
+
+def _orders_and_lineitem(
+    rng,
+    order_keys: np.ndarray,
+    n_customers: int,
+    n_suppliers: int,
+    retail_prices: np.ndarray,
+):
+    n_orders = len(order_keys)
+
+    # As in the specification, every third customer does not place any orders
+    customer_keys = rng.integers(1, n_customers + 1, size=n_orders)
+    customer_keys = np.where(customer_keys % 3 == 0, customer_keys - 1, customer_keys)
+    customer_keys = np.maximum(customer_keys, 1)
+
+    order_dates = START_DATE + rng.integers(
+        0, (END_DATE - START_DATE).astype(int) + 1, size=n_orders
+    )
+
+    lines_per_order = rng.integers(1, 8, size=n_orders)
+    n_lines = int(lines_per_order.sum())
+    offsets = np.concatenate([[0], np.cumsum(lines_per_order)[:-1]])
+    line_order_dates = np.repeat(order_dates, lines_per_order)
+
+    part_keys = rng.integers(1, len(retail_prices) + 1, size=n_lines)
+    quantities = rng.integers(1, 51, size=n_lines).astype("float64")
+    extended_prices = np.round(quantities * retail_prices[part_keys - 1], 2)
+    discounts = rng.integers(0, 11, size=n_lines) / 100
+    taxes = rng.integers(0, 9, size=n_lines) / 100
+
+    ship_dates = line_order_dates + rng.integers(1, 122, size=n_lines)
+    commit_dates = line_order_dates + rng.integers(30, 91, size=n_lines)
+    receipt_dates = ship_dates + rng.integers(1, 31, size=n_lines)
+
+    return_flags = np.where(
+        receipt_dates <= CURRENT_DATE, rng.choice(["R", "A"], size=n_lines), "N"
+    )
+    line_status = np.where(ship_dates > CURRENT_DATE, "O", "F")
+
+    open_lines = np.add.reduceat((line_status == "O").astype(int), offsets)
+    order_status = np.where(
+        open_lines == 0, "F", np.where(open_lines == lines_per_order, "O", "P")
+    )
+    total_prices = np.round(
+        np.add.reduceat(extended_prices * (1 + taxes) * (1 - discounts), offsets), 2
+    )
+
+    orders = pd.DataFrame(
+        {
+            "o_orderkey": order_keys,
+            "o_custkey": customer_keys,
+            "o_orderstatus": order_status,
+            "o_totalprice": total_prices,
+            "o_orderdate": order_dates.astype("datetime64[ns]"),
+            "o_orderpriority": rng.choice(PRIORITIES, size=n_orders),
+            "o_clerk": [f"Clerk#{c:09d}" for c in rng.integers(1, 1001, n_orders)],
+            "o_shippriority": np.zeros(n_orders, dtype="int64"),
+            "o_comment": _text(rng, n_orders),
+        }
+    )
+    lineitem = pd.DataFrame(
+        {
+            "l_orderkey": np.repeat(order_keys, lines_per_order),
+            "l_partkey": part_keys,
+            "l_suppkey": _supplier_of_part(
+                part_keys, rng.integers(0, 4, size=n_lines), n_suppliers
+            ),
+            "l_linenumber": np.arange(n_lines)
+            - np.repeat(offsets, lines_per_order)
+            + 1,
+            "l_quantity": quantities,
+            "l_extendedprice": extended_prices,
+            "l_discount": discounts,
+            "l_tax": taxes,
+            "l_returnflag": return_flags,
+            "l_linestatus": line_status,
+            "l_shipdate": ship_dates.astype("datetime64[ns]"),
+            "l_commitdate": commit_dates.astype("datetime64[ns]"),
+            "l_receiptdate": receipt_dates.astype("datetime64[ns]"),
+            "l_shipinstruct": rng.choice(SHIP_INSTRUCTIONS, size=n_lines),
+            "l_shipmode": rng.choice(SHIP_MODES, size=n_lines),
+            "l_comment": _text(rng, n_lines, 2, 6),
+        }
+    )
+    return orders, lineitem
+
+
+def main():  # pragma: no cover
+    parser = ArgumentParser(description="Generate TPC-H-like tables as parquet files")
+    parser.add_argument(
+        "--scale-factor",
+        type=float,
+        default=1.0,
+        help="Size of the data, 1 is roughly 1GB of raw data",
+    )
+    parser.add_argument(
+        "--output-dir", required=True, help="Directory to write the tables to"
+    )
+    parser.add_argument(
+        "--partition-size",
+        type=int,
+        default=1_000_000,
+        help="Number of orders per parquet file of the orders and lineitem tables",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    generate(args.scale_factor, args.output_dir, args.partition_size, args.seed)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,14 @@
+SELECT
+    o_orderpriority,
+    COUNT(*) AS order_count
+FROM orders
+WHERE
+    o_orderdate >= TIMESTAMP '1993-07-01 00:00:00'
+    AND o_orderdate < TIMESTAMP '1993-10-01 00:00:00'
+    AND EXISTS (
+        SELECT *
+        FROM lineitem
+        WHERE l_orderkey = o_orderkey AND l_commitdate < l_receiptdate
+    )
+GROUP BY o_orderpriority
+ORDER BY o_orderpriority
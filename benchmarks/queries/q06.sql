@@ -0,0 +1,8 @@
+SELECT
+    SUM(l_extendedprice * l_discount) AS revenue
+FROM lineitem
+WHERE
+    l_shipdate >= TIMESTAMP '1994-01-01 00:00:00'
+    AND l_shipdate < TIMESTAMP '1995-01-01 00:00:00'
+    AND l_discount BETWEEN 0.05 AND 0.07
+    AND l_quantity < 24
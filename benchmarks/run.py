@@ -0,0 +1,206 @@
+"""
+Run the TPC-H-like queries on a local dask cluster and record measurements.
+
+For every query, the planning time (parsing, planning, optimization and
+the conversion into a dask graph), the execution time, the peak memory
+of the cluster while executing, the number of tasks and the number of
+result rows are written to a JSON file, which can be compared with the
+results of another commit using ``python -m benchmarks.compare``.
+
+Usage::
+
+    python -m benchmarks.datagen --scale-factor 1 --output-dir tpch-sf1
+    python -m benchmarks.run --data-dir tpch-sf1 --output results.json
+"""
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+from argparse import ArgumentParser
+from typing import Dict, List
+
+import dask
+import dask.dataframe as dd
+import distributed
+from distributed import Client, LocalCluster
+from distributed.diagnostics import MemorySampler
+
+import dask_sql
+from benchmarks.datagen import TABLES
+from dask_sql import Context
+
+logger = logging.getLogger(__name__)
+
+QUERY_DIR = os.path.join(os.path.dirname(__file__), "queries")
+
+
+def load_queries(names: List[str] = None) -> Dict[str, str]:
+    """Read the SQL of the given (or all) queries, keyed by their name (e.g. "q01")"""
+    available = sorted(
+        filename[: -len(".sql")]
+        for filename in os.listdir(QUERY_DIR)
+        if filename.endswith(".sql")
+    )
+    if names is None:
+        names = available
+
+    queries = {}
+    for name in names:
+        if name not in available:
+            raise KeyError(f"Unknown query {name}, choose from {available}")
+        with open(os.path.join(QUERY_DIR, f"{name}.sql")) as f:
+            queries[name] = f.read()
+    return queries
+
+
+def create_context(data_dir: str) -> Context:
+    """Register the generated tables (stored in data_dir) in a new context"""
+    c = Context()
+    for table_name in TABLES:
+        c.create_table(table_name, dd.read_parquet(os.path.join(data_dir, table_name)))
+    return c
+
+
+def run_query(
+    c: Context, client: Client, sql: str, memory_sampler: MemorySampler, label: str
+) -> Dict:
+    """Plan and execute a single query once and return its measurements"""
+    df = c.sql(sql)
+    timings = c.last_query_timings
+    tasks = len(df.__dask_graph__())
+
+    start = time.perf_counter()
+    with memory_sampler.sample(label, client=client, interval=0.1):
+        result = client.compute(df).result()
+    execution_time = time.perf_counter() - start
+
+    samples = memory_sampler.samples[label]
+    return {
+        "planning_time": timings.planning,
+        "conversion_time": timings.convert,
+        "execution_time": execution_time,
+        "peak_memory": max((memory for _, memory in samples), default=None),
+        "tasks": tasks,
+        "rows": len(result),
+        "optimizer_rules": dict(timings.optimizer_rules),
+    }
+
+
+def run_benchmark(
+    c: Context, client: Client, queries: Dict[str, str], repeat: int = 1
+) -> Dict:
+    """
+    Run all queries repeat times and collect the measurements.
+    Timings are reported as the median over all repetitions.
+    Failing queries are recorded with their error instead of stopping the benchmark.
+    """
+    memory_sampler = MemorySampler()
+    results = {}
+    for name, sql in queries.items():
+        logger.info(f"Running {name}")
+        runs = []
+        try:
+            for i in range(repeat):
+                runs.append(run_query(c, client, sql, memory_sampler, f"{name}-{i}"))
+        except Exception as e:
+            logger.warning(f"{name} failed: {e}")
+            results[name] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+            continue
+
+        result = {"status": "ok", "runs": len(runs)}
+        for key in ("planning_time", "conversion_time", "execution_time"):
+            result[key] = statistics.median(run[key] for run in runs)
+        result["peak_memory"] = max(run["peak_memory"] or 0 for run in runs)
+        result["tasks"] = runs[0]["tasks"]
+        result["rows"] = runs[0]["rows"]
+        result["optimizer_rules"] = runs[0]["optimizer_rules"]
+        results[name] = result
+
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(__file__),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata(args) -> Dict:
+    data_size = sum(
+        os.path.getsize(os.path.join(root, filename))
+        for root, _, filenames in os.walk(args.data_dir)
+        for filename in filenames
+    )
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(),
+        "data_dir": os.path.abspath(args.data_dir),
+        "data_size": data_size,
+        "n_workers": args.n_workers,
+        "threads_per_worker": args.threads_per_worker,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "dask": dask.__version__,
+        "distributed": distributed.__version__,
+        "dask_sql": dask_sql.__version__,
+    }
+
+
+def main():  # pragma: no cover
+    parser = ArgumentParser(description="Run the TPC-H-like benchmark queries")
+    parser.add_argument(
+        "--data-dir",
+        required=True,
+        help="Directory with the tables generated by benchmarks.datagen",
+    )
+    parser.add_argument(
+        "--output", default="benchmark.json", help="JSON file to write the results to"
+    )
+    parser.add_argument(
+        "--queries",
+        nargs="+",
+        default=None,
+        help="Names of the queries to run (e.g. q01 q06), defaults to all",
+    )
+    parser.add_argument("--n-workers", type=int, default=4)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of runs of each query"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    queries = load_queries(args.queries)
+    metadata = _metadata(args)
+
+    with LocalCluster(
+        n_workers=args.n_workers, threads_per_worker=args.threads_per_worker
+    ) as cluster, Client(cluster) as client:
+        # Measure the full planning and execution of every run, not a cache lookup
+        with dask.config.set({"sql.plan_cache.size": 0, "sql.result_cache.size": 0}):
+            c = create_context(args.data_dir)
+            results = run_benchmark(c, client, queries, args.repeat)
+
+    with open(args.output, "w") as f:
+        json.dump({"metadata": metadata, "queries": results}, f, indent=2)
+
+    failed = [name for name, result in results.items() if result["status"] != "ok"]
+    logger.info(
+        f"Wrote results of {len(results)} queries to {args.output}"
+        + (f" ({len(failed)} failed: {', '.join(failed)})" if failed else "")
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
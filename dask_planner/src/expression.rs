@@ -91,7 +91,9 @@ impl PyExpr {
             Expr::Column(..) | Expr::QualifiedWildcard { .. } | Expr::GetIndexedField { .. } => {
                 RexType::Reference
             }
-            Expr::ScalarVariable(..) | Expr::Literal(..) => RexType::Literal,
+            Expr::ScalarVariable(..) | Expr::Literal(..) | Expr::Placeholder { .. } => {
+                RexType::Literal
+            }
             Expr::BinaryExpr { .. }
             | Expr::Not(..)
             | Expr::IsNotNull(..)
@@ -120,7 +122,6 @@ impl PyExpr {
             | Expr::IsUnknown(_)
             | Expr::IsNotTrue(..)
             | Expr::IsNotFalse(..)
-            | Expr::Placeholder { .. }
             | Expr::IsNotUnknown(_) => RexType::Call,
             Expr::ScalarSubquery(..) => RexType::ScalarSubquery,
         }
@@ -512,6 +513,7 @@ impl PyExpr {
                 ScalarValue::Struct(..) => "Struct",
                 ScalarValue::FixedSizeBinary(_, _) => "FixedSizeBinary",
             },
+            Expr::Placeholder { .. } => "Placeholder",
             Expr::ScalarFunction { fun, args: _ } => match fun {
                 BuiltinScalarFunction::Abs => "Abs",
                 BuiltinScalarFunction::DatePart => "DatePart",
@@ -689,6 +691,17 @@ impl PyExpr {
         }
     }
 
+    /// Name of the bind parameter (e.g. `$1`) this Placeholder stands for
+    #[pyo3(name = "getPlaceholderId")]
+    pub fn placeholder_id(&self) -> PyResult<String> {
+        match &self.expr {
+            Expr::Placeholder { id, .. } => Ok(id.clone()),
+            other => Err(py_type_err(format!(
+                "getPlaceholderId called on non-placeholder expression: {other}"
+            ))),
+        }
+    }
+
     #[pyo3(name = "getIntervalDayTimeValue")]
     pub fn interval_day_time_value(&self) -> PyResult<Option<(i32, i32)>> {
         match self.get_scalar_value()? {
@@ -32,6 +32,7 @@ fn rust(py: Python, m: &PyModule) -> PyResult<()> {
     m.add_class::<sql::schema::DaskSchema>()?;
     m.add_class::<sql::table::DaskTable>()?;
     m.add_class::<sql::function::DaskFunction>()?;
+    m.add_class::<sql::table::DaskColumnStatistics>()?;
     m.add_class::<sql::table::DaskStatistics>()?;
     m.add_class::<sql::logical::PyLogicalPlan>()?;
 
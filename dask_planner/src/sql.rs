@@ -64,6 +64,7 @@ use crate::{
             show_tables::ShowTablesPlanNode,
             PyLogicalPlan,
         },
+        types::PyDataType,
     },
 };
 
@@ -93,6 +94,9 @@ pub struct DaskSQLContext {
     current_schema: String,
     schemas: HashMap<String, schema::DaskSchema>,
     options: ConfigOptions,
+    /// Seconds spent in every optimizer rule during the last optimization
+    optimizer_timings: Vec<(String, f64)>,
+    optimizer_config: optimizer::DaskSqlOptimizerConfig,
 }
 
 impl ContextProvider for DaskSQLContext {
@@ -100,9 +104,8 @@ impl ContextProvider for DaskSQLContext {
         &self,
         name: TableReference,
     ) -> Result<Arc<dyn TableSource>, DataFusionError> {
-        let reference: ResolvedTableReference = name
-            .clone()
-            .resolve(&self.current_catalog, &self.current_schema);
+        let reference: ResolvedTableReference =
+            name.resolve(&self.current_catalog, &self.current_schema);
         if reference.catalog != self.current_catalog {
             // there is a single catalog in Dask SQL
             return Err(DataFusionError::Plan(format!(
@@ -113,9 +116,10 @@ impl ContextProvider for DaskSQLContext {
         let schema_name = reference.clone().schema.into_owned();
         match self.schemas.get(&schema_name) {
             Some(schema) => {
-                let mut resp = None;
-                for table in schema.tables.values() {
-                    if table.table_name.eq(&name.table()) {
+                // Tables are keyed by name, so resolve them directly instead of
+                // scanning every registered table of the schema
+                match schema.tables.get(reference.table.as_ref()) {
+                    Some(table) => {
                         // Build the Schema here
                         let mut fields: Vec<Field> = Vec::new();
                         // Iterate through the DaskTable instance and create a Schema instance
@@ -127,36 +131,23 @@ impl ContextProvider for DaskSQLContext {
                             ));
                         }
 
-                        resp = Some(Schema::new(fields));
-                    }
-                }
-
-                // If the Table is not found return None. DataFusion will handle the error propagation
-                match resp {
-                    Some(e) => {
-                        let table_ref = &self
-                            .schemas
-                            .get(reference.schema.as_ref())
-                            .unwrap()
-                            .tables
-                            .get(reference.table.as_ref())
-                            .unwrap();
-                        let statistics = &table_ref.statistics;
-                        let filepath = &table_ref.filepath;
+                        let statistics = &table.statistics;
+                        let filepath = &table.filepath;
                         if statistics.get_row_count() == 0.0 {
                             Ok(Arc::new(table::DaskTableSource::new(
-                                Arc::new(e),
+                                Arc::new(Schema::new(fields)),
                                 None,
                                 filepath.clone(),
                             )))
                         } else {
                             Ok(Arc::new(table::DaskTableSource::new(
-                                Arc::new(e),
+                                Arc::new(Schema::new(fields)),
                                 Some(statistics.clone()),
                                 filepath.clone(),
                             )))
                         }
                     }
+                    // If the Table is not found return None. DataFusion will handle the error propagation
                     None => Err(DataFusionError::Plan(format!(
                         "Table '{}.{}.{}' not found",
                         reference.catalog, reference.schema, reference.table
@@ -376,11 +367,21 @@ impl ContextProvider for DaskSQLContext {
                 let rtf: ReturnTypeFunction = Arc::new(|_| Ok(Arc::new(DataType::Int64)));
                 return Some(Arc::new(AggregateUDF::new(name, &sig, &rtf, &acc, &st)));
             }
-            "regr_syy" | "regr_sxx" => {
+            "regr_syy" | "regr_sxx" | "regr_slope" | "regr_intercept" => {
+                let sig = generate_signatures(vec![numeric_datatypes.clone(), numeric_datatypes]);
+                let rtf: ReturnTypeFunction = Arc::new(|_| Ok(Arc::new(DataType::Float64)));
+                return Some(Arc::new(AggregateUDF::new(name, &sig, &rtf, &acc, &st)));
+            }
+            "approx_percentile" | "percentile_cont" => {
                 let sig = generate_signatures(vec![numeric_datatypes.clone(), numeric_datatypes]);
                 let rtf: ReturnTypeFunction = Arc::new(|_| Ok(Arc::new(DataType::Float64)));
                 return Some(Arc::new(AggregateUDF::new(name, &sig, &rtf, &acc, &st)));
             }
+            "approx_count_distinct" => {
+                let sig = Signature::any(1, Volatility::Immutable);
+                let rtf: ReturnTypeFunction = Arc::new(|_| Ok(Arc::new(DataType::Int64)));
+                return Some(Arc::new(AggregateUDF::new(name, &sig, &rtf, &acc, &st)));
+            }
             _ => (),
         }
 
@@ -437,9 +438,25 @@ impl DaskSQLContext {
             current_schema: default_schema_name.to_owned(),
             schemas: HashMap::new(),
             options: ConfigOptions::new(),
+            optimizer_timings: Vec::new(),
+            optimizer_config: optimizer::DaskSqlOptimizerConfig::default(),
         }
     }
 
+    /// Enable or disable the optional optimizer rules
+    /// (see `DaskSqlOptimizerConfig`) for the following optimizations
+    pub fn set_optimizer_config(&mut self, push_down_aggregate: bool) {
+        self.optimizer_config = optimizer::DaskSqlOptimizerConfig {
+            push_down_aggregate,
+        };
+    }
+
+    /// Seconds spent in every optimizer rule during the last call to
+    /// `optimize_relational_algebra`, in the order the rules first ran
+    pub fn get_optimizer_timings(&self) -> Vec<(String, f64)> {
+        self.optimizer_timings.clone()
+    }
+
     /// Change the current schema
     pub fn use_schema(&mut self, schema_name: &str) -> PyResult<()> {
         if self.schemas.contains_key(schema_name) {
@@ -479,6 +496,51 @@ impl DaskSQLContext {
         }
     }
 
+    /// Remove a DaskTable instance from the specified schema in the current DaskSQLContext
+    pub fn drop_table(&mut self, schema_name: String, table_name: String) -> PyResult<bool> {
+        match self.schemas.get_mut(&schema_name) {
+            Some(schema) => Ok(schema.drop_table(&table_name)),
+            None => Err(py_runtime_err(format!(
+                "Schema: {schema_name} not found in DaskSQLContext"
+            ))),
+        }
+    }
+
+    /// Remove a Schema, including all of its tables and functions, from the current DaskSQLContext
+    pub fn drop_schema(&mut self, schema_name: String) -> PyResult<bool> {
+        Ok(self.schemas.remove(&schema_name).is_some())
+    }
+
+    /// Register (or overload) a function under the specified schema in the current DaskSQLContext
+    pub fn register_function(
+        &mut self,
+        schema_name: String,
+        name: String,
+        input_types: Vec<PyDataType>,
+        return_type: PyDataType,
+        aggregation: bool,
+    ) -> PyResult<bool> {
+        match self.schemas.get_mut(&schema_name) {
+            Some(schema) => {
+                schema.add_or_overload_function(name, input_types, return_type, aggregation);
+                Ok(true)
+            }
+            None => Err(py_runtime_err(format!(
+                "Schema: {schema_name} not found in DaskSQLContext"
+            ))),
+        }
+    }
+
+    /// Remove all overloads of a function from the specified schema in the current DaskSQLContext
+    pub fn drop_function(&mut self, schema_name: String, name: String) -> PyResult<bool> {
+        match self.schemas.get_mut(&schema_name) {
+            Some(schema) => Ok(schema.drop_function(&name)),
+            None => Err(py_runtime_err(format!(
+                "Schema: {schema_name} not found in DaskSQLContext"
+            ))),
+        }
+    }
+
     /// Parses a SQL string into an AST presented as a Vec of Statements
     pub fn parse_sql(&self, sql: &str) -> PyResult<Vec<statement::PyStatement>> {
         debug!("parse_sql - '{}'", sql);
@@ -512,20 +574,24 @@ impl DaskSQLContext {
     /// by applying a set of `optimizer` trait implementations against the
     /// `LogicalPlan`
     pub fn optimize_relational_algebra(
-        &self,
+        &mut self,
         existing_plan: logical::PyLogicalPlan,
     ) -> PyResult<logical::PyLogicalPlan> {
         // Certain queries cannot be optimized. Ex: `EXPLAIN SELECT * FROM test` simply return those plans as is
         let mut visitor = OptimizablePlanVisitor {};
+        self.optimizer_timings.clear();
 
         match existing_plan.original_plan.accept(&mut visitor) {
             Ok(valid) => {
                 if valid {
-                    optimizer::DaskSqlOptimizer::new()
-                        .optimize(existing_plan.original_plan)
-                        .map(|k| PyLogicalPlan {
-                            original_plan: k,
-                            current_node: None,
+                    optimizer::DaskSqlOptimizer::with_config(&self.optimizer_config)
+                        .optimize_timed(existing_plan.original_plan)
+                        .map(|(k, timings)| {
+                            self.optimizer_timings = timings;
+                            PyLogicalPlan {
+                                original_plan: k,
+                                current_node: None,
+                            }
                         })
                         .map_err(py_optimization_exp)
                 } else {
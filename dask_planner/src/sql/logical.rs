@@ -35,6 +35,11 @@ pub mod table_scan;
 pub mod use_schema;
 pub mod window;
 
+use std::{
+    collections::hash_map::DefaultHasher,
+    hash::{Hash, Hasher},
+};
+
 use datafusion_common::{DFSchemaRef, DataFusionError};
 use datafusion_expr::LogicalPlan;
 use pyo3::prelude::*;
@@ -382,6 +387,26 @@ impl PyLogicalPlan {
         Ok(format!("{}", self.current_node().display_indent()))
     }
 
+    /// Hash of the plan from the current node onward, which is the same for
+    /// structurally identical subtrees (e.g. a CTE referenced twice or both sides
+    /// of a self-join). Returns None if the subtree can not be told apart from
+    /// others by its description alone, e.g. because it holds (truncated)
+    /// values or subqueries.
+    #[pyo3(name = "getStructuralHash")]
+    pub fn structural_hash(&mut self) -> PyResult<Option<u64>> {
+        let plan = self.current_node();
+        if !is_describable(&plan) {
+            return Ok(None);
+        }
+        let description = format!("{}", plan.display_indent_schema());
+        if description.contains("<subquery>") {
+            return Ok(None);
+        }
+        let mut hasher = DefaultHasher::new();
+        description.hash(&mut hasher);
+        Ok(Some(hasher.finish()))
+    }
+
     #[pyo3(name = "getRowType")]
     pub fn row_type(&self) -> PyResult<RelDataType> {
         match &self.original_plan {
@@ -431,6 +456,14 @@ impl PyLogicalPlan {
     }
 }
 
+/// Whether the indented description of this plan contains everything that makes up the plan
+fn is_describable(plan: &LogicalPlan) -> bool {
+    match plan {
+        LogicalPlan::Values(_) | LogicalPlan::Extension(_) => false,
+        _ => plan.inputs().into_iter().all(is_describable),
+    }
+}
+
 impl From<PyLogicalPlan> for LogicalPlan {
     fn from(logical_plan: PyLogicalPlan) -> LogicalPlan {
         logical_plan.original_plan
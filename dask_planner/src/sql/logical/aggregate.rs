@@ -1,6 +1,7 @@
 use datafusion_expr::{
-    expr::AggregateFunction,
+    expr::{AggregateFunction, GroupingSet},
     logical_plan::{Aggregate, Distinct},
+    utils::grouping_set_to_exprlist,
     Expr,
     LogicalPlan,
 };
@@ -32,10 +33,46 @@ impl PyAggregate {
     }
 
     /// Returns a Vec of the group expressions
+    /// (for GROUPING SETS, ROLLUP and CUBE: the distinct expressions of all grouping sets)
     #[pyo3(name = "getGroupSets")]
     pub fn group_expressions(&self) -> PyResult<Vec<PyExpr>> {
         match &self.aggregate {
-            Some(e) => py_expr_list(&e.input, &e.group_expr),
+            Some(e) => py_expr_list(
+                &e.input,
+                &grouping_set_to_exprlist(&e.group_expr).map_err(|e| py_type_err(e.to_string()))?,
+            ),
+            None => Ok(vec![]),
+        }
+    }
+
+    /// Returns the group expressions of every grouping set,
+    /// with ROLLUP and CUBE expanded into their grouping sets.
+    /// Without grouping sets, this is a single set of all group expressions.
+    #[pyo3(name = "getGroupingSets")]
+    pub fn grouping_sets(&self) -> PyResult<Vec<Vec<PyExpr>>> {
+        match &self.aggregate {
+            Some(e) => {
+                let sets: Vec<Vec<Expr>> = match e.group_expr.as_slice() {
+                    [Expr::GroupingSet(GroupingSet::Rollup(exprs))] => (0..=exprs.len())
+                        .rev()
+                        .map(|n| exprs[..n].to_vec())
+                        .collect(),
+                    [Expr::GroupingSet(GroupingSet::Cube(exprs))] => (0..1usize << exprs.len())
+                        .rev()
+                        .map(|mask| {
+                            exprs
+                                .iter()
+                                .enumerate()
+                                .filter(|(i, _)| mask & (1 << (exprs.len() - 1 - i)) != 0)
+                                .map(|(_, expr)| expr.clone())
+                                .collect()
+                        })
+                        .collect(),
+                    [Expr::GroupingSet(GroupingSet::GroupingSets(sets))] => sets.clone(),
+                    _ => vec![e.group_expr.clone()],
+                };
+                sets.iter().map(|set| py_expr_list(&e.input, set)).collect()
+            }
             None => Ok(vec![]),
         }
     }
@@ -116,6 +116,23 @@ impl PyJoin {
             JoinType::RightAnti => Ok("RIGHTANTI".to_string()),
         }
     }
+
+    /// Whether this is the anti join of a decorrelated `NOT IN` subquery,
+    /// which (unlike `NOT EXISTS`) has to respect NULLs on both sides.
+    /// `DecorrelateWhereIn` aliases the subquery, `DecorrelateWhereExists` does not.
+    #[pyo3(name = "isNullAwareAntiJoin")]
+    pub fn is_null_aware_anti_join(&self) -> bool {
+        self.join.join_type == JoinType::LeftAnti && is_decorrelated_subquery(&self.join.right)
+    }
+}
+
+fn is_decorrelated_subquery(plan: &LogicalPlan) -> bool {
+    match plan {
+        LogicalPlan::SubqueryAlias(alias) => alias.alias.starts_with("__correlated_sq"),
+        // Columns which are not needed may have been projected away
+        LogicalPlan::Projection(projection) => is_decorrelated_subquery(&projection.input),
+        _ => false,
+    }
 }
 
 impl TryFrom<LogicalPlan> for PyJoin {
@@ -2,6 +2,7 @@ use datafusion_common::ScalarValue;
 use datafusion_expr::{
     expr::WindowFunction,
     logical_plan::Window,
+    window_function,
     Expr,
     LogicalPlan,
     WindowFrame,
@@ -101,7 +102,11 @@ impl PyWindow {
     #[pyo3(name = "getWindowFuncName")]
     pub fn window_func_name(&self, expr: PyExpr) -> PyResult<String> {
         match expr.expr.unalias() {
-            Expr::WindowFunction(WindowFunction { fun, .. }) => Ok(fun.to_string()),
+            Expr::WindowFunction(WindowFunction { fun, .. }) => match fun {
+                // The string representation of UDAFs is their debug output
+                window_function::WindowFunction::AggregateUDF(udaf) => Ok(udaf.name.clone()),
+                _ => Ok(fun.to_string()),
+            },
             other => Err(not_window_function_err(other)),
         }
     }
@@ -1,4 +1,7 @@
-use std::sync::Arc;
+use std::{
+    sync::{Arc, Mutex},
+    time::Instant,
+};
 
 use datafusion_common::DataFusionError;
 use datafusion_expr::LogicalPlan;
@@ -11,7 +14,7 @@ use datafusion_optimizer::{
     eliminate_outer_join::EliminateOuterJoin,
     filter_null_join_keys::FilterNullJoinKeys,
     inline_table_scan::InlineTableScan,
-    optimizer::{Optimizer, OptimizerRule},
+    optimizer::{ApplyOrder, Optimizer, OptimizerRule},
     push_down_filter::PushDownFilter,
     push_down_limit::PushDownLimit,
     push_down_projection::PushDownProjection,
@@ -20,6 +23,7 @@ use datafusion_optimizer::{
     simplify_expressions::SimplifyExpressions,
     type_coercion::TypeCoercion,
     unwrap_cast_in_comparison::UnwrapCastInComparison,
+    OptimizerConfig,
     OptimizerContext,
 };
 use log::{debug, trace};
@@ -29,18 +33,44 @@ mod filter_columns_post_join;
 mod join_reorder;
 use join_reorder::JoinReorder;
 
+mod push_down_aggregate;
+use push_down_aggregate::PushDownAggregate;
+
+mod statistics;
+
+/// Optional rules of the optimizer, which can be disabled with the `sql.optimizer` config
+#[derive(Debug, Clone)]
+pub struct DaskSqlOptimizerConfig {
+    /// Whether to push partial aggregations below inner joins
+    pub push_down_aggregate: bool,
+}
+
+impl Default for DaskSqlOptimizerConfig {
+    fn default() -> Self {
+        Self {
+            push_down_aggregate: true,
+        }
+    }
+}
+
 /// Houses the optimization logic for Dask-SQL. This optimization controls the optimizations
 /// and their ordering in regards to their impact on the underlying `LogicalPlan` instance
 pub struct DaskSqlOptimizer {
     optimizer: Optimizer,
+    rules: Vec<Arc<dyn OptimizerRule + Sync + Send>>,
 }
 
 impl DaskSqlOptimizer {
     /// Creates a new instance of the DaskSqlOptimizer with all the DataFusion desired
     /// optimizers as well as any custom `OptimizerRule` trait impls that might be desired.
     pub fn new() -> Self {
-        debug!("Creating new instance of DaskSqlOptimizer");
-        let rules: Vec<Arc<dyn OptimizerRule + Sync + Send>> = vec![
+        Self::with_config(&DaskSqlOptimizerConfig::default())
+    }
+
+    /// Same as `new`, but only with the optional rules enabled in the given config
+    pub fn with_config(config: &DaskSqlOptimizerConfig) -> Self {
+        debug!("Creating new instance of DaskSqlOptimizer with {config:?}");
+        let mut rules: Vec<Arc<dyn OptimizerRule + Sync + Send>> = vec![
             Arc::new(InlineTableScan::new()),
             Arc::new(TypeCoercion::new()),
             Arc::new(SimplifyExpressions::new()),
@@ -65,16 +95,23 @@ impl DaskSqlOptimizer {
             // Dask-SQL specific optimizations
             // Arc::new(FilterColumnsPostJoin::new()),
             Arc::new(JoinReorder::default()),
-            // The previous optimizations added expressions and projections,
-            // that might benefit from the following rules
+        ];
+        if config.push_down_aggregate {
+            rules.push(Arc::new(PushDownAggregate::default()));
+        }
+        // The previous optimizations added expressions and projections,
+        // that might benefit from the following rules
+        let final_rules: Vec<Arc<dyn OptimizerRule + Sync + Send>> = vec![
             Arc::new(SimplifyExpressions::new()),
             Arc::new(UnwrapCastInComparison::new()),
             Arc::new(CommonSubexprEliminate::new()),
             Arc::new(PushDownProjection::new()),
         ];
+        rules.extend(final_rules);
 
         Self {
-            optimizer: Optimizer::with_rules(rules),
+            optimizer: Optimizer::with_rules(rules.clone()),
+            rules,
         }
     }
 
@@ -85,6 +122,42 @@ impl DaskSqlOptimizer {
         self.optimizer.optimize(&plan, &config, Self::observe)
     }
 
+    /// Same as `optimize`, but also returns the time (in seconds) spent in every
+    /// `OptimizerRule`, summed up over all passes, in the order the rules first ran.
+    /// Every rule is timed on its own (including failed rules, but not the
+    /// bookkeeping of the optimizer between the rules).
+    pub(crate) fn optimize_timed(
+        &self,
+        plan: LogicalPlan,
+    ) -> Result<(LogicalPlan, Vec<(String, f64)>), DataFusionError> {
+        let config = OptimizerContext::new();
+        let timed_rules: Vec<Arc<TimedRule>> = self
+            .rules
+            .iter()
+            .map(|rule| Arc::new(TimedRule::new(rule.clone())))
+            .collect();
+        let optimizer = Optimizer::with_rules(
+            timed_rules
+                .iter()
+                .map(|rule| rule.clone() as Arc<dyn OptimizerRule + Sync + Send>)
+                .collect(),
+        );
+        let optimized_plan = optimizer.optimize(&plan, &config, Self::observe)?;
+
+        let mut timings: Vec<(String, f64)> = Vec::new();
+        for rule in &timed_rules {
+            let elapsed = match *rule.elapsed.lock().unwrap() {
+                Some(elapsed) => elapsed,
+                None => continue,
+            };
+            match timings.iter_mut().find(|(name, _)| name == rule.name()) {
+                Some((_, total)) => *total += elapsed,
+                None => timings.push((rule.name().to_string(), elapsed)),
+            }
+        }
+        Ok((optimized_plan, timings))
+    }
+
     fn observe(optimized_plan: &LogicalPlan, optimization: &dyn OptimizerRule) {
         trace!(
             "== AFTER APPLYING RULE {} ==\n{}\n",
@@ -94,6 +167,44 @@ impl DaskSqlOptimizer {
     }
 }
 
+/// `OptimizerRule` measuring the time spent in the wrapped rule
+struct TimedRule {
+    rule: Arc<dyn OptimizerRule + Sync + Send>,
+    /// Total time (in seconds) of all calls, or None if the rule never ran
+    elapsed: Mutex<Option<f64>>,
+}
+
+impl TimedRule {
+    fn new(rule: Arc<dyn OptimizerRule + Sync + Send>) -> Self {
+        Self {
+            rule,
+            elapsed: Mutex::new(None),
+        }
+    }
+}
+
+impl OptimizerRule for TimedRule {
+    fn try_optimize(
+        &self,
+        plan: &LogicalPlan,
+        config: &dyn OptimizerConfig,
+    ) -> Result<Option<LogicalPlan>, DataFusionError> {
+        let start = Instant::now();
+        let result = self.rule.try_optimize(plan, config);
+        let mut elapsed = self.elapsed.lock().unwrap();
+        *elapsed = Some(elapsed.unwrap_or(0.0) + start.elapsed().as_secs_f64());
+        result
+    }
+
+    fn name(&self) -> &str {
+        self.rule.name()
+    }
+
+    fn apply_order(&self) -> Option<ApplyOrder> {
+        self.rule.apply_order()
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use std::{any::Any, collections::HashMap, sync::Arc};
@@ -132,7 +243,39 @@ mod tests {
         Ok(())
     }
 
+    #[test]
+    fn optimize_timed() -> Result<()> {
+        let sql = "SELECT col_int32 FROM test \
+    WHERE col_int32 > (SELECT AVG(col_int32) FROM test WHERE col_utf8 = 'a')";
+        let optimizer = DaskSqlOptimizer::new();
+        let (plan, timings) = optimizer.optimize_timed(plan_sql(sql))?;
+        assert_eq!(
+            format!("{:?}", optimizer.optimize(plan_sql(sql))?),
+            format!("{:?}", plan)
+        );
+
+        let names: Vec<&str> = timings.iter().map(|(name, _)| name.as_str()).collect();
+        assert_eq!("inline_table_scan", names[0]);
+        assert!(names.contains(&"push_down_filter"));
+        // Rules which are configured twice are reported once
+        assert_eq!(
+            1,
+            names
+                .iter()
+                .filter(|name| **name == "simplify_expressions")
+                .count()
+        );
+        assert!(timings.iter().all(|(_, elapsed)| *elapsed >= 0.0));
+        Ok(())
+    }
+
     fn test_sql(sql: &str) -> Result<LogicalPlan> {
+        // optimize the logical plan
+        let optimizer = DaskSqlOptimizer::new();
+        optimizer.optimize(plan_sql(sql))
+    }
+
+    fn plan_sql(sql: &str) -> LogicalPlan {
         // parse the SQL
         let dialect = DaskDialect {};
         let ast: Vec<Statement> = Parser::parse_sql(&dialect, sql).unwrap();
@@ -141,11 +284,7 @@ mod tests {
         // create a logical query plan
         let schema_provider = MySchemaProvider::new();
         let sql_to_rel = SqlToRel::new(&schema_provider);
-        let plan = sql_to_rel.sql_statement_to_plan(statement.clone()).unwrap();
-
-        // optimize the logical plan
-        let optimizer = DaskSqlOptimizer::new();
-        optimizer.optimize(plan)
+        sql_to_rel.sql_statement_to_plan(statement.clone()).unwrap()
     }
 
     struct MySchemaProvider {
@@ -8,7 +8,8 @@ use datafusion_expr::{Expr, Join, JoinType, LogicalPlan, LogicalPlanBuilder};
 use datafusion_optimizer::{utils, utils::split_conjunction, OptimizerConfig, OptimizerRule};
 use log::warn;
 
-use crate::sql::table::DaskTableSource;
+use super::statistics::estimate_selectivity;
+use crate::sql::table::{DaskStatistics, DaskTableSource};
 
 pub struct JoinReorder {
     /// Maximum number of fact tables to allow in a join
@@ -17,8 +18,8 @@ pub struct JoinReorder {
     fact_dimension_ratio: f64,
     /// Whether to preserve user-defined order of unfiltered dimensions
     preserve_user_order: bool,
-    /// Constant to use when determining the number of rows produced by a
-    /// filtered relation
+    /// Selectivity to assume for filter predicates, which can not be
+    /// estimated from the column statistics of the filtered table
     filter_selectivity: f64,
 }
 
@@ -124,7 +125,7 @@ fn optimize_join(
         .iter()
         .map(|rel| Relation {
             plan: rel.plan.clone(),
-            size: (rel.size as f64 * rule.filter_selectivity) as usize,
+            size: (rel.size as f64 * rel.selectivity(rule.filter_selectivity)) as usize,
         })
         .collect();
     filtered_dimensions.sort_by(|a, b| a.size.cmp(&b.size));
@@ -205,6 +206,42 @@ impl Relation {
     fn has_filter(&self) -> bool {
         has_filter(&self.plan)
     }
+
+    /// Estimate the fraction of rows of the table passing the filters of this plan
+    /// from the column statistics of the table
+    fn selectivity(&self, default_selectivity: f64) -> f64 {
+        let statistics = get_table_statistics(&self.plan);
+        get_filters(&self.plan)
+            .iter()
+            .map(|predicate| {
+                estimate_selectivity(predicate, statistics.as_ref(), default_selectivity)
+            })
+            .product()
+    }
+}
+
+/// Collect the (conjunctive) filter predicates of the plan
+fn get_filters(plan: &LogicalPlan) -> Vec<Expr> {
+    match plan {
+        LogicalPlan::Filter(filter) => {
+            let mut filters: Vec<Expr> = split_conjunction(&filter.predicate)
+                .into_iter()
+                .cloned()
+                .collect();
+            filters.extend(get_filters(&filter.input));
+            filters
+        }
+        LogicalPlan::TableScan(scan) => scan
+            .filters
+            .iter()
+            .flat_map(|predicate| split_conjunction(predicate).into_iter().cloned())
+            .collect(),
+        _ => plan
+            .inputs()
+            .iter()
+            .flat_map(|child| get_filters(child))
+            .collect(),
+    }
 }
 
 fn has_filter(plan: &LogicalPlan) -> bool {
@@ -375,6 +412,10 @@ fn build_join_tree(
 }
 
 fn get_table_size(plan: &LogicalPlan) -> Option<usize> {
+    get_table_statistics(plan).map(|stats| stats.get_row_count() as usize)
+}
+
+fn get_table_statistics(plan: &LogicalPlan) -> Option<DaskStatistics> {
     match plan {
         LogicalPlan::TableScan(scan) => scan
             .source
@@ -382,7 +423,7 @@ fn get_table_size(plan: &LogicalPlan) -> Option<usize> {
             .downcast_ref::<DaskTableSource>()
             .expect("should be a DaskTableSource")
             .statistics()
-            .map(|stats| stats.get_row_count() as usize),
-        _ => get_table_size(plan.inputs()[0]),
+            .cloned(),
+        _ => get_table_statistics(plan.inputs()[0]),
     }
 }
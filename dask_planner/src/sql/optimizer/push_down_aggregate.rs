@@ -0,0 +1,372 @@
+//! Optimizer rule pushing partial aggregations below inner joins
+//!
+//! Star-schema queries typically aggregate the fact table grouped by columns of the
+//! dimension tables, like
+//! ```text
+//! SELECT
+//!     d.region, SUM(f.amount)
+//! FROM fact f
+//! INNER JOIN dim d
+//!     ON f.dim_id = d.id
+//! GROUP BY d.region
+//! ```
+//!
+//! which produces a LogicalPlan like
+//! ```text
+//! Aggregate: groupBy=[[d.region]], aggr=[[SUM(f.amount)]]\
+//!   Inner Join: f.dim_id = d.id\
+//!     TableScan: fact projection=[dim_id, amount]\
+//!     TableScan: dim projection=[id, region]\
+//! ```
+//!
+//! Here, the complete fact table is shuffled for the join, although the aggregation only needs
+//! a single partial result per join key. If all aggregations are decomposable (SUM, COUNT, MIN,
+//! MAX and AVG) and only use columns of one side of the join, they can be computed partially on
+//! this side before the join, grouped by its join keys (and its columns in the GROUP BY).
+//! The aggregation after the join then only combines the partial results:
+//! ```text
+//! Projection: d.region, __combined_agg_0 AS SUM(f.amount)\
+//!   Aggregate: groupBy=[[d.region]], aggr=[[SUM(__partial_agg_0) AS __combined_agg_0]]\
+//!     Inner Join: f.dim_id = d.id\
+//!       Aggregate: groupBy=[[f.dim_id]], aggr=[[SUM(f.amount) AS __partial_agg_0]]\
+//!         TableScan: fact projection=[dim_id, amount]\
+//!       TableScan: dim projection=[id, region]\
+//! ```
+//!
+//! This is correct, as all rows of a partial group share the same join keys and are therefore
+//! joined with the same rows of the other side.
+//!
+//! If none of the aggregations uses a column (e.g. `COUNT(*)`), they are pushed to the left
+//! side, which holds the fact table after join reordering.
+//!
+//! The partial aggregation is skipped if the table statistics show that it would hardly reduce
+//! the number of rows, e.g. if the join key of the pushed side is (almost) unique.
+
+use std::{collections::HashSet, sync::Arc};
+
+use datafusion::arrow::datatypes::DataType;
+use datafusion_common::{Column, Result};
+use datafusion_expr::{
+    aggregate_function,
+    cast,
+    expr::AggregateFunction,
+    logical_plan::{builder::build_join_schema, Aggregate, Join, JoinType, LogicalPlan},
+    utils::expr_to_columns,
+    Expr,
+    ExprSchemable,
+    LogicalPlanBuilder,
+};
+use datafusion_optimizer::{utils, OptimizerConfig, OptimizerRule};
+use log::debug;
+
+use crate::sql::table::{DaskStatistics, DaskTableSource};
+
+/// Maximal estimated number of groups of the partial aggregation,
+/// relative to the number of rows of the aggregated table
+const MAX_PARTIAL_GROUP_FRACTION: f64 = 0.5;
+
+/// Optimizer rule pushing partial aggregations below inner joins
+#[derive(Default)]
+pub struct PushDownAggregate {}
+
+impl PushDownAggregate {
+    #[allow(missing_docs)]
+    pub fn new() -> Self {
+        Self {}
+    }
+}
+
+impl OptimizerRule for PushDownAggregate {
+    fn name(&self) -> &str {
+        "push_down_aggregate"
+    }
+
+    fn try_optimize(
+        &self,
+        plan: &LogicalPlan,
+        config: &dyn OptimizerConfig,
+    ) -> Result<Option<LogicalPlan>> {
+        // Recurse down first, so that nested aggregations are pushed down bottom-up
+        let optimized_plan = utils::optimize_children(self, plan, config)?;
+
+        match optimized_plan.as_ref().unwrap_or(plan) {
+            LogicalPlan::Aggregate(aggregate) => match push_down_aggregate(aggregate)? {
+                Some(new_plan) => Ok(Some(new_plan)),
+                None => Ok(optimized_plan),
+            },
+            _ => Ok(optimized_plan),
+        }
+    }
+}
+
+/// Split the aggregate into a partial aggregate below its input join
+/// and a final aggregate combining the partial results,
+/// or return None if this is not possible
+fn push_down_aggregate(aggregate: &Aggregate) -> Result<Option<LogicalPlan>> {
+    let join = match aggregate.input.as_ref() {
+        LogicalPlan::Join(join) if join.join_type == JoinType::Inner && join.filter.is_none() => {
+            join
+        }
+        _ => return Ok(None),
+    };
+
+    // Without a GROUP BY, the combined COUNT of an empty join would be NULL instead of 0
+    if aggregate.group_expr.is_empty()
+        || !aggregate
+            .group_expr
+            .iter()
+            .all(|expr| matches!(expr, Expr::Column(_)))
+    {
+        return Ok(None);
+    }
+
+    // Collect the aggregate functions and the columns they use
+    let mut aggregate_functions = vec![];
+    let mut aggregate_columns = vec![];
+    for expr in &aggregate.aggr_expr {
+        match strip_alias(expr) {
+            Expr::AggregateFunction(AggregateFunction {
+                fun,
+                args,
+                distinct: false,
+                filter: None,
+            }) if is_decomposable(fun) => {
+                if *fun == aggregate_function::AggregateFunction::Avg
+                    && matches!(
+                        args[0].get_type(join.schema.as_ref())?,
+                        DataType::Decimal128(_, _)
+                    )
+                {
+                    // The combined average is computed in floating point
+                    return Ok(None);
+                }
+                for arg in args {
+                    let mut columns = HashSet::new();
+                    expr_to_columns(arg, &mut columns)?;
+                    aggregate_columns.extend(columns);
+                }
+                aggregate_functions.push((fun.clone(), args.clone()));
+            }
+            _ => return Ok(None),
+        }
+    }
+
+    // Find the side of the join holding all aggregated columns
+    let is_left = if aggregate_columns
+        .iter()
+        .all(|column| join.left.schema().index_of_column(column).is_ok())
+    {
+        true
+    } else if aggregate_columns
+        .iter()
+        .all(|column| join.right.schema().index_of_column(column).is_ok())
+    {
+        false
+    } else {
+        return Ok(None);
+    };
+    let pushed_input = if is_left { &join.left } else { &join.right };
+
+    // This side is already aggregated (e.g. by a previous pass of this rule)
+    if matches!(pushed_input.as_ref(), LogicalPlan::Aggregate(_)) {
+        return Ok(None);
+    }
+
+    // Group the partial aggregate by all columns of this side,
+    // which are needed for the join or the final aggregate
+    let mut partial_group_columns: Vec<Column> = vec![];
+    for (left_key, right_key) in &join.on {
+        let mut columns = HashSet::new();
+        expr_to_columns(if is_left { left_key } else { right_key }, &mut columns)?;
+        for column in columns {
+            if !partial_group_columns.contains(&column) {
+                partial_group_columns.push(column);
+            }
+        }
+    }
+    for expr in &aggregate.group_expr {
+        if let Expr::Column(column) = expr {
+            if pushed_input.schema().index_of_column(column).is_ok()
+                && !partial_group_columns.contains(column)
+            {
+                partial_group_columns.push(column.clone());
+            }
+        }
+    }
+
+    if !reduces_rows(pushed_input, &partial_group_columns) {
+        debug!("Not pushing down the aggregation, as it would hardly reduce the rows");
+        return Ok(None);
+    }
+
+    let mut partial_aggr_expr = vec![];
+    let mut combined_aggr_expr = vec![];
+    let mut final_exprs = vec![];
+    for (i, (fun, args)) in aggregate_functions.into_iter().enumerate() {
+        let partial_name = format!("__partial_agg_{i}");
+        let combined_name = format!("__combined_agg_{i}");
+        match fun {
+            aggregate_function::AggregateFunction::Avg => {
+                let partial_count_name = format!("{partial_name}_count");
+                let combined_count_name = format!("{combined_name}_count");
+                partial_aggr_expr.push(
+                    aggregate_function_expr(
+                        aggregate_function::AggregateFunction::Sum,
+                        args.clone(),
+                    )
+                    .alias(&partial_name),
+                );
+                partial_aggr_expr.push(
+                    aggregate_function_expr(aggregate_function::AggregateFunction::Count, args)
+                        .alias(&partial_count_name),
+                );
+                combined_aggr_expr.push(
+                    aggregate_function_expr(
+                        aggregate_function::AggregateFunction::Sum,
+                        vec![column(&partial_name)],
+                    )
+                    .alias(&combined_name),
+                );
+                combined_aggr_expr.push(
+                    aggregate_function_expr(
+                        aggregate_function::AggregateFunction::Sum,
+                        vec![column(&partial_count_name)],
+                    )
+                    .alias(&combined_count_name),
+                );
+                final_exprs.push(
+                    cast(column(&combined_name), DataType::Float64)
+                        / cast(column(&combined_count_name), DataType::Float64),
+                );
+            }
+            _ => {
+                // Partial counts are summed up, everything else is aggregated again
+                let combine_fun = match fun {
+                    aggregate_function::AggregateFunction::Count => {
+                        aggregate_function::AggregateFunction::Sum
+                    }
+                    _ => fun.clone(),
+                };
+                partial_aggr_expr.push(aggregate_function_expr(fun, args).alias(&partial_name));
+                combined_aggr_expr.push(
+                    aggregate_function_expr(combine_fun, vec![column(&partial_name)])
+                        .alias(&combined_name),
+                );
+                final_exprs.push(column(&combined_name));
+            }
+        }
+    }
+
+    let partial_plan = LogicalPlanBuilder::from(pushed_input.as_ref().clone())
+        .aggregate(
+            partial_group_columns.into_iter().map(Expr::Column),
+            partial_aggr_expr,
+        )?
+        .build()?;
+
+    let (left, right) = if is_left {
+        (Arc::new(partial_plan), join.right.clone())
+    } else {
+        (join.left.clone(), Arc::new(partial_plan))
+    };
+    let join_schema = build_join_schema(left.schema(), right.schema(), &join.join_type)?;
+    let join_plan = LogicalPlan::Join(Join {
+        left,
+        right,
+        schema: Arc::new(join_schema),
+        ..join.clone()
+    });
+
+    let combined_plan = LogicalPlanBuilder::from(join_plan)
+        .aggregate(aggregate.group_expr.clone(), combined_aggr_expr)?
+        .build()?;
+
+    // Restore the original output columns (and their types)
+    let num_group_exprs = aggregate.group_expr.len();
+    let mut projection = aggregate.group_expr.clone();
+    for (i, final_expr) in final_exprs.into_iter().enumerate() {
+        let field = aggregate.schema.field(num_group_exprs + i);
+        let final_expr =
+            if &final_expr.get_type(combined_plan.schema().as_ref())? == field.data_type() {
+                final_expr
+            } else {
+                cast(final_expr, field.data_type().clone())
+            };
+        projection.push(final_expr.alias(field.name()));
+    }
+
+    debug!("Pushing down the aggregation below the join");
+    Ok(Some(
+        LogicalPlanBuilder::from(combined_plan)
+            .project(projection)?
+            .build()?,
+    ))
+}
+
+/// Whether grouping the plan by the given columns is expected to reduce its number of rows.
+/// This is assumed unless the statistics of the scanned table show that the columns have
+/// (almost) as many distinct values (together) as the table has rows.
+fn reduces_rows(plan: &LogicalPlan, group_columns: &[Column]) -> bool {
+    let statistics = match scanned_table_statistics(plan) {
+        Some(statistics) if statistics.get_row_count().is_finite() => statistics,
+        _ => return true,
+    };
+
+    let mut num_groups = 1.0;
+    for column in group_columns {
+        match statistics
+            .column(&column.name)
+            .and_then(|column_statistics| column_statistics.get_ndv())
+        {
+            Some(ndv) => num_groups *= ndv,
+            None => return true,
+        }
+    }
+    num_groups <= MAX_PARTIAL_GROUP_FRACTION * statistics.get_row_count()
+}
+
+/// Statistics of the table scanned by the plan, if it only filters or projects a single table
+fn scanned_table_statistics(plan: &LogicalPlan) -> Option<&DaskStatistics> {
+    match plan {
+        LogicalPlan::TableScan(scan) => scan
+            .source
+            .as_any()
+            .downcast_ref::<DaskTableSource>()?
+            .statistics(),
+        LogicalPlan::Filter(_) | LogicalPlan::Projection(_) | LogicalPlan::SubqueryAlias(_) => {
+            scanned_table_statistics(plan.inputs()[0])
+        }
+        _ => None,
+    }
+}
+
+fn is_decomposable(fun: &aggregate_function::AggregateFunction) -> bool {
+    matches!(
+        fun,
+        aggregate_function::AggregateFunction::Sum
+            | aggregate_function::AggregateFunction::Count
+            | aggregate_function::AggregateFunction::Min
+            | aggregate_function::AggregateFunction::Max
+            | aggregate_function::AggregateFunction::Avg
+    )
+}
+
+fn strip_alias(expr: &Expr) -> &Expr {
+    match expr {
+        Expr::Alias(expr, _) => strip_alias(expr),
+        _ => expr,
+    }
+}
+
+fn aggregate_function_expr(fun: aggregate_function::AggregateFunction, args: Vec<Expr>) -> Expr {
+    Expr::AggregateFunction(AggregateFunction {
+        fun,
+        args,
+        distinct: false,
+        filter: None,
+    })
+}
+
+fn column(name: &str) -> Expr {
+    Expr::Column(Column::from_name(name))
+}
@@ -0,0 +1,182 @@
+//! Estimation of the selectivity of filter predicates from column statistics
+//!
+//! The selectivity is the estimated fraction of rows for which a predicate holds.
+//! It is derived from the number of distinct values, the fraction of NULLs, the range
+//! and the histogram of the compared column (see `DaskColumnStatistics`), assuming
+//! that the values are uniformly distributed (within a histogram bucket) and that the
+//! conditions on different columns are independent.
+
+use datafusion_common::ScalarValue;
+use datafusion_expr::{expr::BinaryExpr, Between, Expr, Operator};
+
+use crate::sql::table::{DaskColumnStatistics, DaskStatistics};
+
+/// Estimate the fraction of rows of a table, for which the predicate holds.
+/// Predicates, which can not be estimated from the statistics,
+/// are assumed to have the given default selectivity.
+pub fn estimate_selectivity(
+    predicate: &Expr,
+    statistics: Option<&DaskStatistics>,
+    default_selectivity: f64,
+) -> f64 {
+    let selectivity = |expr: &Expr| estimate_selectivity(expr, statistics, default_selectivity);
+    let stats_of = |expr: &Expr| column_statistics(expr, statistics);
+
+    let estimate = match predicate {
+        Expr::BinaryExpr(BinaryExpr {
+            left,
+            op: Operator::And,
+            right,
+        }) => Some(selectivity(left) * selectivity(right)),
+        Expr::BinaryExpr(BinaryExpr {
+            left,
+            op: Operator::Or,
+            right,
+        }) => {
+            let (left, right) = (selectivity(left), selectivity(right));
+            Some(left + right - left * right)
+        }
+        Expr::Not(expr) => Some(1.0 - selectivity(expr)),
+        Expr::IsNull(expr) => stats_of(expr).and_then(|stats| stats.get_null_fraction()),
+        Expr::IsNotNull(expr) => Some(
+            stats_of(expr)
+                .and_then(|stats| stats.get_null_fraction())
+                .map_or(1.0, |null_fraction| 1.0 - null_fraction),
+        ),
+        Expr::BinaryExpr(BinaryExpr { left, op, right }) => {
+            match (stats_of(left), literal_value(right)) {
+                (Some(stats), Some(value)) => comparison_selectivity(stats, *op, value),
+                _ => match (literal_value(left), stats_of(right)) {
+                    (Some(value), Some(stats)) => {
+                        swap_operator(*op).and_then(|op| comparison_selectivity(stats, op, value))
+                    }
+                    _ => None,
+                },
+            }
+        }
+        Expr::Between(Between {
+            expr,
+            negated,
+            low,
+            high,
+        }) => match (stats_of(expr), literal_value(low), literal_value(high)) {
+            (Some(stats), Some(low), Some(high)) => stats
+                .fraction_below(high)
+                .zip(stats.fraction_below(low))
+                .map(|(below_high, below_low)| {
+                    let selectivity = (below_high - below_low).max(0.0) * non_null_fraction(stats);
+                    if *negated {
+                        non_null_fraction(stats) - selectivity
+                    } else {
+                        selectivity
+                    }
+                }),
+            _ => None,
+        },
+        Expr::InList {
+            expr,
+            list,
+            negated,
+        } => stats_of(expr)
+            .and_then(|stats| stats.distinct_count().map(|ndv| (stats, ndv)))
+            .map(|(stats, ndv)| {
+                let selectivity =
+                    (list.len() as f64 / ndv.max(1.0)).min(1.0) * non_null_fraction(stats);
+                if *negated {
+                    non_null_fraction(stats) - selectivity
+                } else {
+                    selectivity
+                }
+            }),
+        _ => None,
+    };
+
+    estimate.unwrap_or(default_selectivity).clamp(0.0, 1.0)
+}
+
+/// Statistics of the column, if the expression is a (casted) column
+fn column_statistics<'a>(
+    expr: &Expr,
+    statistics: Option<&'a DaskStatistics>,
+) -> Option<&'a DaskColumnStatistics> {
+    match strip_cast(expr) {
+        Expr::Column(column) => statistics?.column(&column.name),
+        _ => None,
+    }
+}
+
+/// Selectivity of `column <op> value`
+fn comparison_selectivity(stats: &DaskColumnStatistics, op: Operator, value: f64) -> Option<f64> {
+    let non_null = non_null_fraction(stats);
+    let equal = || {
+        stats
+            .distinct_count()
+            .map(|ndv| non_null / ndv.max(1.0))
+            .or_else(|| match (stats.get_min(), stats.get_max()) {
+                (Some(min), Some(max)) if value < min || value > max => Some(0.0),
+                _ => None,
+            })
+    };
+
+    match op {
+        Operator::Eq => equal(),
+        Operator::NotEq => equal().map(|selectivity| non_null - selectivity),
+        Operator::Lt | Operator::LtEq => stats
+            .fraction_below(value)
+            .map(|fraction| fraction * non_null),
+        Operator::Gt | Operator::GtEq => stats
+            .fraction_below(value)
+            .map(|fraction| (1.0 - fraction) * non_null),
+        _ => None,
+    }
+}
+
+/// The operator to use if the operands of a comparison are swapped
+fn swap_operator(op: Operator) -> Option<Operator> {
+    match op {
+        Operator::Eq | Operator::NotEq => Some(op),
+        Operator::Lt => Some(Operator::Gt),
+        Operator::LtEq => Some(Operator::GtEq),
+        Operator::Gt => Some(Operator::Lt),
+        Operator::GtEq => Some(Operator::LtEq),
+        _ => None,
+    }
+}
+
+fn non_null_fraction(stats: &DaskColumnStatistics) -> f64 {
+    1.0 - stats.get_null_fraction().unwrap_or(0.0)
+}
+
+fn strip_cast(expr: &Expr) -> &Expr {
+    match expr {
+        Expr::Cast(cast) => strip_cast(&cast.expr),
+        Expr::TryCast(cast) => strip_cast(&cast.expr),
+        _ => expr,
+    }
+}
+
+/// The value of a numeric (or timestamp) literal as float,
+/// with timestamps converted to nanoseconds like in the column statistics
+fn literal_value(expr: &Expr) -> Option<f64> {
+    match strip_cast(expr) {
+        Expr::Literal(value) => match value {
+            ScalarValue::Int8(Some(v)) => Some(*v as f64),
+            ScalarValue::Int16(Some(v)) => Some(*v as f64),
+            ScalarValue::Int32(Some(v)) => Some(*v as f64),
+            ScalarValue::Int64(Some(v)) => Some(*v as f64),
+            ScalarValue::UInt8(Some(v)) => Some(*v as f64),
+            ScalarValue::UInt16(Some(v)) => Some(*v as f64),
+            ScalarValue::UInt32(Some(v)) => Some(*v as f64),
+            ScalarValue::UInt64(Some(v)) => Some(*v as f64),
+            ScalarValue::Float32(Some(v)) => Some(*v as f64),
+            ScalarValue::Float64(Some(v)) => Some(*v),
+            ScalarValue::Boolean(Some(v)) => Some(*v as u8 as f64),
+            ScalarValue::TimestampSecond(Some(v), _) => Some(*v as f64 * 1e9),
+            ScalarValue::TimestampMillisecond(Some(v), _) => Some(*v as f64 * 1e6),
+            ScalarValue::TimestampMicrosecond(Some(v), _) => Some(*v as f64 * 1e3),
+            ScalarValue::TimestampNanosecond(Some(v), _) => Some(*v as f64),
+            _ => None,
+        },
+        _ => None,
+    }
+}
@@ -30,6 +30,14 @@ impl DaskSchema {
         self.tables.insert(table.table_name.clone(), table);
     }
 
+    pub fn drop_table(&mut self, table_name: &str) -> bool {
+        self.tables.remove(table_name).is_some()
+    }
+
+    pub fn drop_function(&mut self, name: &str) -> bool {
+        self.functions.remove(name).is_some()
+    }
+
     pub fn add_or_overload_function(
         &mut self,
         name: String,
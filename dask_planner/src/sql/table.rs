@@ -1,4 +1,4 @@
-use std::{any::Any, sync::Arc};
+use std::{any::Any, collections::HashMap, sync::Arc};
 
 use async_trait::async_trait;
 use datafusion::arrow::datatypes::{DataType, Field, SchemaRef};
@@ -89,23 +89,144 @@ fn is_supported_push_down_expr(_expr: &Expr) -> bool {
     true
 }
 
+/// Statistics of a single column. Values (like min and max) are represented as floats,
+/// with timestamps given in nanoseconds since the epoch.
+#[pyclass(name = "DaskColumnStatistics", module = "dask_planner", subclass)]
+#[derive(Debug, Clone, Default)]
+pub struct DaskColumnStatistics {
+    /// Number of distinct (non-null) values
+    ndv: Option<f64>,
+    /// Fraction of the rows, which are NULL
+    null_fraction: Option<f64>,
+    min: Option<f64>,
+    max: Option<f64>,
+    /// Boundaries of an equi-height histogram: each of the buckets
+    /// between two consecutive boundaries holds the same number of rows
+    histogram: Vec<f64>,
+}
+
+#[pymethods]
+impl DaskColumnStatistics {
+    #[new]
+    pub fn new(
+        ndv: Option<f64>,
+        null_fraction: Option<f64>,
+        min: Option<f64>,
+        max: Option<f64>,
+        histogram: Option<Vec<f64>>,
+    ) -> Self {
+        Self {
+            ndv,
+            null_fraction,
+            min,
+            max,
+            histogram: histogram.unwrap_or_default(),
+        }
+    }
+
+    #[pyo3(name = "getNDV")]
+    pub fn get_ndv(&self) -> Option<f64> {
+        self.ndv
+    }
+
+    #[pyo3(name = "getNullFraction")]
+    pub fn get_null_fraction(&self) -> Option<f64> {
+        self.null_fraction
+    }
+
+    #[pyo3(name = "getMin")]
+    pub fn get_min(&self) -> Option<f64> {
+        self.min
+    }
+
+    #[pyo3(name = "getMax")]
+    pub fn get_max(&self) -> Option<f64> {
+        self.max
+    }
+
+    #[pyo3(name = "getHistogram")]
+    pub fn get_histogram(&self) -> Vec<f64> {
+        self.histogram.clone()
+    }
+}
+
+impl DaskColumnStatistics {
+    /// Estimated number of distinct values: the NDV if known,
+    /// otherwise bounded by the range of integral values
+    pub fn distinct_count(&self) -> Option<f64> {
+        match (self.ndv, self.min, self.max) {
+            (Some(ndv), _, _) => Some(ndv),
+            (None, Some(min), Some(max)) if min.fract() == 0.0 && max.fract() == 0.0 => {
+                Some(max - min + 1.0)
+            }
+            _ => None,
+        }
+    }
+
+    /// Estimated fraction of the non-null values, which are smaller than (or equal to) the value
+    pub fn fraction_below(&self, value: f64) -> Option<f64> {
+        let histogram = &self.histogram;
+        if histogram.len() >= 2 {
+            let num_buckets = (histogram.len() - 1) as f64;
+            if value < histogram[0] {
+                return Some(0.0);
+            }
+            for (i, bounds) in histogram.windows(2).enumerate() {
+                if value < bounds[1] {
+                    // Assume the values to be uniformly distributed within a bucket
+                    let within = (value - bounds[0]) / (bounds[1] - bounds[0]);
+                    return Some((i as f64 + within) / num_buckets);
+                }
+            }
+            return Some(1.0);
+        }
+
+        match (self.min, self.max) {
+            (Some(min), Some(max)) if max > min => {
+                Some(((value - min) / (max - min)).clamp(0.0, 1.0))
+            }
+            (Some(min), Some(_)) => Some(if value < min { 0.0 } else { 1.0 }),
+            _ => None,
+        }
+    }
+}
+
 #[pyclass(name = "DaskStatistics", module = "dask_planner", subclass)]
 #[derive(Debug, Clone)]
 pub struct DaskStatistics {
     row_count: f64,
+    column_statistics: HashMap<String, DaskColumnStatistics>,
 }
 
 #[pymethods]
 impl DaskStatistics {
     #[new]
-    pub fn new(row_count: f64) -> Self {
-        Self { row_count }
+    pub fn new(
+        row_count: f64,
+        column_statistics: Option<HashMap<String, DaskColumnStatistics>>,
+    ) -> Self {
+        Self {
+            row_count,
+            column_statistics: column_statistics.unwrap_or_default(),
+        }
     }
 
     #[pyo3(name = "getRowCount")]
     pub fn get_row_count(&self) -> f64 {
         self.row_count
     }
+
+    #[pyo3(name = "getColumnStatistics")]
+    pub fn get_column_statistics(&self, column_name: &str) -> Option<DaskColumnStatistics> {
+        self.column_statistics.get(column_name).cloned()
+    }
+}
+
+impl DaskStatistics {
+    /// Access the statistics of a single column (if known)
+    pub fn column(&self, column_name: &str) -> Option<&DaskColumnStatistics> {
+        self.column_statistics.get(column_name)
+    }
 }
 
 #[pyclass(name = "DaskTable", module = "dask_planner", subclass)]
@@ -127,11 +248,12 @@ impl DaskTable {
         row_count: f64,
         columns: Option<Vec<(String, DaskTypeMap)>>,
         filepath: Option<String>,
+        column_statistics: Option<HashMap<String, DaskColumnStatistics>>,
     ) -> Self {
         Self {
             schema_name: Some(schema_name.to_owned()),
             table_name: table_name.to_owned(),
-            statistics: DaskStatistics::new(row_count),
+            statistics: DaskStatistics::new(row_count, column_statistics),
             columns: columns.unwrap_or_default(),
             filepath,
         }
@@ -221,7 +343,7 @@ pub(crate) fn table_from_logical_plan(
             Ok(Some(DaskTable {
                 schema_name: Some(schema),
                 table_name: String::from(tbl),
-                statistics: DaskStatistics { row_count: 0.0 },
+                statistics: DaskStatistics::new(0.0, None),
                 columns: cols,
                 filepath: None,
             }))
@@ -250,7 +372,7 @@ pub(crate) fn table_from_logical_plan(
             Ok(Some(DaskTable {
                 schema_name: Some(String::from("EmptySchema")),
                 table_name: String::from("EmptyRelation"),
-                statistics: DaskStatistics { row_count: 0.0 },
+                statistics: DaskStatistics::new(0.0, None),
                 columns: cols,
                 filepath: None,
             }))
@@ -261,7 +383,7 @@ pub(crate) fn table_from_logical_plan(
                 Ok(Some(DaskTable {
                     schema_name: e.schema_name.clone(),
                     table_name: e.table_name.clone(),
-                    statistics: DaskStatistics { row_count: 0.0 },
+                    statistics: DaskStatistics::new(0.0, None),
                     columns: vec![],
                     filepath: None,
                 }))
@@ -269,7 +391,7 @@ pub(crate) fn table_from_logical_plan(
                 Ok(Some(DaskTable {
                     schema_name: e.schema_name.clone(),
                     table_name: e.model_name.clone(),
-                    statistics: DaskStatistics { row_count: 0.0 },
+                    statistics: DaskStatistics::new(0.0, None),
                     columns: vec![],
                     filepath: None,
                 }))
@@ -1,9 +1,9 @@
 from . import _version, config
 from .cmd import cmd_loop
 from .context import Context
-from .datacontainer import Statistics
+from .datacontainer import ColumnStatistics, Statistics
 from .server.app import run_server
 
 __version__ = _version.get_versions()["version"]
 
-__all__ = [__version__, cmd_loop, Context, run_server, Statistics]
+__all__ = [__version__, cmd_loop, ColumnStatistics, Context, run_server, Statistics]
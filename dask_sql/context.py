@@ -1,15 +1,25 @@
 import asyncio
+import datetime
+import decimal
 import inspect
+import itertools
 import logging
+import math
+import numbers
+import re
 from collections import Counter
-from typing import Any, Callable, Dict, List, Tuple, Union
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import dask.dataframe as dd
+import numpy as np
 import pandas as pd
 from dask import config as dask_config
-from dask.base import optimize
+from dask.base import optimize, tokenize
+from dask.utils import parse_bytes
 
 from dask_planner.rust import (
+    DaskColumnStatistics,
     DaskSchema,
     DaskSQLContext,
     DaskTable,
@@ -19,7 +29,10 @@ from dask_planner.rust import (
 )
 
 try:
-    from dask_sql.physical.utils.statistics import parquet_statistics
+    from dask_sql.physical.utils.statistics import (
+        merge_column_statistics,
+        parquet_statistics,
+    )
 except ModuleNotFoundError:
     parquet_statistics = None
 
@@ -31,8 +44,10 @@ except ImportError:  # pragma: no cover
 from dask_sql import input_utils
 from dask_sql.datacontainer import (
     UDF,
+    ColumnStatistics,
     DataContainer,
     FunctionDescription,
+    Partitioning,
     SchemaContainer,
     Statistics,
 )
@@ -40,11 +55,49 @@ from dask_sql.input_utils import InputType, InputUtil
 from dask_sql.integrations.ipython import ipython_integration
 from dask_sql.mappings import python_to_sql_type
 from dask_sql.physical.rel import RelConverter, custom, logical
+from dask_sql.physical.rel.logical.join import annotate_join_strategies
 from dask_sql.physical.rex import RexConverter, core
-from dask_sql.utils import OptimizationException, ParsingException
+from dask_sql.physical.utils.analyze import load_statistics
+from dask_sql.prepared_statement import PreparedStatement
+from dask_sql.utils import (
+    LRUCache,
+    OptimizationException,
+    ParsingException,
+    QueryTimings,
+    normalize_sql,
+    number_placeholders,
+    parse_hints,
+    persisted_nbytes,
+)
 
 logger = logging.getLogger(__name__)
 
+# Relational operators whose result only depends on the tables they scan
+RESULT_CACHEABLE_NODE_TYPES = {
+    "Aggregate",
+    "CrossJoin",
+    "Distinct",
+    "EmptyRelation",
+    "Filter",
+    "Join",
+    "Limit",
+    "Projection",
+    "Repartition",
+    "Sort",
+    "SubqueryAlias",
+    "TableScan",
+    "Union",
+    "Window",
+}
+
+# Functions, which give a different result on every evaluation
+# (see the operations of dask_sql.physical.rex.core.call.RexCallPlugin)
+VOLATILE_FUNCTIONS_PATTERN = re.compile(
+    r"\b(?:rand|random|rand_integer|now|localtime|localtimestamp"
+    r"|current_time|current_date|current_timestamp)\b",
+    re.IGNORECASE,
+)
+
 
 class Context:
     """
@@ -100,6 +153,26 @@ class Context:
         # Create the `DaskSQLContext` Rust context
         self.context = DaskSQLContext(self.catalog_name, self.schema_name)
         self.context.register_schema(self.schema_name, DaskSchema(self.schema_name))
+        # Identifier case sensitivity the Rust catalog was last synced with
+        self._catalog_case_sensitive = dask_config.get("sql.identifier.case_sensitive")
+        # Source of the schema versions, unique over the lifetime of this context
+        self._catalog_versions = itertools.count(1)
+        # Optimized logical plans of recently seen queries
+        self._plan_cache = LRUCache(maxsize=dask_config.get("sql.plan_cache.size"))
+        # Parameter values of the prepared statement currently being executed
+        self._bound_parameters = {}
+        # Already converted subtrees of the query currently being converted
+        self._converted_rels = None
+        # Collects per-operator measurements while running EXPLAIN ANALYZE
+        self._profiler = None
+        # Time spent in the phases of the last and the currently running query
+        self.last_query_timings = None
+        self._timings = None
+        self._timings_callbacks = []
+        # Persisted results of recently executed queries, sized in bytes
+        self._result_cache = LRUCache(
+            maxsize=parse_bytes(dask_config.get("sql.result_cache.size"))
+        )
 
         # # Register any default plugins, if nothing was registered before.
         RelConverter.add_plugin_class(logical.DaskAggregatePlugin, replace=False)
@@ -116,6 +189,7 @@ class Context:
         RelConverter.add_plugin_class(logical.DaskWindowPlugin, replace=False)
         RelConverter.add_plugin_class(logical.SamplePlugin, replace=False)
         RelConverter.add_plugin_class(logical.ExplainPlugin, replace=False)
+        RelConverter.add_plugin_class(logical.ExplainAnalyzePlugin, replace=False)
         RelConverter.add_plugin_class(logical.SubqueryAlias, replace=False)
         RelConverter.add_plugin_class(custom.AnalyzeTablePlugin, replace=False)
         RelConverter.add_plugin_class(custom.CreateExperimentPlugin, replace=False)
@@ -161,6 +235,7 @@ class Context:
         schema_name: str = None,
         statistics: Statistics = None,
         gpu: bool = False,
+        partitioned_by: List[str] = None,
         **kwargs,
     ):
         """
@@ -226,6 +301,9 @@ class Context:
             statistics: (:obj:`Statistics`): if given, use these statistics during the cost-based optimization.
             gpu: (:obj:`bool`): if set to true, use dask-cudf to run the data frame calculations on your GPU.
                 Please note that the GPU support is currently not covering all of dask-sql's SQL language.
+            partitioned_by: (:obj:`List[str]`): if given, the table is already hash-partitioned on these columns,
+                as done by ``DataFrame.shuffle(partitioned_by)`` (or ``DISTRIBUTE BY``). Joins on them with tables
+                partitioned in the same way are then computed partition by partition, without a shuffle.
             **kwargs: Additional arguments for specific formats. See :ref:`data_input` for more information.
 
         """
@@ -248,13 +326,34 @@ class Context:
             dc.filepath = input_table
             self.schema[schema_name].filepaths[table_name.lower()] = input_table
 
+        if partitioned_by:
+            missing_columns = set(partitioned_by) - set(dc.df.columns)
+            if missing_columns:
+                raise ValueError(
+                    f"The table is partitioned by the unknown columns {missing_columns}"
+                )
+            dc.partitioning = Partitioning.from_df(dc.df, partitioned_by)
+
+        if (
+            type(input_table) == str
+            and not statistics
+            and dask_config.get("sql.statistics.persist")
+        ):
+            # Statistics stored by a previous ANALYZE TABLE
+            statistics = load_statistics(input_table)
+
         if parquet_statistics and not statistics:
-            statistics = parquet_statistics(dc.df)
+            statistics = parquet_statistics(
+                dc.df,
+                columns=[column for column in dc.df.columns if isinstance(column, str)],
+            )
             if statistics:
                 row_count = 0
                 for d in statistics:
                     row_count += d["num-rows"]
-                statistics = Statistics(row_count)
+                statistics = Statistics(
+                    row_count, columns=merge_column_statistics(statistics)
+                )
         if not statistics:
             statistics = Statistics(float("nan"))
         dc.statistics = statistics
@@ -262,6 +361,24 @@ class Context:
         self.schema[schema_name].tables[table_name.lower()] = dc
         self.schema[schema_name].statistics[table_name.lower()] = statistics
 
+        self.context.register_table(
+            schema_name, self._prepare_table(schema_name, table_name.lower())
+        )
+        self._bump_schema_version(schema_name)
+
+    def _set_statistics(
+        self, schema_name: str, table_name: str, statistics: Statistics
+    ):
+        """Replace the statistics of a registered table (e.g. after ANALYZE TABLE)"""
+        schema = self.schema[schema_name]
+        schema.tables[table_name].statistics = statistics
+        schema.statistics[table_name] = statistics
+
+        self.context.register_table(
+            schema_name, self._prepare_table(schema_name, table_name)
+        )
+        self._bump_schema_version(schema_name)
+
     def drop_table(self, table_name: str, schema_name: str = None):
         """
         Remove a table with the given name from the registered tables.
@@ -274,6 +391,9 @@ class Context:
         schema_name = schema_name or self.schema_name
         del self.schema[schema_name].tables[table_name]
 
+        self.context.drop_table(schema_name, table_name)
+        self._bump_schema_version(schema_name)
+
     def drop_schema(self, schema_name: str):
         """
         Remove a schema with the given name from the registered schemas.
@@ -287,9 +407,11 @@ class Context:
             raise RuntimeError(f"Default Schema `{schema_name}` cannot be deleted")
 
         del self.schema[schema_name]
+        self.context.drop_schema(schema_name)
 
         if self.schema_name == schema_name:
             self.schema_name = self.DEFAULT_SCHEMA_NAME
+            self.context.use_schema(self.schema_name)
 
     def register_function(
         self,
@@ -482,25 +604,65 @@ class Context:
             gpu (:obj:`bool`): Whether or not to load the additional Dask or pandas dataframes (if any) on GPU;
                 requires cuDF / dask-cuDF if enabled. Defaults to False.
             config_options (:obj:`Dict[str,Any]`): Specific configuration options to pass during
-                query execution
+                query execution. Optimizer hints in the query itself
+                (e.g. ``/*+ SPLIT_OUT(16) */``) take precedence over them.
         Returns:
             :obj:`dask.dataframe.DataFrame`: the created data frame of this query.
         """
-        with dask_config.set(config_options):
+        hints = parse_hints(sql) if isinstance(sql, str) else {}
+        with dask_config.set(config_options), dask_config.set(hints):
             if dataframes is not None:
                 for df_name, df in dataframes.items():
                     self.create_table(df_name, df, gpu=gpu)
 
-            if isinstance(sql, str):
-                rel, _ = self._get_ral(sql)
-            elif isinstance(sql, LogicalPlan):
-                rel = sql
-            else:
-                raise RuntimeError(
-                    f"Encountered unsupported `LogicalPlan` sql type: {type(sql)}"
-                )
+            with self._record_timings(sql if isinstance(sql, str) else None):
+                if isinstance(sql, str):
+                    rel, _ = self._get_ral(sql)
+                elif isinstance(sql, LogicalPlan):
+                    rel = sql
+                else:
+                    raise RuntimeError(
+                        f"Encountered unsupported `LogicalPlan` sql type: {type(sql)}"
+                    )
+
+                return self._compute_table_from_rel(rel, return_futures)
+
+    def prepare(
+        self,
+        sql: str,
+        dataframes: Dict[str, Union[dd.DataFrame, pd.DataFrame]] = None,
+        gpu: bool = False,
+    ) -> PreparedStatement:
+        """
+        Parse, plan and optimize a query with parameters once, so that it can
+        be executed many times with different parameter values without
+        going through the SQL planner again.
+        Parameters are written as positional ``?`` or numbered ``$1``, ``$2``, ...
+        placeholders (but not both in one query). The types of the parameters can optionally be
+        given with the ``PREPARE name(type, ...) AS <query>`` syntax.
+
+        Example:
+            .. code-block:: python
 
-            return self._compute_table_from_rel(rel, return_futures)
+                query = c.prepare("SELECT a, b FROM my_table WHERE a > ? AND b = ?")
+                result = query.execute(3, "x")
+                print(result.compute())
+
+        Args:
+            sql (:obj:`str`): The query string with placeholders
+            dataframes (:obj:`Dict[str, dask.dataframe.DataFrame]`): additional Dask or pandas dataframes
+                to register before preparing this query
+            gpu (:obj:`bool`): Whether or not to load the additional Dask or pandas dataframes (if any) on GPU;
+                requires cuDF / dask-cuDF if enabled. Defaults to False.
+        Returns:
+            :obj:`dask_sql.prepared_statement.PreparedStatement`: the query, ready to be executed
+        """
+        if dataframes is not None:
+            for df_name, df in dataframes.items():
+                self.create_table(df_name, df, gpu=gpu)
+
+        sql, num_parameters = number_placeholders(sql)
+        return PreparedStatement(self, sql, num_parameters)
 
     def explain(
         self,
@@ -532,8 +694,8 @@ class Context:
             for df_name, df in dataframes.items():
                 self.create_table(df_name, df, gpu=gpu)
 
-        _, rel_string = self._get_ral(sql)
-        return rel_string
+        rel, rel_string = self._get_ral(sql)
+        return annotate_join_strategies(rel, rel_string, self)
 
     def visualize(self, sql: str, filename="mydask.png") -> None:  # pragma: no cover
         """Visualize the computation of the given SQL into the png"""
@@ -542,6 +704,45 @@ class Context:
 
         result.visualize(filename)
 
+    def plan_cache_info(self):
+        """
+        Return the statistics of the cache of optimized logical plans
+        as a named tuple of ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+        The size of the cache can be controlled with the ``sql.plan_cache.size``
+        configuration option.
+        """
+        return self._plan_cache.info()
+
+    def result_cache_info(self):
+        """
+        Return the statistics of the cache of query results
+        as a named tuple of ``hits``, ``misses``, ``maxsize`` and ``currsize``
+        (the latter two in bytes).
+        The memory budget of the cache can be controlled with the ``sql.result_cache.size``
+        configuration option.
+        """
+        return self._result_cache.info()
+
+    def register_timings_callback(self, callback: Callable[[QueryTimings], None]):
+        """
+        Register a function, which is called with the :class:`~dask_sql.utils.QueryTimings`
+        of every query executed with this context, e.g. to export them
+        to a metrics system and alert on regressions of the planning latency.
+        The timings of the last query are also available as ``last_query_timings``.
+
+        Example:
+            .. code-block:: python
+
+                def report(timings):
+                    planning_latency.observe(timings.planning)
+
+                c.register_timings_callback(report)
+
+        Args:
+            callback (:obj:`Callable`): function to call with the timings of every query
+        """
+        self._timings_callbacks.append(callback)
+
     def create_schema(self, schema_name: str):
         """
         Create a new schema in the database.
@@ -550,6 +751,7 @@ class Context:
             schema_name (:obj:`str`): The name of the schema to create
         """
         self.schema[schema_name] = SchemaContainer(schema_name)
+        self.context.register_schema(schema_name, DaskSchema(schema_name))
 
     def alter_schema(self, old_schema_name, new_schema_name):
         """
@@ -560,6 +762,13 @@ class Context:
              new_schema_name:
         """
         self.schema[new_schema_name] = self.schema.pop(old_schema_name)
+        self._bump_schema_version(new_schema_name)
+
+        # All tables hold their schema name, so the planner schema needs a rebuild
+        self.context.drop_schema(old_schema_name)
+        self.context.register_schema(
+            new_schema_name, self._prepare_schema(new_schema_name)
+        )
 
     def alter_table(self, old_table_name, new_table_name, schema_name=None):
         """
@@ -576,6 +785,12 @@ class Context:
         self.schema[schema_name].tables[new_table_name] = self.schema[
             schema_name
         ].tables.pop(old_table_name)
+        self._bump_schema_version(schema_name)
+
+        self.context.drop_table(schema_name, old_table_name)
+        self.context.register_table(
+            schema_name, self._prepare_table(schema_name, new_table_name)
+        )
 
     def register_experiment(
         self,
@@ -719,79 +934,172 @@ class Context:
         logger.debug(
             f"There are {len(self.schema)} existing schema(s): {self.schema.keys()}"
         )
-        schema_list = []
+        return [self._prepare_schema(schema_name) for schema_name in self.schema]
 
-        for schema_name, schema in self.schema.items():
-            logger.debug(f"Preparing Schema: '{schema_name}'")
-            rust_schema = DaskSchema(schema_name)
+    def _prepare_schema(self, schema_name: str) -> DaskSchema:
+        """
+        Create a single Rust schema filled with the dataframes
+        and functions registered in the given schema
+        """
+        logger.debug(f"Preparing Schema: '{schema_name}'")
+        schema = self.schema[schema_name]
+        rust_schema = DaskSchema(schema_name)
+
+        if not schema.tables:
+            logger.warning("No tables are registered.")
+
+        for name in schema.tables:
+            rust_schema.add_table(self._prepare_table(schema_name, name))
+
+        if not schema.functions:
+            logger.debug("No custom functions defined.")
+        for function_description in schema.function_lists:
+            name = function_description.name
+            sql_return_type = function_description.return_type
+            sql_parameters = function_description.parameters
+            logger.debug(
+                f"Adding function '{name}' to schema as "
+                f"{'aggregation' if function_description.aggregation else 'scalar function'}."
+            )
+            rust_schema.add_or_overload_function(
+                name,
+                [param[1].getDataType() for param in sql_parameters],
+                sql_return_type.getDataType(),
+                function_description.aggregation,
+            )
 
-            if not schema.tables:
-                logger.warning("No tables are registered.")
+        return rust_schema
 
-            for name, dc in schema.tables.items():
-                row_count = (
-                    float(schema.statistics[name].row_count)
-                    if name in schema.statistics
-                    else float(0)
-                )
+    def _prepare_table(self, schema_name: str, table_name: str) -> DaskTable:
+        """
+        Create the Rust table for a single registered dataframe
+        """
+        schema = self.schema[schema_name]
+        dc = schema.tables[table_name]
 
-                filepath = schema.filepaths[name] if name in schema.filepaths else None
-                df = dc.df
-                columns = df.columns
-                cc = dc.column_container
-                if not dask_config.get("sql.identifier.case_sensitive"):
-                    columns = [col.lower() for col in columns]
-                    cc = cc.rename_handle_duplicates(df.columns, columns)
-                    dc.column_container = cc
-                column_type_mapping = list(
-                    zip(columns, map(python_to_sql_type, df.dtypes))
-                )
-                table = DaskTable(
-                    schema_name, name, row_count, column_type_mapping, filepath
-                )
+        row_count = (
+            float(schema.statistics[table_name].row_count)
+            if table_name in schema.statistics
+            else float(0)
+        )
 
-                rust_schema.add_table(table)
-
-            if not schema.functions:
-                logger.debug("No custom functions defined.")
-            for function_description in schema.function_lists:
-                name = function_description.name
-                sql_return_type = function_description.return_type
-                sql_parameters = function_description.parameters
-                if function_description.aggregation:
-                    logger.debug(f"Adding function '{name}' to schema as aggregation.")
-                    rust_schema.add_or_overload_function(
-                        name,
-                        [param[1].getDataType() for param in sql_parameters],
-                        sql_return_type.getDataType(),
-                        True,
-                    )
-                else:
-                    logger.debug(
-                        f"Adding function '{name}' to schema as scalar function."
-                    )
-                    rust_schema.add_or_overload_function(
-                        name,
-                        [param[1].getDataType() for param in sql_parameters],
-                        sql_return_type.getDataType(),
-                        False,
+        filepath = schema.filepaths.get(table_name)
+        df = dc.df
+        columns = df.columns
+        cc = dc.column_container
+        if not dask_config.get("sql.identifier.case_sensitive"):
+            columns = [col.lower() for col in columns]
+            cc = cc.rename_handle_duplicates(df.columns, columns)
+            dc.column_container = cc
+        column_type_mapping = list(zip(columns, map(python_to_sql_type, df.dtypes)))
+
+        column_statistics = {}
+        if table_name in schema.statistics:
+            statistics = schema.statistics[table_name].columns
+            for df_column, column in zip(df.columns, columns):
+                if df_column in statistics:
+                    column_statistics[column] = self._prepare_column_statistics(
+                        statistics[df_column]
                     )
 
-            schema_list.append(rust_schema)
+        return DaskTable(
+            schema_name,
+            table_name,
+            row_count,
+            column_type_mapping,
+            filepath,
+            column_statistics,
+        )
+
+    @staticmethod
+    def _prepare_column_statistics(
+        column_statistics: ColumnStatistics,
+    ) -> DaskColumnStatistics:
+        """
+        Create the Rust statistics of a single column,
+        which represent all values (like min and max) as floats
+        """
+        histogram = None
+        if column_statistics.histogram is not None:
+            histogram = [_to_float(value) for value in column_statistics.histogram]
+            if None in histogram:
+                histogram = None
+
+        return DaskColumnStatistics(
+            _to_float(column_statistics.ndv),
+            _to_float(column_statistics.null_fraction),
+            _to_float(column_statistics.min),
+            _to_float(column_statistics.max),
+            histogram,
+        )
 
-        return schema_list
+    def _sync_schemas(self):
+        """
+        Make sure the Rust catalog reflects the registered schemas.
+        Tables and functions are kept in sync incrementally on registration,
+        so a full rebuild is only needed if the identifier case sensitivity
+        (which changes the registered column names) was changed since.
+        """
+        case_sensitive = dask_config.get("sql.identifier.case_sensitive")
+        if case_sensitive == self._catalog_case_sensitive:
+            return
+
+        logger.debug("Identifier case sensitivity changed, rebuilding all schemas")
+        self._catalog_case_sensitive = case_sensitive
+        for schema in self._prepare_schemas():
+            self.context.register_schema(schema.name, schema)
+
+    def _bump_schema_version(self, schema_name: str):
+        """Mark the given schema as changed, which invalidates all plans depending on it"""
+        self.schema[schema_name].version = next(self._catalog_versions)
+
+    def _get_plan_cache_key(self, sql: str) -> Tuple:
+        """
+        Key of a query in the plan cache: a plan can only be reused if the
+        query, the registered catalog (every change increments the version of
+        its schema) and the sql configuration are all still the same.
+        """
+        catalog_version = tuple(
+            (schema_name, schema.version) for schema_name, schema in self.schema.items()
+        )
+        return (
+            normalize_sql(sql),
+            self.schema_name,
+            catalog_version,
+            tokenize(dask_config.get("sql")),
+        )
 
     def _get_ral(self, sql):
         """Helper function to turn the sql query into a relational algebra and resulting column names"""
 
         logger.debug(f"Entering _get_ral('{sql}')")
 
-        # get the schema of what we currently have registered
-        schemas = self._prepare_schemas()
-        for schema in schemas:
-            self.context.register_schema(schema.name, schema)
+        # make sure the planner sees what we currently have registered
+        self._sync_schemas()
+
+        cache_size = dask_config.get("sql.plan_cache.size")
+        if cache_size:
+            cache_key = self._get_plan_cache_key(sql)
+            cached = self._plan_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Reusing cached relational algebra")
+                if self._timings is not None:
+                    self._timings.plan_cache_hit = True
+                return cached
+
+        rel, rel_string = self._plan_sql(sql)
+
+        if cache_size:
+            self._plan_cache.maxsize = cache_size
+            self._plan_cache.put(cache_key, (rel, rel_string))
+
+        return rel, rel_string
+
+    def _plan_sql(self, sql):
+        """Parse, plan and optimize the sql query without consulting the plan cache"""
         try:
-            sqlTree = self.context.parse_sql(sql)
+            with self._measure("parse"):
+                sqlTree = self.context.parse_sql(sql)
         except DFParsingException as pe:
             raise ParsingException(sql, str(pe))
         logger.debug(f"_get_ral -> sqlTree: {sqlTree}")
@@ -805,17 +1113,24 @@ class Context:
             )
 
         try:
-            nonOptimizedRel = self.context.logical_relational_algebra(sqlTree[0])
+            with self._measure("plan"):
+                nonOptimizedRel = self.context.logical_relational_algebra(sqlTree[0])
         except DFParsingException as pe:
             raise ParsingException(sql, str(pe)) from None
 
         # Optimize the `LogicalPlan` or skip if configured
         if dask_config.get("sql.optimize"):
+            self.context.set_optimizer_config(
+                dask_config.get("sql.optimizer.push_down_aggregate")
+            )
             try:
-                rel = self.context.optimize_relational_algebra(nonOptimizedRel)
+                with self._measure("optimize"):
+                    rel = self.context.optimize_relational_algebra(nonOptimizedRel)
             except DFOptimizationException as oe:
                 rel = nonOptimizedRel
                 raise OptimizationException(str(oe)) from None
+            if self._timings is not None:
+                self._timings.optimizer_rules = self.context.get_optimizer_timings()
         else:
             rel = nonOptimizedRel
 
@@ -825,13 +1140,121 @@ class Context:
 
         return rel, rel_string
 
+    @contextmanager
+    def _record_timings(self, sql: str = None):
+        """Collect the timings of the query executed within the block and report them"""
+        previous_timings = self._timings
+        timings = self._timings = QueryTimings(sql)
+        try:
+            yield timings
+        finally:
+            self._timings = previous_timings
+
+        self.last_query_timings = timings
+        for callback in self._timings_callbacks:
+            callback(timings)
+
+    @contextmanager
+    def _measure(self, phase: str):
+        """Add the time spent in the block to the given phase of the current query (if any)"""
+        if self._timings is None:
+            yield
+        else:
+            with self._timings.measure(phase):
+                yield
+
+    @contextmanager
+    def _bind_parameters(self, parameters: Dict[str, Any]):
+        """Make the given parameter values available to the placeholders of the converted plan"""
+        previous_parameters = self._bound_parameters
+        self._bound_parameters = parameters
+        try:
+            yield
+        finally:
+            self._bound_parameters = previous_parameters
+
+    @contextmanager
+    def _memoize_conversions(self):
+        """Share the result of converting identical subtrees within a single query"""
+        previous_converted_rels = self._converted_rels
+        self._converted_rels = {}
+        try:
+            yield
+        finally:
+            self._converted_rels = previous_converted_rels
+
+    def _get_result_cache_key(self, rel: "LogicalPlan"):
+        """
+        Key of a query result in the result cache: the fingerprint of the optimized
+        plan, the identity of every scanned table, the registered catalog (every
+        change, e.g. replacing a function, increments the version of its schema),
+        the bound parameters and the configuration.
+        Returns None if the result of the plan can not be cached, e.g. because
+        it calls a volatile function like ``RAND()`` or ``CURRENT_TIMESTAMP``.
+        """
+        plan_hash = rel.getStructuralHash()
+        if plan_hash is None or VOLATILE_FUNCTIONS_PATTERN.search(
+            rel.explain_original()
+        ):
+            return None
+
+        scanned_tables = []
+        stack = [rel]
+        while stack:
+            node = stack.pop()
+            node_type = node.get_current_node_type()
+            if node_type not in RESULT_CACHEABLE_NODE_TYPES:
+                return None
+            if node_type == "TableScan":
+                schema_name, table_name = [n.lower() for n in self.fqn(node.getTable())]
+                dc = self.schema[schema_name].tables[table_name]
+                scanned_tables.append(
+                    (
+                        schema_name,
+                        table_name,
+                        tokenize(dc.df, dc.column_container.columns),
+                    )
+                )
+            stack.extend(node.get_inputs())
+
+        sql_config = {
+            key: value
+            for key, value in dask_config.get("sql").items()
+            if key != "result_cache"
+        }
+        catalog_version = tuple(
+            (schema_name, schema.version) for schema_name, schema in self.schema.items()
+        )
+        return (
+            plan_hash,
+            tuple(sorted(scanned_tables)),
+            catalog_version,
+            tokenize(self._bound_parameters),
+            tokenize(sql_config),
+        )
+
     def _compute_table_from_rel(self, rel: "LogicalPlan", return_futures: bool = True):
-        dc = RelConverter.convert(rel, context=self)
+        result_cache_size = parse_bytes(dask_config.get("sql.result_cache.size"))
+        cache_key = None
+        if result_cache_size:
+            cache_key = self._get_result_cache_key(rel)
+
+        if cache_key is not None:
+            df = self._result_cache.get(cache_key)
+            if df is not None:
+                logger.debug("Reusing cached query result")
+                if not return_futures:
+                    with self._measure("compute"):
+                        df = df.compute()
+                return df
+
+        with self._measure("convert"), self._memoize_conversions():
+            dc = RelConverter.convert(rel, context=self)
 
         # Optimization might remove some alias projects. Make sure to keep them here.
         select_names = [field for field in rel.getRowType().getFieldList()]
 
-        if rel.get_current_node_type() == "Explain":
+        if rel.get_current_node_type() in ("Explain", "Analyze"):
             return dc
         if dc is None:
             return
@@ -857,8 +1280,15 @@ class Context:
             dc = DataContainer(dc.df, cc)
 
         df = dc.assign()
+
+        if cache_key is not None:
+            df = df.persist()
+            self._result_cache.maxsize = result_cache_size
+            self._result_cache.put(cache_key, df, size=persisted_nbytes(df))
+
         if not return_futures:
-            df = df.compute()
+            with self._measure("compute"):
+                df = df.compute()
 
         return df
 
@@ -915,20 +1345,40 @@ class Context:
                     )
                 )
                 del schema.functions[lower_name]
+                self.context.drop_function(schema_name, name.upper())
+                self.context.drop_function(schema_name, name.lower())
 
             elif schema.functions[lower_name] != f:
                 raise ValueError(
                     "Registering multiple functions with the same name is only permitted if replace=True"
                 )
 
-        schema.function_lists.append(
-            FunctionDescription(
-                name.upper(), sql_parameters, sql_return_type, aggregation
+        for function_name in [name.upper(), name.lower()]:
+            schema.function_lists.append(
+                FunctionDescription(
+                    function_name, sql_parameters, sql_return_type, aggregation
+                )
             )
-        )
-        schema.function_lists.append(
-            FunctionDescription(
-                name.lower(), sql_parameters, sql_return_type, aggregation
+            self.context.register_function(
+                schema_name,
+                function_name,
+                [param[1].getDataType() for param in sql_parameters],
+                sql_return_type.getDataType(),
+                aggregation,
             )
-        )
         schema.functions[lower_name] = f
+        self._bump_schema_version(schema_name)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """
+    Convert a statistics value into the float understood by the planner,
+    with timestamps (and dates) given in nanoseconds since the epoch.
+    Returns None for values, which have no such representation (e.g. strings).
+    """
+    if isinstance(value, (datetime.date, np.datetime64)):
+        value = pd.Timestamp(value)
+        return None if pd.isna(value) else float(value.value)
+    if isinstance(value, (numbers.Real, decimal.Decimal)) and not math.isnan(value):
+        return float(value)
+    return None
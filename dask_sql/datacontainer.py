@@ -171,22 +171,111 @@ class ColumnContainer:
         )
 
 
+class ColumnStatistics:
+    """
+    Statistics of a single column, used during the cost-based optimization
+    to estimate the selectivity of filters and the number of groups.
+    All of them are optional:
+
+    * ``ndv``: the number of distinct (non-null) values
+    * ``null_fraction``: the fraction of rows, which are NULL
+    * ``min`` and ``max``: the smallest and largest value
+    * ``histogram``: the boundaries of an equi-height histogram, i.e. ``n + 1``
+      increasing values, such that each of the ``n`` buckets in between
+      holds the same number of rows
+    """
+
+    def __init__(
+        self,
+        ndv: float = None,
+        null_fraction: float = None,
+        min: Any = None,
+        max: Any = None,
+        histogram: List[Any] = None,
+    ) -> None:
+        self.ndv = ndv
+        self.null_fraction = null_fraction
+        self.min = min
+        self.max = max
+        self.histogram = histogram
+
+    def __eq__(self, other):
+        if isinstance(other, ColumnStatistics):
+            return vars(self) == vars(other)
+        return False
+
+    def __repr__(self):
+        properties = ", ".join(
+            f"{key}={value!r}" for key, value in vars(self).items() if value is not None
+        )
+        return f"ColumnStatistics({properties})"
+
+
 class Statistics:
     """
     Statistics are used during the cost-based optimization.
-    Currently, only the row count is supported, more
-    properties might follow. It needs to be provided by the user.
+    They consist of the row count and (optionally) the statistics of
+    single columns (see :class:`ColumnStatistics`), keyed by the column name.
+    They can be provided by the user, otherwise they are read from
+    the parquet metadata (if available) when the table is created.
+    Additionally, the minimum and maximum of single columns
+    are read from the parquet metadata (if available) when needed
+    and cached in ``column_ranges``.
     """
 
-    def __init__(self, row_count: int) -> None:
+    def __init__(
+        self, row_count: int, columns: Dict[str, ColumnStatistics] = None
+    ) -> None:
         self.row_count = row_count
+        self.columns = columns or {}
+        self.column_ranges: Dict[str, Tuple[Any, Any]] = {}
 
     def __eq__(self, other):
         if isinstance(other, Statistics):
-            return self.row_count == other.row_count
+            return self.row_count == other.row_count and self.columns == other.columns
         return False
 
 
+class Partitioning:
+    """
+    Describes how the rows of a dataframe are distributed over its partitions:
+    by the hash of the values in the given (backend) columns, as done by
+    ``DataFrame.shuffle(columns)``, into ``npartitions`` partitions.
+    Two dataframes with the same partitioning (on columns of the same types)
+    hold rows with equal values in these columns in partitions with the same number,
+    so they can be joined on these columns partition by partition.
+    The dtypes of the columns are recorded, as the hash values depend on them.
+    """
+
+    def __init__(self, columns: List[str], dtypes: List[Any], npartitions: int):
+        self.columns = list(columns)
+        self.dtypes = list(dtypes)
+        self.npartitions = npartitions
+
+    @classmethod
+    def from_df(cls, df: dd.DataFrame, columns: List[str]) -> "Partitioning":
+        """The partitioning of a dataframe, which was shuffled on the given columns"""
+        return cls(columns, [df[column].dtype for column in columns], df.npartitions)
+
+    def holds_for(self, df: dd.DataFrame) -> bool:
+        """
+        Check that the dataframe still has the partitions and the columns this partitioning
+        was recorded for, which is not the case anymore after e.g. dropping partitions
+        """
+        return df.npartitions == self.npartitions and all(
+            column in df.columns and df[column].dtype == dtype
+            for column, dtype in zip(self.columns, self.dtypes)
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, Partitioning):
+            return vars(self) == vars(other)
+        return False
+
+    def __repr__(self):
+        return f"Partitioning(columns={self.columns}, npartitions={self.npartitions})"
+
+
 class DataContainer:
     """
     In SQL, every column operation or reference is done via
@@ -208,11 +297,13 @@ class DataContainer:
         column_container: ColumnContainer,
         statistics: Statistics = None,
         filepath: str = None,
+        partitioning: Partitioning = None,
     ):
         self.df = df
         self.column_container = column_container
         self.statistics = statistics
         self.filepath = filepath
+        self.partitioning = partitioning
 
     def assign(self) -> dd.DataFrame:
         """
@@ -288,3 +379,5 @@ class SchemaContainer:
         self.functions: Dict[str, UDF] = {}
         self.function_lists: List[FunctionDescription] = []
         self.filepaths: Dict[str, str] = {}
+        # Incremented on every change of the registered tables or functions
+        self.version = 0
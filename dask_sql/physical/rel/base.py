@@ -108,4 +108,4 @@ class BaseRelPlugin:
             df_field_name = cc.get_backend_by_frontend_name(field_name)
             df = cast_column_type(df, df_field_name, expected_type)
 
-        return DataContainer(df, dc.column_container)
+        return DataContainer(df, dc.column_container, partitioning=dc.partitioning)
@@ -49,6 +49,20 @@ class RelConverter(Pluggable):
 
         node_type = rel.get_current_node_type()
 
+        # Identical subtrees (e.g. a CTE used twice or a self-join) are only
+        # converted once, so that dask can share the work between them
+        memo = context._converted_rels
+        key = None
+        if memo is not None:
+            structural_hash = rel.getStructuralHash()
+            if structural_hash is not None:
+                key = (node_type, structural_hash)
+            if key is not None and key in memo:
+                logger.debug(f"Reusing already converted REL {rel}")
+                if context._profiler is not None:
+                    context._profiler.reuse(key)
+                return memo[key]
+
         try:
             plugin_instance = cls.get_plugin(node_type)
         except KeyError:  # pragma: no cover
@@ -58,6 +72,14 @@ class RelConverter(Pluggable):
         logger.debug(
             f"Processing REL {rel} using {plugin_instance.__class__.__name__}..."
         )
-        df = plugin_instance.convert(rel, context=context)
+        if context._profiler is not None:
+            with context._profiler.profile(rel, node_type, key=key) as operator:
+                df = plugin_instance.convert(rel, context=context)
+                operator.dc = df
+        else:
+            df = plugin_instance.convert(rel, context=context)
         logger.debug(f"Processed REL {rel} into {LoggableDataFrame(df)}")
+
+        if key is not None:
+            memo[key] = df
         return df
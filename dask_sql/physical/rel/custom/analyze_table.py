@@ -1,11 +1,18 @@
 from typing import TYPE_CHECKING
 
+import dask
 import dask.dataframe as dd
 import pandas as pd
+from dask import config as dask_config
 
-from dask_sql.datacontainer import ColumnContainer, DataContainer
+from dask_sql.datacontainer import ColumnContainer, DataContainer, Statistics
 from dask_sql.mappings import python_to_sql_type
 from dask_sql.physical.rel.base import BaseRelPlugin
+from dask_sql.physical.utils.analyze import (
+    analyze_columns,
+    save_statistics,
+    to_statistics,
+)
 
 if TYPE_CHECKING:
     import dask_sql
@@ -22,10 +29,14 @@ class AnalyzeTablePlugin(BaseRelPlugin):
 
     The result is also a table, although it is created on the fly.
 
-    Please note: even though the syntax is very similar to e.g.
+    Similar to
     [the spark version](https://spark.apache.org/docs/3.0.0/sql-ref-syntax-aux-analyze-table.html),
-    this call does not help with query optimization (as the spark call would do),
-    as this is currently not implemented in dask-sql.
+    the call also collects the statistics used during the cost-based optimization:
+    the row count and the number of distinct values, fraction of NULLs, minimum, maximum
+    and histogram of the analyzed columns (see :class:`~dask_sql.ColumnStatistics`).
+    They replace the previous statistics of these columns.
+    If ``sql.statistics.persist`` is set, they are also stored next
+    to the data of tables created from files.
     """
 
     class_name = "AnalyzeTable"
@@ -52,6 +63,24 @@ class AnalyzeTablePlugin(BaseRelPlugin):
         )
         statistics = statistics.append(df[[mapping(col) for col in columns]].describe())
 
+        # Collect the statistics for the optimizer in the same pass over the data
+        backend_columns = list(dict.fromkeys(mapping(col) for col in columns))
+        column_statistics = analyze_columns(
+            df,
+            backend_columns,
+            hll_precision=dask_config.get("sql.aggregate.hll_precision"),
+            histogram_buckets=dask_config.get("sql.statistics.histogram_buckets"),
+            tdigest_compression=dask_config.get("sql.aggregate.tdigest_compression"),
+        )
+        statistics, column_statistics = dask.compute(statistics, column_statistics)
+        self._store_statistics(
+            context,
+            schema_name,
+            table_name,
+            to_statistics(column_statistics, backend_columns),
+        )
+        statistics = dd.from_pandas(statistics, npartitions=1)
+
         # Add additional information
         statistics = statistics.append(
             pd.Series(
@@ -72,3 +101,22 @@ class AnalyzeTablePlugin(BaseRelPlugin):
         cc = ColumnContainer(statistics.columns)
         dc = DataContainer(statistics, cc)
         return dc
+
+    @staticmethod
+    def _store_statistics(
+        context: "dask_sql.Context",
+        schema_name: str,
+        table_name: str,
+        statistics: Statistics,
+    ):
+        """Merge the new statistics into the ones of the table and pass them to the optimizer"""
+        schema = context.schema[schema_name]
+        previous_statistics = schema.statistics.get(table_name)
+        if previous_statistics is not None:
+            statistics.columns = {**previous_statistics.columns, **statistics.columns}
+
+        context._set_statistics(schema_name, table_name, statistics)
+
+        filepath = schema.filepaths.get(table_name)
+        if filepath and dask_config.get("sql.statistics.persist"):
+            save_statistics(statistics, filepath)
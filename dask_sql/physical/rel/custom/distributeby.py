@@ -1,7 +1,7 @@
 import logging
 from typing import TYPE_CHECKING
 
-from dask_sql.datacontainer import ColumnContainer, DataContainer
+from dask_sql.datacontainer import ColumnContainer, DataContainer, Partitioning
 from dask_sql.physical.rel.base import BaseRelPlugin
 from dask_sql.utils import LoggableDataFrame
 
@@ -37,6 +37,8 @@ class DistributeByPlugin(BaseRelPlugin):
         df = df.shuffle(distribute_list)
 
         cc = ColumnContainer(df.columns)
-        dc = DataContainer(df, cc)
+        dc = DataContainer(
+            df, cc, partitioning=Partitioning.from_df(df, distribute_list)
+        )
 
         return dc
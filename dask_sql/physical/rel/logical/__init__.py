@@ -1,7 +1,7 @@
 from .aggregate import DaskAggregatePlugin
 from .cross_join import DaskCrossJoinPlugin
 from .empty import DaskEmptyRelationPlugin
-from .explain import ExplainPlugin
+from .explain import ExplainAnalyzePlugin, ExplainPlugin
 from .filter import DaskFilterPlugin
 from .join import DaskJoinPlugin
 from .limit import DaskLimitPlugin
@@ -29,5 +29,6 @@ __all__ = [
     DaskWindowPlugin,
     SamplePlugin,
     ExplainPlugin,
+    ExplainAnalyzePlugin,
     SubqueryAlias,
 ]
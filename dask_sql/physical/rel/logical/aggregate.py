@@ -1,10 +1,10 @@
 import logging
-import operator
+import math
 from collections import defaultdict
-from functools import reduce
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
 
 import dask.dataframe as dd
+import numpy as np
 import pandas as pd
 from dask import config as dask_config
 
@@ -12,6 +12,14 @@ from dask_sql.datacontainer import ColumnContainer, DataContainer
 from dask_sql.physical.rel.base import BaseRelPlugin
 from dask_sql.physical.rex.convert import RexConverter
 from dask_sql.physical.rex.core.call import IsNullOperation
+from dask_sql.physical.utils.cardinality import estimate_distinct_count
+from dask_sql.physical.utils.groupby import (
+    ExtremumAggregation,
+    as_groupby_result,
+    get_group_index,
+    get_group_numbers,
+)
+from dask_sql.physical.utils.sketches import HyperLogLogAggregation, TDigestAggregation
 from dask_sql.utils import is_cudf_type, new_temporary_column
 
 if TYPE_CHECKING:
@@ -21,32 +29,261 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-class ReduceAggregation(dd.Aggregation):
+class BitwiseAggregation(dd.Aggregation):
     """
-    A special form of an aggregation, that applies a given operation
-    on all elements in a group with "reduce".
+    Bitwise aggregation (e.g. BIT_AND), which applies the given numpy ufunc
+    to all non-null values of a group with a single (vectorized)
+    ``ufunc.reduceat`` over the values sorted by their group.
     """
 
-    def __init__(self, name: str, operation: Callable):
-        series_aggregate = lambda s: s.aggregate(lambda x: reduce(operation, x))
+    def __init__(self, name: str, ufunc: np.ufunc):
+        series_aggregate = lambda s: _reduce_groups(s, ufunc)
 
         super().__init__(name, series_aggregate, series_aggregate)
 
 
-class AggregationOnPandas(dd.Aggregation):
+class NumericAggregation(dd.Aggregation):
     """
-    A special form of an aggregation, which does not apply the given function
-    (given as attribute name) directly to the dask groupby, but
-    via the groupby().apply() method. This is needed to call
-    functions directly on the pandas dataframes, but should be done
-    very carefully (as it is a performance bottleneck).
+    SUM or AVG for object columns holding numbers (e.g. decimals),
+    which the dask groupby can not aggregate natively.
+    The values are converted to floats once (SQL returns floats for these
+    aggregations anyways) and the counts and sums of all
+    groups are computed at once with ``np.bincount``.
     """
 
     def __init__(self, function_name: str):
-        def _f(s):
-            return s.apply(lambda s0: getattr(s0.dropna(), function_name)())
+        if function_name == "sum":
+            chunk = lambda s: _numeric_moments(s, 1)[1]
+            agg = lambda s0: s0.sum(min_count=1)
+            finalize = None
+        elif function_name == "mean":
+            chunk = lambda s: _numeric_moments(s, 1)
+            agg = lambda count, sum: (count.sum(), sum.sum())
+            finalize = lambda count, sum: sum / count
+        else:  # pragma: no cover
+            raise NotImplementedError(f"{function_name} is not supported on objects")
 
-        super().__init__(function_name, _f, _f)
+        super().__init__(function_name, chunk, agg, finalize)
+
+
+class MomentsAggregation(dd.Aggregation):
+    """
+    Second-order statistic (e.g. a variance, covariance or regression),
+    computed from the count, the means and the sums of (co-)squared deviations
+    from the mean of every group.
+    Within a partition, the deviations are taken from the mean of the group,
+    so that values of large magnitude do not suffer from cancellation.
+    The partial results are merged with the pairwise formulas of Chan et al.
+    All groups are handled at once with ``np.bincount``.
+
+    Statistics of two columns expect them packed into a single complex
+    column (see :func:`pack_pair`), as dask aggregations only get one column.
+    The statistic is called with the count, the means and the
+    co-moments (e.g. ``m2_y, c_yx, m2_x`` for the pair ``y + i * x``).
+    """
+
+    def __init__(self, name: str, statistic: Callable, pairs: bool = False):
+        super().__init__(
+            name,
+            chunk=lambda s: _moments_of_groups(s, pairs),
+            agg=_merge_moments,
+            finalize=statistic,
+        )
+
+
+def pack_pair(y: dd.Series, x: dd.Series) -> dd.Series:
+    """Pack two columns into a complex column y + i * x, which is NaN if any of them is NULL"""
+    return y.astype("float64") + x.astype("float64") * 1j
+
+
+def _moments_of_groups(grouped, pairs: bool) -> Tuple[pd.Series, ...]:
+    values = grouped.obj
+    if is_cudf_type(values):
+        values = values.to_pandas()
+    group_numbers = get_group_numbers(grouped)
+    index = get_group_index(grouped)
+
+    if pairs:
+        values = values.to_numpy(dtype=np.complex128, na_value=np.nan)
+        columns = [values.real, values.imag]
+    else:
+        # see _numeric_moments for the coercion
+        values = pd.to_numeric(values, errors="coerce")
+        columns = [values.to_numpy(dtype=np.float64, na_value=np.nan)]
+
+    valid = group_numbers >= 0
+    for column in columns:
+        valid &= ~np.isnan(column)
+    columns = [column[valid] for column in columns]
+    group_numbers = group_numbers[valid]
+
+    count = np.bincount(group_numbers, minlength=len(index))
+    means = [
+        np.bincount(group_numbers, weights=column, minlength=len(index))
+        / np.maximum(count, 1)
+        for column in columns
+    ]
+    deviations = [column - mean[group_numbers] for column, mean in zip(columns, means)]
+    comoments = [
+        np.bincount(
+            group_numbers, weights=deviations[i] * deviations[j], minlength=len(index)
+        )
+        for i in range(len(columns))
+        for j in range(i, len(columns))
+    ]
+
+    return tuple(
+        as_groupby_result(pd.Series(moment, index=index), grouped)
+        for moment in [count, *means, *comoments]
+    )
+
+
+def _merge_moments(*partials) -> Tuple[pd.Series, ...]:
+    num_columns = 1 if len(partials) == 3 else 2
+    group_numbers = get_group_numbers(partials[0])
+    index = get_group_index(partials[0])
+
+    def to_numpy(grouped):
+        values = grouped.obj
+        if is_cudf_type(values):
+            values = values.to_pandas()
+        return values.to_numpy(dtype=np.float64)
+
+    count, *moments = [to_numpy(partial) for partial in partials]
+    means = moments[:num_columns]
+    comoments = moments[num_columns:]
+
+    total_count = np.bincount(group_numbers, weights=count, minlength=len(index))
+    total_means = [
+        np.bincount(group_numbers, weights=count * mean, minlength=len(index))
+        / np.maximum(total_count, 1)
+        for mean in means
+    ]
+    deviations = [
+        mean - total[group_numbers] for mean, total in zip(means, total_means)
+    ]
+    pairs = [(i, j) for i in range(num_columns) for j in range(i, num_columns)]
+    total_comoments = [
+        np.bincount(
+            group_numbers,
+            weights=comoment + count * deviations[i] * deviations[j],
+            minlength=len(index),
+        )
+        for comoment, (i, j) in zip(comoments, pairs)
+    ]
+
+    return tuple(
+        as_groupby_result(pd.Series(moment, index=index), partials[0])
+        for moment in [total_count, *total_means, *total_comoments]
+    )
+
+
+def _reduce_groups(grouped, ufunc: np.ufunc):
+    values = grouped.obj
+    if is_cudf_type(values):
+        values = values.to_pandas()
+    group_numbers = get_group_numbers(grouped)
+    index = get_group_index(grouped)
+
+    valid = values.notna().to_numpy() & (group_numbers >= 0)
+    dtype = getattr(values.dtype, "numpy_dtype", values.dtype)
+    values = values[valid].to_numpy(dtype=dtype)
+    group_numbers = group_numbers[valid]
+
+    order = np.argsort(group_numbers, kind="stable")
+    values = values[order]
+    group_numbers = group_numbers[order]
+
+    has_values = np.bincount(group_numbers, minlength=len(index)) > 0
+    group_starts = np.searchsorted(group_numbers, np.arange(len(index)))
+
+    reduced = np.zeros(len(index), dtype=dtype)
+    if len(values):
+        reduced[has_values] = ufunc.reduceat(values, group_starts[has_values])
+
+    result = pd.Series(reduced, index=index)
+    if not has_values.all():
+        # groups with only NULL values
+        result = result.astype(_nullable_dtype(result.dtype)).where(has_values)
+    return as_groupby_result(result, grouped)
+
+
+def _numeric_moments(grouped, max_power: int) -> Tuple[pd.Series, ...]:
+    """
+    Count of the non-null values of every group, followed by the sums of
+    their powers up to max_power (NULL for groups without values)
+    """
+    values = grouped.obj
+    if is_cudf_type(values):
+        values = values.to_pandas()
+    group_numbers = get_group_numbers(grouped)
+    index = get_group_index(grouped)
+
+    # The planner only allows numbers here, but dask infers the
+    # meta of the aggregation with arbitrary strings in object columns
+    values = pd.to_numeric(values, errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    valid = ~np.isnan(values) & (group_numbers >= 0)
+    values = values[valid]
+    group_numbers = group_numbers[valid]
+
+    count = np.bincount(group_numbers, minlength=len(index))
+    moments = [pd.Series(count, index=index)]
+    for power in range(1, max_power + 1):
+        power_sum = np.bincount(
+            group_numbers, weights=values**power, minlength=len(index)
+        )
+        moments.append(pd.Series(power_sum, index=index).where(count > 0))
+
+    return tuple(as_groupby_result(moment, grouped) for moment in moments)
+
+
+def _nullable_dtype(dtype: np.dtype):
+    if dtype.kind == "b":
+        return pd.BooleanDtype()
+    bits = dtype.itemsize * 8
+    return f"{'U' if dtype.kind == 'u' else ''}Int{bits}"
+
+
+def mask_column(column: dd.Series, mask: dd.Series) -> dd.Series:
+    """
+    Set the column to NULL wherever the mask is not true.
+    Integer and boolean columns are turned into their nullable
+    counterparts, so that no precision is lost.
+    """
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype) and not is_cudf_type(column):
+        if dtype.kind in "biu":
+            column = column.astype(_nullable_dtype(dtype))
+    return column.where(mask.fillna(False))
+
+
+def null_column(df: dd.DataFrame, dtype) -> dd.Series:
+    """
+    Return a column of NULLs with the given dtype and the partitions of df.
+    Integer and boolean dtypes are turned into their nullable counterparts.
+    """
+    if isinstance(dtype, np.dtype) and dtype.kind in "biu" and not is_cudf_type(df):
+        dtype = _nullable_dtype(dtype)
+
+    def create_nulls(partition):
+        if is_cudf_type(partition):
+            import cudf
+
+            return cudf.Series(index=partition.index, dtype=dtype)
+        return pd.Series(index=partition.index, dtype=dtype)
+
+    return df.map_partitions(create_nulls, meta=create_nulls(df._meta))
+
+
+# This unifies CPU and GPU behavior by ensuring that performing a
+# sum on a null column results in null and not 0
+CUSTOM_SUM = dd.Aggregation(
+    name="custom_sum",
+    chunk=lambda s: s.sum(min_count=1),
+    agg=lambda s0: s0.sum(min_count=1),
+)
 
 
 class AggregationSpecification:
@@ -106,17 +343,24 @@ class DaskAggregatePlugin(BaseRelPlugin):
     aggregation function will only every be called with a single input
     column (by splitting the inner calculation to a step before).
 
-    Open TODO: So far we are following the dask default
-    to only have a single partition after the group by (which is usual
-    a reasonable assumption). It would be nice to control
-    these things via HINTs.
+    The number of output partitions (split_out) and the fan-in
+    of the tree reduction (split_every) are chosen from the
+    estimated number of groups, unless they are configured
+    (or given as hints of the query).
+
+    For GROUPING SETS, ROLLUP and CUBE, the aggregations are computed
+    once for the finest grouping (by all group columns) and the
+    coarser grouping sets are derived by aggregating this (much smaller)
+    result again. Only if an aggregation can not be re-aggregated
+    (e.g. DISTINCT aggregations), every grouping set is computed
+    from the input separately.
     """
 
     class_name = ["Aggregate", "Distinct"]
 
     AGGREGATION_MAPPING = {
-        "sum": AggregationSpecification("sum", AggregationOnPandas("sum")),
-        "$sum0": AggregationSpecification("sum", AggregationOnPandas("sum")),
+        "sum": AggregationSpecification("sum", NumericAggregation("sum")),
+        "$sum0": AggregationSpecification("sum", NumericAggregation("sum")),
         "any_value": AggregationSpecification(
             dd.Aggregation(
                 "any_value",
@@ -124,80 +368,168 @@ class DaskAggregatePlugin(BaseRelPlugin):
                 lambda s0: s0.sample(n=1).values,
             )
         ),
-        "avg": AggregationSpecification("mean", AggregationOnPandas("mean")),
-        "stddev": AggregationSpecification("std", AggregationOnPandas("std")),
-        "stddevsamp": AggregationSpecification("std", AggregationOnPandas("std")),
+        "avg": AggregationSpecification("mean", NumericAggregation("mean")),
+        "stddev": AggregationSpecification(
+            "std",
+            MomentsAggregation(
+                "stddev", lambda n, mean, m2: (m2 / (n - 1)).where(n > 1) ** 0.5
+            ),
+        ),
+        "stddevsamp": AggregationSpecification(
+            "std",
+            MomentsAggregation(
+                "stddevsamp", lambda n, mean, m2: (m2 / (n - 1)).where(n > 1) ** 0.5
+            ),
+        ),
         "stddevpop": AggregationSpecification(
-            dd.Aggregation(
-                "stddevpop",
-                lambda s: (s.count(), s.sum(), s.agg(lambda x: (x**2).sum())),
-                lambda count, sum, sum_of_squares: (
-                    count.sum(),
-                    sum.sum(),
-                    sum_of_squares.sum(),
-                ),
-                lambda count, sum, sum_of_squares: (
-                    (sum_of_squares / count) - (sum / count) ** 2
-                )
-                ** (1 / 2),
+            MomentsAggregation(
+                "stddevpop", lambda n, mean, m2: (m2 / n).where(n > 0) ** 0.5
             )
         ),
         "bit_and": AggregationSpecification(
-            ReduceAggregation("bit_and", operator.and_)
+            BitwiseAggregation("bit_and", np.bitwise_and)
+        ),
+        "bit_or": AggregationSpecification(BitwiseAggregation("bit_or", np.bitwise_or)),
+        "bit_xor": AggregationSpecification(
+            BitwiseAggregation("bit_xor", np.bitwise_xor)
         ),
-        "bit_or": AggregationSpecification(ReduceAggregation("bit_or", operator.or_)),
-        "bit_xor": AggregationSpecification(ReduceAggregation("bit_xor", operator.xor)),
         "count": AggregationSpecification("count"),
         "every": AggregationSpecification(
             dd.Aggregation("every", lambda s: s.all(), lambda s0: s0.all())
         ),
-        "max": AggregationSpecification("max", AggregationOnPandas("max")),
-        "min": AggregationSpecification("min", AggregationOnPandas("min")),
+        "max": AggregationSpecification("max", ExtremumAggregation("max")),
+        "min": AggregationSpecification("min", ExtremumAggregation("min")),
         "single_value": AggregationSpecification("first"),
         # is null was checked earlier, now only need to compute the sum the non null values
-        "regr_count": AggregationSpecification("sum", AggregationOnPandas("sum")),
+        "regr_count": AggregationSpecification("sum", NumericAggregation("sum")),
+        # The pairwise statistics get their inputs packed as y + i * x
         "regr_syy": AggregationSpecification(
-            dd.Aggregation(
+            MomentsAggregation(
                 "regr_syy",
-                lambda s: (s.count(), s.sum(), s.agg(lambda x: (x**2).sum())),
-                lambda count, sum, sum_of_squares: (
-                    count.sum(),
-                    sum.sum(),
-                    sum_of_squares.sum(),
-                ),
-                lambda count, sum, sum_of_squares: (
-                    sum_of_squares - (sum * (sum / count))
-                ),
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: m2_y.where(n > 0),
+                pairs=True,
             )
         ),
         "regr_sxx": AggregationSpecification(
-            dd.Aggregation(
+            MomentsAggregation(
                 "regr_sxx",
-                lambda s: (s.count(), s.sum(), s.agg(lambda x: (x**2).sum())),
-                lambda count, sum, sum_of_squares: (
-                    count.sum(),
-                    sum.sum(),
-                    sum_of_squares.sum(),
-                ),
-                lambda count, sum, sum_of_squares: (
-                    sum_of_squares - (sum * (sum / count))
-                ),
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: m2_x.where(n > 0),
+                pairs=True,
             )
         ),
-        "variancepop": AggregationSpecification(
-            dd.Aggregation(
-                "variancepop",
-                lambda s: (s.count(), s.sum(), s.agg(lambda x: (x**2).sum())),
-                lambda count, sum, sum_of_squares: (
-                    count.sum(),
-                    sum.sum(),
-                    sum_of_squares.sum(),
-                ),
-                lambda count, sum, sum_of_squares: (
-                    (sum_of_squares / count) - (sum / count) ** 2
-                ),
+        "regr_slope": AggregationSpecification(
+            MomentsAggregation(
+                "regr_slope",
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: c / m2_x,
+                pairs=True,
+            )
+        ),
+        "regr_intercept": AggregationSpecification(
+            MomentsAggregation(
+                "regr_intercept",
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: mean_y - c / m2_x * mean_x,
+                pairs=True,
+            )
+        ),
+        "covariance": AggregationSpecification(
+            MomentsAggregation(
+                "covariance",
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: (c / (n - 1)).where(n > 1),
+                pairs=True,
+            )
+        ),
+        "covariancepop": AggregationSpecification(
+            MomentsAggregation(
+                "covariancepop",
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: (c / n).where(n > 0),
+                pairs=True,
+            )
+        ),
+        "correlation": AggregationSpecification(
+            MomentsAggregation(
+                "correlation",
+                lambda n, mean_y, mean_x, m2_y, c, m2_x: c / (m2_y * m2_x) ** 0.5,
+                pairs=True,
             )
         ),
+        "variance": AggregationSpecification(
+            "var",
+            MomentsAggregation(
+                "variance", lambda n, mean, m2: (m2 / (n - 1)).where(n > 1)
+            ),
+        ),
+        "variancepop": AggregationSpecification(
+            MomentsAggregation("variancepop", lambda n, mean, m2: (m2 / n).where(n > 0))
+        ),
+    }
+
+    # Aggregations of two columns, computed with a MomentsAggregation
+    PAIRWISE_AGGREGATIONS = {
+        "correlation",
+        "covariance",
+        "covariancepop",
+        "regr_intercept",
+        "regr_slope",
+        "regr_sxx",
+        "regr_syy",
+    }
+
+    # Aggregations which skip NULL inputs, so that a FILTER can be applied
+    # by setting the filtered-out inputs to NULL
+    NULL_IGNORING_AGGREGATIONS = {
+        "approx_count_distinct",
+        "approx_percentile",
+        "approxmedian",
+        "approxpercentilecont",
+        "median",
+        "percentile_cont",
+        "sum",
+        "$sum0",
+        "avg",
+        "count",
+        "max",
+        "min",
+        "regr_count",
+        "regr_intercept",
+        "regr_slope",
+        "regr_sxx",
+        "regr_syy",
+        "correlation",
+        "covariance",
+        "covariancepop",
+        "stddev",
+        "stddevpop",
+        "stddevsamp",
+        "variance",
+        "variancepop",
+    }
+
+    # Aggregations computed with t-digest sketches, together with
+    # their quantile (or None, if the quantile is given as second argument)
+    QUANTILE_AGGREGATIONS = {
+        "approx_percentile": None,
+        "approxmedian": 0.5,
+        "approxpercentilecont": None,
+        "median": 0.5,
+        "percentile_cont": None,
+    }
+
+    # Aggregations, whose results for a finer grouping can be aggregated again
+    # to get the results for a coarser grouping, together with the aggregation
+    # used for that ("avg" is re-aggregated as the mean weighted by the count)
+    REAGGREGATIONS = {
+        "$sum0": "sum",
+        "any_value": "any_value",
+        "avg": "avg",
+        "bit_and": "bit_and",
+        "bit_or": "bit_or",
+        "bit_xor": "bit_xor",
+        "count": "sum",
+        "every": "every",
+        "max": "max",
+        "min": "min",
+        "regr_count": "sum",
+        "sum": "sum",
     }
 
     def convert(self, rel: "LogicalPlan", context: "dask_sql.Context") -> DataContainer:
@@ -227,16 +559,36 @@ class DaskAggregatePlugin(BaseRelPlugin):
             # To reuse the code, we just create a new column at the end with a single value
             logger.debug("Performing full-table aggregation")
 
-        # Do all aggregates
-        df_agg, output_column_order, cc = self._do_aggregations(
-            rel,
-            dc,
-            group_columns,
-            context,
-        )
+        grouping_sets = None
+        if not agg.isDistinctNode():
+            grouping_sets = [
+                [group_expr.column_name(rel) for group_expr in grouping_set]
+                for grouping_set in agg.getGroupingSets()
+            ]
+            if grouping_sets == [group_columns]:
+                grouping_sets = None
+
+        if grouping_sets is None:
+            # Do all aggregates
+            df_agg, output_column_order, cc = self._do_aggregations(
+                rel,
+                dc,
+                group_columns,
+                context,
+            )
 
-        # SQL does not care about the index, but if group columns were specified we'll want to keep those
-        df_agg = df_agg.reset_index(drop=(not group_columns))
+            # SQL does not care about the index, but if group columns were specified we'll want to keep those
+            df_agg = df_agg.reset_index(drop=(not group_columns))
+
+            # Without grouping sets, every column is grouped by
+            grouping_values = self._get_grouping_values(rel, group_columns)
+            if grouping_values:
+                df_agg = df_agg.assign(**grouping_values)
+        else:
+            logger.debug(f"Performing aggregation of grouping sets {grouping_sets}")
+            df_agg, output_column_order, cc = self._do_grouping_sets(
+                rel, dc, group_columns, grouping_sets, context
+            )
 
         def try_get_backend_by_frontend_name(oc):
             try:
@@ -261,10 +613,13 @@ class DaskAggregatePlugin(BaseRelPlugin):
         dc: DataContainer,
         group_columns: List[str],
         context: "dask_sql.Context",
+        partial_counts: Dict[str, str] = None,
     ) -> Tuple[dd.DataFrame, List[str]]:
         """
         Main functionality: return the result dataframe
-        and the output column order
+        and the output column order.
+        If partial_counts is given, the count of every AVG is computed
+        as well and its column is stored in it.
         """
         df = dc.df
         cc = dc.column_container
@@ -285,10 +640,18 @@ class DaskAggregatePlugin(BaseRelPlugin):
             df,
             cc,
         ) = self._collect_aggregations(
-            rel, df, cc, context, additional_column_name, output_column_order
+            rel,
+            df,
+            cc,
+            context,
+            additional_column_name,
+            output_column_order,
+            partial_counts,
         )
 
-        groupby_agg_options = dask_config.get("sql.aggregate")
+        groupby_agg_options = self._get_groupby_agg_options(
+            rel, df, group_columns, context
+        )
 
         if not collected_aggregations:
             backend_names = [
@@ -344,6 +707,219 @@ class DaskAggregatePlugin(BaseRelPlugin):
 
         return df_result, output_column_order, cc
 
+    def _do_grouping_sets(
+        self,
+        rel: "LogicalPlan",
+        dc: DataContainer,
+        group_columns: List[str],
+        grouping_sets: List[List[str]],
+        context: "dask_sql.Context",
+    ) -> Tuple[dd.DataFrame, List[str]]:
+        """
+        Return the union of the aggregations for every grouping set
+        (with NULLs in the group columns, which are not grouped by)
+        and the output column order
+        """
+        agg = rel.aggregate()
+        can_reaggregate = True
+        for expr in agg.getNamedAggCalls():
+            aggregation_name = agg.getAggregationFuncName(expr).lower()
+            if aggregation_name == "grouping":
+                continue
+            if aggregation_name not in self.REAGGREGATIONS or expr.isDistinctAgg():
+                can_reaggregate = False
+
+        if can_reaggregate:
+            partial_counts = {}
+            df_finest, output_column_order, cc = self._do_aggregations(
+                rel, dc, group_columns, context, partial_counts=partial_counts
+            )
+            df_finest = df_finest.reset_index(drop=(not group_columns))
+        else:
+            logger.debug("Aggregating every grouping set separately")
+
+        df_results = []
+        for grouping_set in grouping_sets:
+            if can_reaggregate:
+                df_set = self._reaggregate(
+                    rel, df_finest, cc, grouping_set, partial_counts, context
+                )
+            else:
+                df_set, set_column_order, cc = self._do_aggregations(
+                    rel, dc, grouping_set, context
+                )
+                df_set = df_set.reset_index(drop=(not grouping_set))
+                output_column_order = (
+                    group_columns + set_column_order[len(grouping_set) :]
+                )
+
+            # The group columns not grouped by are NULL
+            for group_column in group_columns:
+                if group_column not in grouping_set:
+                    backend_name = cc.get_backend_by_frontend_name(group_column)
+                    df_set = df_set.assign(
+                        **{backend_name: null_column(df_set, dc.df[backend_name].dtype)}
+                    )
+
+            grouping_values = self._get_grouping_values(rel, grouping_set)
+            if grouping_values:
+                df_set = df_set.assign(**grouping_values)
+
+            df_results.append(
+                df_set[
+                    [
+                        cc.get_backend_by_frontend_name(column)
+                        for column in output_column_order
+                    ]
+                ]
+            )
+
+        return dd.concat(df_results), output_column_order, cc
+
+    def _reaggregate(
+        self,
+        rel: "LogicalPlan",
+        df_finest: dd.DataFrame,
+        cc: ColumnContainer,
+        grouping_set: List[str],
+        partial_counts: Dict[str, str],
+        context: "dask_sql.Context",
+    ) -> dd.DataFrame:
+        """
+        Aggregate the results of the finest grouping again
+        to get the results for the given grouping set
+        """
+        agg = rel.aggregate()
+
+        tmp_df = df_finest
+        aggregations = {}
+        averages = {}
+        for expr in agg.getNamedAggCalls():
+            aggregation_name = agg.getAggregationFuncName(expr).lower()
+            if aggregation_name == "grouping":
+                continue
+
+            output_col = cc.get_backend_by_frontend_name(expr.toString())
+            reaggregation_name = self.REAGGREGATIONS[aggregation_name]
+            if reaggregation_name == "avg":
+                # Sum up the means weighted by their counts and divide by the total count
+                count_col = partial_counts[expr.toString()]
+                weighted_col = new_temporary_column(tmp_df)
+                tmp_df = tmp_df.assign(
+                    **{weighted_col: (tmp_df[output_col] * tmp_df[count_col]).fillna(0)}
+                )
+                aggregations[weighted_col] = {weighted_col: "sum"}
+                aggregations[count_col] = {count_col: "sum"}
+                averages[output_col] = (weighted_col, count_col)
+            elif reaggregation_name == "sum" and isinstance(tmp_df._meta, pd.DataFrame):
+                aggregations[output_col] = {output_col: CUSTOM_SUM}
+            else:
+                aggregations[output_col] = {
+                    output_col: self.AGGREGATION_MAPPING[
+                        reaggregation_name
+                    ].get_supported_aggregation(tmp_df[output_col])
+                }
+
+        group_by = [cc.get_backend_by_frontend_name(column) for column in grouping_set]
+        if not group_by:
+            additional_column_name = new_temporary_column(tmp_df)
+            tmp_df = tmp_df.assign(**{additional_column_name: 1})
+            group_by = [additional_column_name]
+
+        groupby_agg_options = self._get_groupby_agg_options(
+            rel, tmp_df, grouping_set, context
+        )
+
+        if not aggregations:
+            return tmp_df[group_by].drop_duplicates(**groupby_agg_options)
+
+        df_result = tmp_df.groupby(by=group_by, dropna=False).agg(
+            aggregations, **groupby_agg_options
+        )
+        df_result.columns = df_result.columns.get_level_values(-1)
+
+        df_result = df_result.assign(
+            **{
+                output_col: df_result[weighted_col] / df_result[count_col]
+                for output_col, (weighted_col, count_col) in averages.items()
+            }
+        )
+
+        return df_result.reset_index(drop=(not grouping_set))
+
+    def _get_grouping_values(
+        self, rel: "LogicalPlan", grouping_set: List[str]
+    ) -> Dict[str, int]:
+        """
+        Return the values of the GROUPING() calls for the given grouping set:
+        a bit for every argument (the first one being the most significant),
+        which is set if the column is not grouped by.
+        """
+        agg = rel.aggregate()
+        input_rel = rel.get_inputs()[0]
+
+        grouping_values = {}
+        for expr in agg.getNamedAggCalls():
+            if agg.getAggregationFuncName(expr).lower() != "grouping":
+                continue
+
+            value = 0
+            for input_expr in agg.getArgs(expr):
+                is_aggregated = input_expr.column_name(input_rel) not in grouping_set
+                value = (value << 1) | int(is_aggregated)
+            grouping_values[expr.toString()] = value
+
+        return grouping_values
+
+    def _get_groupby_agg_options(
+        self,
+        rel: "LogicalPlan",
+        df: dd.DataFrame,
+        group_columns: List[str],
+        context: "dask_sql.Context",
+    ) -> Dict[str, Any]:
+        """
+        Choose split_out and split_every of the aggregation.
+        Configured values take precedence, otherwise split_out is chosen such
+        that every output partition holds about ``sql.aggregate.rows_per_partition``
+        groups and split_every such that the intermediate results combined
+        in one step do not exceed this number.
+        Without statistics, the dask defaults are used.
+        """
+        split_out = dask_config.get("sql.aggregate.split_out")
+        split_every = dask_config.get("sql.aggregate.split_every")
+        if split_out is not None and split_every is not None:
+            return {"split_out": split_out, "split_every": split_every}
+
+        if group_columns:
+            (input_rel,) = rel.get_inputs()
+            num_groups = estimate_distinct_count(input_rel, group_columns, context)
+        else:
+            num_groups = 1
+
+        if num_groups is None:
+            logger.debug("Number of groups unknown, using the default split_out")
+            return {"split_out": split_out or 1, "split_every": split_every}
+
+        rows_per_partition = dask_config.get("sql.aggregate.rows_per_partition")
+        npartitions = max(df.npartitions, 1)
+        if split_out is None:
+            split_out = min(
+                max(math.ceil(num_groups / rows_per_partition), 1), npartitions
+            )
+        if split_every is None:
+            groups_per_partition = max(num_groups / split_out, 1)
+            split_every = min(
+                max(int(rows_per_partition // groups_per_partition), 2),
+                max(npartitions, 2),
+            )
+
+        logger.debug(
+            f"Estimated {num_groups} groups, "
+            f"using split_out={split_out} and split_every={split_every}"
+        )
+        return {"split_out": split_out, "split_every": split_every}
+
     def _collect_aggregations(
         self,
         rel: "LogicalPlan",
@@ -352,6 +928,7 @@ class DaskAggregatePlugin(BaseRelPlugin):
         context: "dask_sql.Context",
         additional_column_name: str,
         output_column_order: List[str],
+        partial_counts: Dict[str, str] = None,
     ) -> Tuple[
         Dict[Tuple[str, str], List[Tuple[str, str, Any]]], List[str], dd.DataFrame
     ]:
@@ -377,7 +954,11 @@ class DaskAggregatePlugin(BaseRelPlugin):
                 "AggregateFunction",
                 "AggregateUDF",
             }, "Do not know how to handle this case!"
-            for input_expr in agg.getArgs(expr):
+            args = agg.getArgs(expr)
+            if agg.getAggregationFuncName(expr).lower() in self.QUANTILE_AGGREGATIONS:
+                # The quantile is a literal, not an input column
+                args = args[:1]
+            for input_expr in args:
                 input_col = input_expr.column_name(input_rel)
                 if input_col not in cc._frontend_backend_mapping:
                     random_name = new_temporary_column(df)
@@ -397,13 +978,42 @@ class DaskAggregatePlugin(BaseRelPlugin):
         if new_columns:
             df = df.assign(**new_columns)
 
+        masked_columns = {}
         for expr in agg.getNamedAggCalls():
             schema_name = context.schema_name
             aggregation_name = agg.getAggregationFuncName(expr).lower()
+            is_distinct = expr.isDistinctAgg()
+
+            if aggregation_name == "grouping":
+                # GROUPING() only depends on the grouping set (see _get_grouping_values)
+                output_column_order.append(expr.toString())
+                continue
+
+            if aggregation_name == "approxdistinct" or (
+                aggregation_name == "count"
+                and is_distinct
+                and dask_config.get("sql.aggregate.approx_count_distinct")
+            ):
+                # Instead of dropping the duplicates with a shuffle,
+                # count the distinct values with mergeable sketches
+                aggregation_name = "approx_count_distinct"
+                is_distinct = False
 
             # Gather information about input columns
             inputs = agg.getArgs(expr)
 
+            if aggregation_name in self.QUANTILE_AGGREGATIONS:
+                quantile = self.QUANTILE_AGGREGATIONS[aggregation_name]
+                if quantile is None:
+                    quantile = RexConverter.convert(
+                        input_rel, inputs[1], dc, context=context
+                    )
+                    if not np.isscalar(quantile):
+                        raise NotImplementedError(
+                            f"The quantile of {aggregation_name} needs to be a literal"
+                        )
+                inputs = inputs[:1]
+
             if aggregation_name == "regr_count":
                 is_null = IsNullOperation()
                 two_columns_proxy = new_temporary_column(df)
@@ -431,10 +1041,13 @@ class DaskAggregatePlugin(BaseRelPlugin):
                         }
                     )
                 input_col = two_columns_proxy
-            elif aggregation_name == "regr_syy":
-                input_col = inputs[0].column_name(input_rel)
-            elif aggregation_name == "regr_sxx":
-                input_col = inputs[1].column_name(input_rel)
+            elif aggregation_name in self.PAIRWISE_AGGREGATIONS:
+                col1, col2 = [
+                    cc.get_backend_by_frontend_name(input_expr.column_name(input_rel))
+                    for input_expr in inputs
+                ]
+                input_col = new_temporary_column(df)
+                df = df.assign(**{input_col: pack_pair(df[col1], df[col2])})
             elif len(inputs) == 1:
                 input_col = inputs[0].column_name(input_rel)
             elif len(inputs) == 0:
@@ -454,11 +1067,23 @@ class DaskAggregatePlugin(BaseRelPlugin):
                 # This unifies CPU and GPU behavior by ensuring that performing a
                 # sum on a null column results in null and not 0
                 if aggregation_name == "sum" and isinstance(df._meta, pd.DataFrame):
+                    aggregation_function = AggregationSpecification(CUSTOM_SUM)
+                elif aggregation_name == "approx_count_distinct":
+                    aggregation_function = AggregationSpecification(
+                        HyperLogLogAggregation(
+                            aggregation_name,
+                            precision=dask_config.get("sql.aggregate.hll_precision"),
+                        )
+                    )
+                elif aggregation_name in self.QUANTILE_AGGREGATIONS:
                     aggregation_function = AggregationSpecification(
-                        dd.Aggregation(
-                            name="custom_sum",
-                            chunk=lambda s: s.sum(min_count=1),
-                            agg=lambda s0: s0.sum(min_count=1),
+                        TDigestAggregation(
+                            # dask identifies custom aggregations of a column by their name
+                            f"{aggregation_name}_{quantile}",
+                            quantile,
+                            compression=dask_config.get(
+                                "sql.aggregate.tdigest_compression"
+                            ),
                         )
                     )
                 else:
@@ -478,15 +1103,43 @@ class DaskAggregatePlugin(BaseRelPlugin):
                     df[backend_name]
                 )
 
+            if (
+                filter_backend_col is not None
+                and not is_distinct
+                and aggregation_name in self.NULL_IGNORING_AGGREGATIONS
+            ):
+                # Instead of a separate groupby on the filtered dataframe,
+                # aggregate the input set to NULL wherever the filter does not hold.
+                # This way, all filtered aggregations share a single pass over the data.
+                masked_col = new_temporary_column(df)
+                masked_columns[masked_col] = mask_column(
+                    df[cc.get_backend_by_frontend_name(input_col)],
+                    df[filter_backend_col],
+                )
+                cc = cc.add(masked_col, masked_col)
+                input_col = masked_col
+                filter_backend_col = None
+
             # Finally, extract the output column name
             output_col = expr.toString()
 
             # Store the aggregation
             collected_aggregations[
-                (filter_backend_col, backend_name if expr.isDistinctAgg() else None)
+                (filter_backend_col, backend_name if is_distinct else None)
             ].append((input_col, output_col, aggregation_function))
             output_column_order.append(output_col)
 
+            if partial_counts is not None and aggregation_name == "avg":
+                # Keep the count next to the mean, so that the means can be re-aggregated
+                count_col = new_temporary_column(df)
+                collected_aggregations[
+                    (filter_backend_col, backend_name if is_distinct else None)
+                ].append((input_col, count_col, "count"))
+                partial_counts[output_col] = count_col
+
+        if masked_columns:
+            df = df.assign(**masked_columns)
+
         return collected_aggregations, output_column_order, df, cc
 
     def _perform_aggregation(
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 
 from dask_sql.physical.rel.base import BaseRelPlugin
+from dask_sql.physical.rel.logical.join import annotate_join_strategies
+from dask_sql.physical.utils.profiling import QueryProfiler
 
 if TYPE_CHECKING:
     import dask_sql
@@ -15,5 +17,31 @@ class ExplainPlugin(BaseRelPlugin):
     class_name = "Explain"
 
     def convert(self, rel: "LogicalPlan", context: "dask_sql.Context"):
-        explain_strings = rel.explain().getExplainString()
-        return "\n".join(explain_strings)
+        explain_string = "\n".join(rel.explain().getExplainString())
+        for input_rel in rel.get_inputs():
+            explain_string = annotate_join_strategies(
+                input_rel, explain_string, context
+            )
+        return explain_string
+
+
+class ExplainAnalyzePlugin(BaseRelPlugin):
+    """
+    EXPLAIN ANALYZE runs the query and reports for every logical
+    operator the time it took to construct its part of the dask graph,
+    the number of tasks it added, the time spent computing these tasks,
+    and the number of rows (and bytes) it consumed and produced.
+    To attribute the tasks to the operators, the query is computed
+    without graph optimization, so the total runtime might be higher
+    than in a normal execution.
+    """
+
+    class_name = "Analyze"
+
+    def convert(self, rel: "LogicalPlan", context: "dask_sql.Context"):
+        profiler = QueryProfiler()
+        with profiler.attach(context):
+            (dc,) = self.assert_inputs(rel, 1, context)
+
+        profile = profiler.run(dc.df)
+        return profile.to_string(index=False)
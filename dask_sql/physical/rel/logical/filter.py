@@ -1,18 +1,24 @@
 import logging
-from typing import TYPE_CHECKING, Union
+import operator
+from functools import reduce
+from typing import TYPE_CHECKING, List, Optional, Union
 
 import dask.config as dask_config
+import dask.core
 import dask.dataframe as dd
 import numpy as np
+import pandas as pd
+from dask.blockwise import Blockwise
+from dask.optimization import cull
 
-from dask_sql.datacontainer import DataContainer
+from dask_sql.datacontainer import ColumnContainer, DataContainer
 from dask_sql.physical.rel.base import BaseRelPlugin
 from dask_sql.physical.rex import RexConverter
 from dask_sql.physical.utils.filter import attempt_predicate_pushdown
 
 if TYPE_CHECKING:
     import dask_sql
-    from dask_planner.rust import LogicalPlan
+    from dask_planner.rust import Expression, LogicalPlan
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +46,69 @@ def filter_or_scalar(df: dd.DataFrame, filter_condition: Union[np.bool_, dd.Seri
         return out
 
 
+class PartitionFilter:
+    """
+    A filter condition, which can be applied to single partitions
+    (e.g. on the workers, where the rex itself is not available).
+    It holds the task graph computing the condition from a single input partition,
+    which is replayed with the given partition in place of the input.
+    """
+
+    def __init__(self, graph: dict, input_key: tuple, output_key: tuple):
+        self.graph = graph
+        self.input_key = input_key
+        self.output_key = output_key
+
+    def __call__(self, partition: pd.DataFrame) -> pd.DataFrame:
+        graph = dict(self.graph)
+        graph[self.input_key] = partition
+        condition = dask.core.get(graph, self.output_key)
+        return partition[condition]
+
+    def __dask_tokenize__(self):
+        return self.output_key
+
+
+def compile_partition_filter(
+    rel: "LogicalPlan",
+    conditions: List["Expression"],
+    meta: pd.DataFrame,
+    cc: ColumnContainer,
+    context: "dask_sql.Context",
+) -> Optional[PartitionFilter]:
+    """
+    Turn the and-chained filter conditions on a dataframe with the given meta
+    into a :class:`PartitionFilter`.
+    The conditions are converted once on an empty single-partition dataframe.
+    This is only possible, if the result is computed partition-wise
+    (without any shuffle, reduction or other input) - otherwise None is returned.
+    """
+    template = dd.from_pandas(meta, npartitions=1, sort=False)
+    condition = reduce(
+        operator.and_,
+        [
+            RexConverter.convert(rel, rex, DataContainer(template, cc), context=context)
+            for rex in conditions
+        ],
+    )
+    if not isinstance(condition, dd.Series):
+        return None
+
+    # In SQL, a NULL in a boolean is False on filtering
+    condition = condition.fillna(False)
+    graph = condition.__dask_graph__()
+    if not all(
+        isinstance(layer, Blockwise)
+        for name, layer in graph.layers.items()
+        if name != template._name
+    ):
+        return None
+
+    output_key = (condition._name, 0)
+    dsk, _ = cull(dict(graph), [output_key])
+    return PartitionFilter(dsk, (template._name, 0), output_key)
+
+
 class DaskFilterPlugin(BaseRelPlugin):
     """
     DaskFilter is used on WHERE clauses.
@@ -66,4 +135,4 @@ class DaskFilterPlugin(BaseRelPlugin):
         df = filter_or_scalar(df, df_condition)
 
         cc = self.fix_column_to_row_type(cc, rel.getRowType())
-        return DataContainer(df, cc)
+        return DataContainer(df, cc, partitioning=dc.partitioning)
@@ -1,23 +1,40 @@
 import logging
 import operator
 import warnings
-from functools import reduce
-from typing import TYPE_CHECKING, List, Tuple
+from functools import partial, reduce
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 import dask.dataframe as dd
+import numpy as np
+import pandas as pd
 from dask import config as dask_config
+from dask import delayed
 from dask.base import tokenize
 from dask.highlevelgraph import HighLevelGraph
+from dask.utils import M, format_bytes, parse_bytes
 
 from dask_sql._compat import BROADCAST_JOIN_SUPPORT_WORKING
-from dask_sql.datacontainer import ColumnContainer, DataContainer
+from dask_sql.datacontainer import ColumnContainer, DataContainer, Partitioning
 from dask_sql.physical.rel.base import BaseRelPlugin
-from dask_sql.physical.rel.logical.filter import filter_or_scalar
+from dask_sql.physical.rel.logical.filter import (
+    PartitionFilter,
+    compile_partition_filter,
+    filter_or_scalar,
+)
 from dask_sql.physical.rex import RexConverter
+from dask_sql.physical.utils.band_join import Bound, band_join
+from dask_sql.physical.utils.cardinality import estimate_bytes
+from dask_sql.physical.utils.profiling import QueryProfiler
+from dask_sql.physical.utils.runtime_filter import (
+    compute_runtime_filter,
+    filter_partition,
+)
+from dask_sql.physical.utils.skew import find_hot_keys, hot_key_mask
+from dask_sql.utils import is_cudf_type
 
 if TYPE_CHECKING:
     import dask_sql
-    from dask_planner.rust import Expression, LogicalPlan
+    from dask_planner.rust import Expression, LogicalPlan, RelDataType
 
 logger = logging.getLogger(__name__)
 
@@ -40,12 +57,20 @@ class DaskJoinPlugin(BaseRelPlugin):
 
     class_name = "Join"
 
+    # Maximal number of rows of the cross product, which is filtered at once
+    CROSS_JOIN_BATCH_ROWS = 1_000_000
+
+    # Temporary columns of semi and anti joins
+    ROW_ID_COLUMN = "lhs_row_id"
+    MATCH_COLUMN = "rhs_match"
+
     JOIN_TYPE_MAPPING = {
         "INNER": "inner",
         "LEFT": "left",
         "RIGHT": "right",
         "FULL": "outer",
-        "LEFTSEMI": "inner",  # TODO: Need research here! This is likely not a true inner join
+        "LEFTSEMI": "leftsemi",
+        "LEFTANTI": "leftanti",
     }
 
     def convert(self, rel: "LogicalPlan", context: "dask_sql.Context") -> DataContainer:
@@ -87,6 +112,7 @@ class DaskJoinPlugin(BaseRelPlugin):
 
         join_condition = join.getCondition()
         lhs_on, rhs_on, filter_condition = None, None, None
+        partitioning = None
         # A user can write certain queries that really should be `cross join` queries
         # that will still enter this portion of the logic. IF the join_condition is
         # None that means there are no conditions to join on. This means a cross join.
@@ -107,6 +133,87 @@ class DaskJoinPlugin(BaseRelPlugin):
             # We therefore create new columns on purpose, which have a distinct name.
             assert len(lhs_on) == len(rhs_on)
 
+        # x NOT IN (subquery) is never true if the subquery returns a NULL
+        # or x is NULL (and the subquery returns anything at all),
+        # whereas NOT EXISTS only compares the non-null keys.
+        null_aware = join_type == "leftanti" and join.isNullAwareAntiJoin()
+        if null_aware:
+            if filter_condition or not lhs_on or len(lhs_on) > 1:
+                raise NotImplementedError(
+                    "NOT IN is only supported for uncorrelated subqueries"
+                )
+            df_lhs_renamed = self._null_aware_anti_join_filter(
+                df_lhs_renamed,
+                df_rhs_renamed,
+                "lhs_" + str(lhs_on[0]),
+                rhs_on[0],
+            )
+
+        # Semi and anti joins keep (or drop) the rows of the lhs, which have a join partner.
+        # Without any additional filter, this only needs the distinct join keys of the rhs.
+        # Otherwise, the matching pairs of rows are found with an inner join first,
+        # and the rows of the lhs in there are identified by a temporary row id.
+        semi_join_type = None
+        if join_type in ("leftsemi", "leftanti") and (filter_condition or not lhs_on):
+            semi_join_type, join_type = join_type, "inner"
+
+        # The columns of the result (before the temporary join columns are removed)
+        if join_type in ("leftsemi", "leftanti"):
+            correct_column_order = list(cc_lhs_renamed.columns)
+        else:
+            correct_column_order = list(cc_lhs_renamed.columns) + list(
+                cc_rhs_renamed.columns
+            )
+        row_type = rel.getRowType()
+
+        partitioned_keys, strategy = None, None
+        if lhs_on:
+            partitioned_keys = self._common_partitioning_keys(
+                dc_lhs, dc_rhs, lhs_on, rhs_on
+            )
+            if partitioned_keys is not None:
+                # Both sides are already distributed by the join keys:
+                # no need to choose how to shuffle
+                strategy = None
+                logger.debug("Joining co-partitioned inputs partition by partition")
+                if context._profiler is not None:
+                    context._profiler.annotate("strategy=partitionwise")
+            else:
+                strategy = choose_join_strategy(rel, context)
+                if strategy is not None:
+                    logger.debug(f"Joining with {strategy}")
+                    if context._profiler is not None:
+                        context._profiler.annotate(str(strategy))
+
+                # Remove rows without a join partner before the shuffle
+                build_side = choose_runtime_filter_side(rel, context)
+                if build_side == "left":
+                    df = self._apply_runtime_filter(dc_lhs, dc_rhs, lhs_on, rhs_on)
+                    df_rhs_renamed = DataContainer(df, cc_rhs_renamed).assign()
+                elif build_side == "right":
+                    df = self._apply_runtime_filter(dc_rhs, dc_lhs, rhs_on, lhs_on)
+                    df_lhs_renamed = DataContainer(df, cc_lhs_renamed).assign()
+                if build_side is not None and context._profiler is not None:
+                    context._profiler.annotate(f"runtime_filter={build_side}")
+
+        if semi_join_type is not None:
+            df_lhs_renamed = df_lhs_renamed.map_partitions(
+                _add_row_ids, self.ROW_ID_COLUMN
+            )
+
+        band_condition = None
+        if (
+            not lhs_on
+            and filter_condition
+            and join_type == "inner"
+            and not is_cudf_type(df_lhs_renamed)
+        ):
+            band_condition = self._extract_band_condition(
+                filter_condition,
+                list(cc_lhs_renamed.columns),
+                list(cc_rhs_renamed.columns),
+            )
+
         if lhs_on:
             # 5. Now we can finally merge on these columns
             # The resulting dataframe will contain all (renamed) columns from the lhs and rhs
@@ -117,7 +224,28 @@ class DaskJoinPlugin(BaseRelPlugin):
                 lhs_on,
                 rhs_on,
                 join_type,
+                strategy=strategy,
+                partitionwise=partitioned_keys is not None,
             )
+            if partitioned_keys is not None:
+                # The result is still distributed by the (non-null) lhs join keys,
+                # so that following joins on them can also skip the shuffle.
+                # The dtypes the rows were hashed with are kept, so that the
+                # partitioning is dropped if e.g. an outer join changed them.
+                partitioning = Partitioning(
+                    [f"lhs_{lhs_on[i]}" for i in partitioned_keys],
+                    dc_lhs.partitioning.dtypes,
+                    df.npartitions,
+                )
+        elif band_condition is not None:
+            # 5. The join condition restricts a column of one side
+            # to a range given by columns of the other side.
+            # Only the pairs of rows within the range are joined,
+            # the complete condition is still applied as filter afterwards.
+            logger.debug(f"Joining on the range condition {band_condition}")
+            if context._profiler is not None:
+                context._profiler.annotate(f"strategy=band({band_condition[0]})")
+            df = band_join(df_lhs_renamed, df_rhs_renamed, *band_condition)
         else:
             # 5. We are in the complex join case
             # where we have no column to merge on
@@ -126,22 +254,41 @@ class DaskJoinPlugin(BaseRelPlugin):
 
             # TODO: we should implement a shortcut
             # for filter conditions that are always false
+            if context._profiler is not None:
+                context._profiler.annotate("strategy=cross")
+
+            meta = dd.dispatch.concat(
+                [df_lhs_renamed._meta_nonempty, df_rhs_renamed._meta_nonempty], axis=1
+            )
 
-            def merge_single_partitions(lhs_partition, rhs_partition):
-                # Do a cross join with the two partitions
-                # TODO: it would be nice to apply the filter already here
-                # problem: this would mean we need to ship the rex to the
-                # workers (as this is executed on the workers),
-                # which is definitely not possible (java dependency, JVM start...)
-                lhs_partition = lhs_partition.assign(common=1)
-                rhs_partition = rhs_partition.assign(common=1)
-
-                return lhs_partition.merge(rhs_partition, on="common").drop(
-                    columns="common"
+            # The filter is applied already within the cross join of every
+            # pair of partitions, which is done in batches,
+            # so that the full cross product is never materialized
+            partition_filter = None
+            if filter_condition:
+                partition_filter = compile_partition_filter(
+                    rel,
+                    filter_condition,
+                    meta.iloc[:0],
+                    self._joined_column_container(
+                        meta.columns, correct_column_order, row_type, semi_join_type
+                    ),
+                    context,
                 )
+            if partition_filter is not None:
+                logger.debug("Applying the join condition within the cross join")
+                filter_condition = None
+
+            merge_single_partitions = partial(
+                _cross_join_partitions,
+                partition_filter=partition_filter,
+                batch_rows=self.CROSS_JOIN_BATCH_ROWS,
+            )
 
             # Iterate nested over all partitions from lhs and rhs and merge them
-            name = "cross-join-" + tokenize(df_lhs_renamed, df_rhs_renamed)
+            name = "cross-join-" + tokenize(
+                df_lhs_renamed, df_rhs_renamed, partition_filter
+            )
             dsk = {
                 (name, i * df_rhs_renamed.npartitions + j): (
                     merge_single_partitions,
@@ -156,9 +303,6 @@ class DaskJoinPlugin(BaseRelPlugin):
                 name, dsk, dependencies=[df_lhs_renamed, df_rhs_renamed]
             )
 
-            meta = dd.dispatch.concat(
-                [df_lhs_renamed._meta_nonempty, df_rhs_renamed._meta_nonempty], axis=1
-            )
             # TODO: Do we know the divisions in any way here?
             divisions = [None] * (len(dsk) + 1)
             df = dd.DataFrame(graph, name, meta=meta, divisions=divisions)
@@ -170,23 +314,11 @@ class DaskJoinPlugin(BaseRelPlugin):
 
         # 6. So the next step is to make sure
         # we have the correct column order (and to remove the temporary join columns)
-        correct_column_order = list(df_lhs_renamed.columns) + list(
-            df_rhs_renamed.columns
-        )
-        cc = ColumnContainer(df.columns).limit_to(correct_column_order)
-
         # and to rename them like the rel specifies
-        row_type = rel.getRowType()
-        field_specifications = [str(f) for f in row_type.getFieldNames()]
-
-        cc = cc.rename(
-            {
-                from_col: to_col
-                for from_col, to_col in zip(cc.columns, field_specifications)
-            }
+        cc = self._joined_column_container(
+            df.columns, correct_column_order, row_type, semi_join_type
         )
-        cc = self.fix_column_to_row_type(cc, row_type)
-        dc = DataContainer(df, cc)
+        dc = DataContainer(df, cc, partitioning=partitioning)
 
         # 7. Last but not least we apply any filters by and-chaining together the filters
         if filter_condition:
@@ -200,7 +332,15 @@ class DaskJoinPlugin(BaseRelPlugin):
             )
             logger.debug(f"Additionally applying filter {filter_condition}")
             df = filter_or_scalar(df, filter_condition)
-            dc = DataContainer(df, cc)
+            dc = DataContainer(df, cc, partitioning=partitioning)
+
+        if semi_join_type is not None:
+            # 8. Keep (or drop) the rows of the lhs, which are part of the remaining pairs
+            df = self._semi_join(
+                df_lhs_renamed, df, [self.ROW_ID_COLUMN], semi_join_type
+            )
+            cc = ColumnContainer(df.columns).limit_to(list(cc_lhs_renamed.columns))
+            dc = DataContainer(df, self._rename_to_row_type(cc, row_type))
 
         dc = self.fix_dtype_to_row_type(dc, rel.getRowType())
         # # Rename underlying DataFrame column names back to their original values before returning
@@ -215,6 +355,8 @@ class DaskJoinPlugin(BaseRelPlugin):
         lhs_on: List[str],
         rhs_on: List[str],
         join_type: str,
+        strategy: Optional["JoinStrategy"] = None,
+        partitionwise: bool = False,
     ) -> dd.DataFrame:
 
         lhs_columns_to_add = {
@@ -230,13 +372,13 @@ class DaskJoinPlugin(BaseRelPlugin):
         # contain NULLs, pandas will actually happily
         # keep those NULLs. That is however not compatible with
         # SQL, so we get rid of them here
-        if join_type in ["inner", "right"]:
+        if join_type in ["inner", "right", "leftsemi"]:
             df_lhs_filter = reduce(
                 operator.and_,
                 [~df_lhs_renamed.iloc[:, index].isna() for index in lhs_on],
             )
             df_lhs_renamed = df_lhs_renamed[df_lhs_filter]
-        if join_type in ["inner", "left"]:
+        if join_type in ["inner", "left", "leftsemi", "leftanti"]:
             df_rhs_filter = reduce(
                 operator.and_,
                 [~df_rhs_renamed.iloc[:, index].isna() for index in rhs_on],
@@ -247,7 +389,73 @@ class DaskJoinPlugin(BaseRelPlugin):
         df_rhs_with_tmp = df_rhs_renamed.assign(**rhs_columns_to_add)
         added_columns = list(lhs_columns_to_add.keys())
 
+        if join_type in ("leftsemi", "leftanti"):
+            if strategy is not None:
+                broadcast = strategy.broadcast_side == "right"
+            else:
+                broadcast = dask_config.get("sql.join.broadcast")
+            return self._semi_join(
+                df_lhs_with_tmp,
+                df_rhs_with_tmp,
+                added_columns,
+                join_type,
+                broadcast=broadcast,
+                partitionwise=partitionwise,
+            ).drop(columns=added_columns)
+
+        if partitionwise:
+            # Matching rows are in partitions with the same number on both sides,
+            # so the partitions can be merged pairwise without any shuffle
+            return df_lhs_with_tmp.map_partitions(
+                M.merge,
+                df_rhs_with_tmp,
+                on=added_columns,
+                how=join_type,
+                align_dataframes=False,
+            ).drop(columns=added_columns)
+
         broadcast = dask_config.get("sql.join.broadcast")
+        if strategy is not None:
+            # A single partition is joined with every partition of the other side
+            # (i.e. broadcasted), independent of the shuffle method
+            if strategy.broadcast_side == "left":
+                df_lhs_with_tmp = df_lhs_with_tmp.repartition(npartitions=1)
+            elif strategy.broadcast_side == "right":
+                df_rhs_with_tmp = df_rhs_with_tmp.repartition(npartitions=1)
+            else:
+                broadcast = False
+        skew_threshold = dask_config.get("sql.join.skew_threshold")
+        if (
+            skew_threshold
+            and broadcast in (None, False)
+            and (strategy is None or strategy.broadcast_side is None)
+            and not is_cudf_type(df_lhs_with_tmp)
+        ):
+            # Rows with hot keys of the preserved side of an outer join can stay
+            # in place, as only the rows of the other side are replicated
+            skewed_sides = {
+                "inner": ["left", "right"],
+                "left": ["left"],
+                "right": ["right"],
+            }.get(join_type, [])
+            hot_keys = None
+            if skewed_sides:
+                hot_keys = find_hot_keys(
+                    df_lhs_with_tmp,
+                    df_rhs_with_tmp,
+                    added_columns,
+                    skewed_sides,
+                    skew_threshold,
+                )
+            if hot_keys is not None:
+                return self._join_with_hot_keys(
+                    df_lhs_with_tmp,
+                    df_rhs_with_tmp,
+                    added_columns,
+                    join_type,
+                    *hot_keys,
+                ).drop(columns=added_columns)
+
         if not BROADCAST_JOIN_SUPPORT_WORKING and (
             isinstance(broadcast, float) or broadcast
         ):
@@ -265,6 +473,313 @@ class DaskJoinPlugin(BaseRelPlugin):
 
         return df
 
+    @staticmethod
+    def _join_with_hot_keys(
+        df_lhs: dd.DataFrame,
+        df_rhs: dd.DataFrame,
+        on: List[str],
+        join_type: str,
+        skewed_side: str,
+        hot_keys: List[tuple],
+    ) -> dd.DataFrame:
+        """
+        Join the rows with hot keys of the skewed side in place, with the rows of
+        the other side with these keys collected into a single partition, which
+        is joined with all of their partitions.
+        Only the remaining rows of both sides are shuffled for the join.
+        """
+        hot_keys = pd.MultiIndex.from_tuples(hot_keys)
+
+        def split(df):
+            mask = df.map_partitions(hot_key_mask, on, hot_keys, meta=(None, bool))
+            return df[mask], df[~mask]
+
+        df_lhs_hot, df_lhs_cold = split(df_lhs)
+        df_rhs_hot, df_rhs_cold = split(df_rhs)
+        if skewed_side == "left":
+            df_rhs_hot = df_rhs_hot.repartition(npartitions=1)
+        else:
+            df_lhs_hot = df_lhs_hot.repartition(npartitions=1)
+
+        df_hot = df_lhs_hot.merge(df_rhs_hot, on=on, how=join_type)
+        df_cold = df_lhs_cold.merge(df_rhs_cold, on=on, how=join_type, broadcast=False)
+        return dd.concat([df_cold, df_hot])
+
+    @staticmethod
+    def _semi_join(
+        df_lhs: dd.DataFrame,
+        df_rhs: dd.DataFrame,
+        on: List[str],
+        join_type: str,
+        broadcast: Union[bool, float, None] = None,
+        partitionwise: bool = False,
+    ) -> dd.DataFrame:
+        """
+        Keep ("leftsemi") or drop ("leftanti") the rows of df_lhs, which have matching values
+        in the ``on`` columns of df_rhs. Only the distinct values of these columns of df_rhs
+        are shuffled, or broadcasted as a single partition if ``broadcast`` is True.
+        """
+        df_rhs = df_rhs[on]
+        if partitionwise:
+            df_rhs = df_rhs.map_partitions(M.drop_duplicates)
+        else:
+            df_rhs = df_rhs.drop_duplicates(
+                split_out=1 if broadcast is True else df_rhs.npartitions
+            )
+
+        how = "inner"
+        if join_type == "leftanti":
+            # Rows without a match get a missing marker in the left join
+            df_rhs = df_rhs.assign(**{DaskJoinPlugin.MATCH_COLUMN: True})
+            how = "left"
+
+        if partitionwise:
+            df = df_lhs.map_partitions(
+                M.merge, df_rhs, on=on, how=how, align_dataframes=False
+            )
+        else:
+            df = df_lhs.merge(df_rhs, on=on, how=how, broadcast=broadcast)
+
+        if join_type == "leftanti":
+            df = df[df[DaskJoinPlugin.MATCH_COLUMN].isna()].drop(
+                columns=[DaskJoinPlugin.MATCH_COLUMN]
+            )
+        return df
+
+    @staticmethod
+    def _null_aware_anti_join_filter(
+        df_lhs: dd.DataFrame, df_rhs: dd.DataFrame, lhs_column: str, rhs_index: int
+    ) -> dd.DataFrame:
+        """
+        Remove the rows of df_lhs, which are not part of the result of
+        ``lhs_column NOT IN (rhs column)`` regardless of the values of the rhs:
+        all of them if the rhs has a NULL and the ones with a NULL in lhs_column
+        if the rhs is not empty. The remaining rows only need a (normal) anti join.
+        """
+        rhs_keys = df_rhs.iloc[:, rhs_index]
+        return df_lhs.map_partitions(
+            _filter_null_aware,
+            lhs_column,
+            rhs_keys.size == 0,
+            rhs_keys.isna().any(),
+            meta=df_lhs._meta,
+        )
+
+    def _joined_column_container(
+        self,
+        columns: List[str],
+        correct_column_order: List[str],
+        row_type: "RelDataType",
+        semi_join_type: Optional[str],
+    ) -> ColumnContainer:
+        cc = ColumnContainer(columns).limit_to(correct_column_order)
+        # The filter of a semi join still needs the original columns of both sides
+        if semi_join_type is None:
+            cc = self._rename_to_row_type(cc, row_type)
+        return cc
+
+    def _rename_to_row_type(
+        self, cc: ColumnContainer, row_type: "RelDataType"
+    ) -> ColumnContainer:
+        field_specifications = [str(f) for f in row_type.getFieldNames()]
+
+        cc = cc.rename(
+            {
+                from_col: to_col
+                for from_col, to_col in zip(cc.columns, field_specifications)
+            }
+        )
+        return self.fix_column_to_row_type(cc, row_type)
+
+    @staticmethod
+    def _apply_runtime_filter(
+        dc_build: DataContainer,
+        dc_probe: DataContainer,
+        build_on: List[int],
+        probe_on: List[int],
+    ) -> dd.DataFrame:
+        """
+        Filter the probe side of the join by the value ranges and a bloom filter
+        of the join keys of the build side and return its filtered dataframe.
+        Key columns, which have different types on both sides, are not compared.
+        """
+        build_columns = [
+            dc_build.column_container.get_backend_by_frontend_index(index)
+            for index in build_on
+        ]
+        probe_columns = [
+            dc_probe.column_container.get_backend_by_frontend_index(index)
+            for index in probe_on
+        ]
+        df_build, df_probe = dc_build.df, dc_probe.df
+        dtypes = [df_build[column].dtype for column in build_columns]
+        same_dtypes = dtypes == [df_probe[column].dtype for column in probe_columns]
+
+        # The hashes of both sides only agree for equal types.
+        # Floats are excluded, as 0.0 and -0.0 have different hashes.
+        with_bloom_filter = (
+            same_dtypes
+            and not is_cudf_type(df_probe)
+            and not any(pd.api.types.is_float_dtype(dtype) for dtype in dtypes)
+        )
+        with_ranges = [
+            same_dtypes
+            and (
+                pd.api.types.is_numeric_dtype(dtype)
+                or pd.api.types.is_datetime64_any_dtype(dtype)
+            )
+            and not pd.api.types.is_bool_dtype(dtype)
+            for dtype in dtypes
+        ]
+        if not with_bloom_filter and not any(with_ranges):
+            return df_probe
+
+        runtime_filter = compute_runtime_filter(
+            df_build, build_columns, with_bloom_filter, with_ranges
+        )
+        logger.debug(f"Filtering the probe side of the join with {runtime_filter}")
+        if runtime_filter.num_keys == 0:
+            # Nothing can be joined
+            return df_probe.head(0, compute=False)
+
+        # The ranges are pushed into the parquet reader (if possible)
+        conditions = [
+            (df_probe[column] >= value_range[0]) & (df_probe[column] <= value_range[1])
+            for column, value_range in zip(probe_columns, runtime_filter.ranges)
+            if value_range is not None
+        ]
+        if conditions:
+            df_probe = filter_or_scalar(df_probe, reduce(operator.and_, conditions))
+
+        if runtime_filter.bloom_filter is not None:
+            df_probe = df_probe.map_partitions(
+                filter_partition,
+                probe_columns,
+                # Only a single copy of the bloom filter is sent to the workers
+                delayed(runtime_filter.bloom_filter),
+                meta=df_probe._meta,
+            )
+        return df_probe
+
+    @staticmethod
+    def _common_partitioning_keys(
+        dc_lhs: DataContainer,
+        dc_rhs: DataContainer,
+        lhs_on: List[int],
+        rhs_on: List[int],
+    ) -> Optional[List[int]]:
+        """
+        If both inputs are hash partitioned in the same way on (a subset of)
+        the join keys, return the positions of these keys in lhs_on and rhs_on.
+        The inputs can then be joined partition by partition.
+        """
+        lhs_partitioning, rhs_partitioning = dc_lhs.partitioning, dc_rhs.partitioning
+        if lhs_partitioning is None or rhs_partitioning is None:
+            return None
+        if not (
+            lhs_partitioning.holds_for(dc_lhs.df)
+            and rhs_partitioning.holds_for(dc_rhs.df)
+        ):
+            return None
+        if (
+            lhs_partitioning.npartitions != rhs_partitioning.npartitions
+            or lhs_partitioning.dtypes != rhs_partitioning.dtypes
+        ):
+            return None
+
+        cc_lhs, cc_rhs = dc_lhs.column_container, dc_rhs.column_container
+        key_pairs = [
+            (
+                cc_lhs.get_backend_by_frontend_index(lhs_index),
+                cc_rhs.get_backend_by_frontend_index(rhs_index),
+            )
+            for lhs_index, rhs_index in zip(lhs_on, rhs_on)
+        ]
+        partitioned_keys = []
+        for key_pair in zip(lhs_partitioning.columns, rhs_partitioning.columns):
+            if key_pair not in key_pairs:
+                return None
+            partitioned_keys.append(key_pairs.index(key_pair))
+        return partitioned_keys
+
+    # Comparisons of a column with another one, whose operands can be swapped
+    SWAPPED_COMPARISONS = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+    def _extract_band_condition(
+        self,
+        filter_condition: List["Expression"],
+        lhs_columns: List[str],
+        rhs_columns: List[str],
+    ) -> Optional[Tuple[str, Optional[Bound], Optional[Bound], bool]]:
+        """
+        Find a column of one side, which is restricted to a range given by columns
+        of the other side (with ``<``, ``<=``, ``>``, ``>=`` or ``BETWEEN``)
+        and return the arguments for :func:`band_join`, or None if there is none.
+        Columns with a lower and an upper bound are preferred.
+        """
+        num_lhs_columns = len(lhs_columns)
+
+        def column_name(index):
+            if index < num_lhs_columns:
+                return lhs_columns[index]
+            return rhs_columns[index - num_lhs_columns]
+
+        def is_reference(rex):
+            return str(rex.getRexType()) == "RexType.Reference"
+
+        def same_side(index, other_index):
+            return (index < num_lhs_columns) == (other_index < num_lhs_columns)
+
+        # Bounds of every column, given as "column <op> other column"
+        bounds = {}
+
+        def add_bound(index, op, other_index):
+            if same_side(index, other_index):
+                return
+            kind = "lower" if op in (">", ">=") else "upper"
+            bounds.setdefault(index, {}).setdefault(
+                kind, (column_name(other_index), op in (">=", "<="))
+            )
+
+        conjunctions = list(filter_condition)
+        while conjunctions:
+            rex = conjunctions.pop(0)
+            if str(rex.getRexType()) != "RexType.Call":
+                continue
+            operator_name = str(rex.getOperatorName()).upper()
+            operands = rex.getOperands()
+            if operator_name == "AND":
+                conjunctions.extend(operands)
+            elif operator_name in self.SWAPPED_COMPARISONS and all(
+                is_reference(operand) for operand in operands
+            ):
+                index, other_index = [operand.getIndex() for operand in operands]
+                add_bound(index, operator_name, other_index)
+                add_bound(other_index, self.SWAPPED_COMPARISONS[operator_name], index)
+            elif (
+                operator_name == "BETWEEN"
+                and not rex.isNegated()
+                and all(is_reference(operand) for operand in operands)
+            ):
+                index, low_index, high_index = [
+                    operand.getIndex() for operand in operands
+                ]
+                if same_side(low_index, high_index):
+                    add_bound(index, ">=", low_index)
+                    add_bound(index, "<=", high_index)
+
+        if not bounds:
+            return None
+        index, column_bounds = max(
+            bounds.items(), key=lambda item: (len(item[1]), -item[0])
+        )
+        return (
+            column_name(index),
+            column_bounds.get("lower"),
+            column_bounds.get("upper"),
+            index < num_lhs_columns,
+        )
+
     def _split_join_condition(
         self, join_condition: "Expression"
     ) -> Tuple[List[str], List[str], List["Expression"]]:
@@ -338,3 +853,212 @@ class DaskJoinPlugin(BaseRelPlugin):
                     filter_conditions.append(operand)
 
             return lhs_indices, rhs_indices, filter_conditions
+
+
+def _cross_join_partitions(
+    lhs_partition,
+    rhs_partition,
+    partition_filter: Optional[PartitionFilter] = None,
+    batch_rows: int = DaskJoinPlugin.CROSS_JOIN_BATCH_ROWS,
+):
+    """
+    Cross join of two partitions. If a filter is given, it is applied to the
+    cross product of batches of the lhs rows with all rhs rows, so that at most
+    ``batch_rows`` rows of the cross product are held in memory at once.
+    """
+    rhs_partition = rhs_partition.assign(common=1)
+
+    batch_size = len(lhs_partition)
+    if partition_filter is not None:
+        batch_size = min(batch_size, batch_rows // max(len(rhs_partition), 1))
+    batch_size = max(batch_size, 1)
+
+    results = []
+    for start in range(0, max(len(lhs_partition), 1), batch_size):
+        lhs_batch = lhs_partition.iloc[start : start + batch_size].assign(common=1)
+        result = lhs_batch.merge(rhs_partition, on="common").drop(columns="common")
+        if partition_filter is not None:
+            result = partition_filter(result)
+        results.append(result)
+
+    if len(results) == 1:
+        return results[0]
+    return dd.dispatch.concat(results, ignore_index=True)
+
+
+def _add_row_ids(partition, column: str, partition_info=None):
+    """Number the rows of the partition, uniquely over all partitions"""
+    offset = partition_info["number"] << 32 if partition_info else 0
+    return partition.assign(
+        **{column: np.arange(offset, offset + len(partition), dtype=np.int64)}
+    )
+
+
+def _filter_null_aware(partition, column: str, rhs_is_empty: bool, rhs_has_null: bool):
+    if rhs_is_empty:
+        return partition
+    if rhs_has_null:
+        return partition.iloc[:0]
+    return partition[partition[column].notna()]
+
+
+class JoinStrategy:
+    """
+    The algorithm of a join, chosen from the estimated sizes of its inputs:
+    either broadcasting one side (given by ``broadcast_side``)
+    or shuffling both of them.
+    """
+
+    def __init__(
+        self, broadcast_side: Optional[str], estimated_bytes: Tuple[float, float]
+    ):
+        self.broadcast_side = broadcast_side
+        self.estimated_bytes = estimated_bytes
+
+    def __str__(self):
+        strategy = (
+            f"broadcast({self.broadcast_side})" if self.broadcast_side else "shuffle"
+        )
+        estimated_bytes = ", ".join(format_bytes(b) for b in self.estimated_bytes)
+        return f"strategy={strategy}, estimated_bytes=[{estimated_bytes}]"
+
+
+def choose_join_strategy(
+    rel: "LogicalPlan", context: "dask_sql.Context"
+) -> Optional[JoinStrategy]:
+    """
+    Broadcast the smaller input of the join if its estimated size is below
+    ``sql.join.broadcast_threshold`` and the join type allows it
+    (the preserved side of an outer join can not be broadcasted),
+    otherwise shuffle both inputs.
+    Returns None (and leaves the choice to dask) if ``sql.join.broadcast``
+    is set or the size of any input is unknown.
+    """
+    if dask_config.get("sql.join.broadcast") is not None:
+        return None
+    threshold = parse_bytes(dask_config.get("sql.join.broadcast_threshold"))
+    if not threshold:
+        return None
+
+    estimated_bytes = tuple(
+        estimate_bytes(input_rel, context) for input_rel in rel.get_inputs()
+    )
+    if None in estimated_bytes:
+        return None
+
+    join_type = DaskJoinPlugin.JOIN_TYPE_MAPPING.get(str(rel.join().getJoinType()))
+    candidates = [
+        (size, side)
+        for side, size, allowed_join_types in zip(
+            ["left", "right"],
+            estimated_bytes,
+            [("inner", "right"), ("inner", "left", "leftsemi", "leftanti")],
+        )
+        if size <= threshold and join_type in allowed_join_types
+    ]
+    broadcast_side = min(candidates)[1] if candidates else None
+    return JoinStrategy(broadcast_side, estimated_bytes)
+
+
+def choose_runtime_filter_side(
+    rel: "LogicalPlan", context: "dask_sql.Context"
+) -> Optional[str]:
+    """
+    Choose the input of the join, whose join keys filter the other input before the join
+    (see :mod:`dask_sql.physical.utils.runtime_filter`): the smaller input, if it is filtered
+    itself (otherwise it typically contains the keys of all rows of the other input) and its
+    estimated size is below ``sql.join.runtime_filter_threshold``.
+    Only rows, which are dropped by the join if they have no join partner, can be filtered,
+    which excludes the preserved side of outer joins.
+    Returns None if no runtime filter should be used.
+    """
+    threshold = parse_bytes(dask_config.get("sql.join.runtime_filter_threshold"))
+    if not threshold:
+        return None
+
+    build_sides = {
+        "INNER": ["left", "right"],
+        "LEFT": ["left"],
+        "RIGHT": ["right"],
+        "LEFTSEMI": ["right"],
+    }.get(str(rel.join().getJoinType()), [])
+    inputs = dict(zip(["left", "right"], rel.get_inputs()))
+    estimated_bytes = {
+        side: estimate_bytes(input_rel, context) for side, input_rel in inputs.items()
+    }
+
+    candidates = [
+        (estimated_bytes[side], side)
+        for side in build_sides
+        if estimated_bytes[side] is not None
+        and estimated_bytes[side] <= threshold
+        and _is_filtered(inputs[side])
+    ]
+    if not candidates:
+        return None
+    size, build_side = min(candidates)
+    probe_size = estimated_bytes["right" if build_side == "left" else "left"]
+    if probe_size is not None and probe_size < size:
+        return None
+    return build_side
+
+
+def _is_filtered(rel: "LogicalPlan") -> bool:
+    """Check if the plan filters any of the tables it scans"""
+    node_type = rel.get_current_node_type()
+    if node_type == "Filter":
+        return True
+    if node_type == "TableScan":
+        return bool(rel.table_scan().getFilters())
+    return any(_is_filtered(input_rel) for input_rel in rel.get_inputs())
+
+
+def annotate_join_strategies(
+    rel: "LogicalPlan", explain_string: str, context: "dask_sql.Context"
+) -> str:
+    """
+    Add the strategy of every join to the EXPLAIN output of the plan.
+    The joins are converted (only building the graph, nothing is computed),
+    so that the output shows the strategies chosen by :class:`DaskJoinPlugin`,
+    e.g. for joins of co-partitioned inputs or joins without any equality condition.
+    """
+    from dask_sql.physical.rel.convert import RelConverter
+
+    profiler = QueryProfiler()
+    with profiler.attach(context), warnings.catch_warnings():
+        # Cross joins are only explained here, not executed
+        warnings.simplefilter("ignore", ResourceWarning)
+        for join_rel in _outermost_joins(rel):
+            RelConverter.convert(join_rel, context)
+
+    lines = explain_string.split("\n")
+    position = 0
+    # Operators are recorded in the order they are printed
+    for join_profile in profiler.operators:
+        if join_profile.node_type != "Join":
+            continue
+        for i in range(position, len(lines)):
+            # The annotations are appended to the description with ", "
+            description = lines[i].strip()
+            if join_profile.description == description or (
+                join_profile.description.startswith(description + ", ")
+            ):
+                lines[i] += join_profile.description[len(description) :]
+                position = i + 1
+                break
+
+    return "\n".join(lines)
+
+
+def _outermost_joins(rel: "LogicalPlan") -> List["LogicalPlan"]:
+    """Joins of the plan, which are not part of the inputs of another join"""
+    joins = []
+    stack = [rel]
+    while stack:
+        node = stack.pop()
+        if node.get_current_node_type() == "Join":
+            joins.append(node)
+        else:
+            # Visit the inputs in the order they are printed
+            stack.extend(reversed(node.get_inputs()))
+    return joins
@@ -72,7 +72,7 @@ class DaskProjectPlugin(BaseRelPlugin):
         cc = cc.limit_to(column_names)
 
         cc = self.fix_column_to_row_type(cc, rel.getRowType())
-        dc = DataContainer(df, cc)
+        dc = DataContainer(df, cc, partitioning=dc.partitioning)
         dc = self.fix_dtype_to_row_type(dc, rel.getRowType())
 
         return dc
@@ -51,7 +51,7 @@ class DaskTableScanPlugin(BaseRelPlugin):
 
         cc = dc.column_container
         cc = self.fix_column_to_row_type(cc, rel.getRowType())
-        dc = DataContainer(dc.df, cc)
+        dc = DataContainer(dc.df, cc, partitioning=dc.partitioning)
         dc = self.fix_dtype_to_row_type(dc, rel.getRowType())
         return dc
 
@@ -72,7 +72,7 @@ class DaskTableScanPlugin(BaseRelPlugin):
                 str(f) for f in dask_table.getRowType().getFieldNames()
             ]
         cc = cc.limit_to(field_specifications)
-        return DataContainer(df, cc)
+        return DataContainer(df, cc, partitioning=dc.partitioning)
 
     def _apply_filters(self, table_scan, rel, dc, context):
         df = dc.df
@@ -89,4 +89,4 @@ class DaskTableScanPlugin(BaseRelPlugin):
             )
             df = filter_or_scalar(df, df_condition)
 
-        return DataContainer(df, cc)
+        return DataContainer(df, cc, partitioning=dc.partitioning)
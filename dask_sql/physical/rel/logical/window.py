@@ -70,6 +70,15 @@ class AvgOperation(OverOperation):
         return partitioned_group[value_col].mean()
 
 
+class QuantileOperation(OverOperation):
+    def __init__(self, quantile: Optional[float] = None):
+        # the quantile is None if it is given as argument of the function
+        self.quantile = quantile
+
+    def call(self, partitioned_group, value_col):
+        return partitioned_group[value_col].quantile(self.quantile)
+
+
 class BoundDescription(
     namedtuple(
         "BoundDescription",
@@ -240,6 +249,11 @@ class DaskWindowPlugin(BaseRelPlugin):
         "first_value": FirstValueOperation(),
         "last_value": LastValueOperation(),
         "avg": AvgOperation(),
+        "approx_percentile": QuantileOperation(),
+        "approxmedian": QuantileOperation(0.5),
+        "approxpercentilecont": QuantileOperation(),
+        "median": QuantileOperation(0.5),
+        "percentile_cont": QuantileOperation(),
     }
 
     def convert(self, rel: "LogicalPlan", context: "dask_sql.Context") -> DataContainer:
@@ -429,12 +443,23 @@ class DaskWindowPlugin(BaseRelPlugin):
             except KeyError:  # pragma: no cover
                 raise NotImplementedError(f"{operator_name} not (yet) implemented")
 
+        args = rel.window().getArgs(window)
+        if isinstance(operation, QuantileOperation) and operation.quantile is None:
+            # The quantile is a literal, not an operand column
+            quantile = RexConverter.convert(rel, args[1], dc, context=context)
+            if not np.isscalar(quantile):
+                raise NotImplementedError(
+                    f"The quantile of {operator_name} needs to be a literal"
+                )
+            operation = QuantileOperation(quantile)
+            args = args[:1]
+
         logger.debug(f"Executing {operator_name} on {str(LoggableDataFrame(df))}")
 
         # TODO: can be optimized by re-using already present columns
         temporary_operand_columns = {
             new_temporary_column(df): RexConverter.convert(rel, o, dc, context=context)
-            for o in rel.window().getArgs(window)
+            for o in args
         }
         df = df.assign(**temporary_operand_columns)
         temporary_operand_columns = list(temporary_operand_columns.keys())
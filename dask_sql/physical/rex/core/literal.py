@@ -100,6 +100,17 @@ class RexLiteralPlugin(BaseRexPlugin):
     ) -> Any:
         literal_type = str(rex.getType())
 
+        # Parameters of prepared statements are bound on every execution
+        if literal_type == "Placeholder":
+            placeholder_id = rex.getPlaceholderId()
+            try:
+                return context._bound_parameters[placeholder_id]
+            except KeyError:
+                raise RuntimeError(
+                    f"No value given for the parameter {placeholder_id}. "
+                    "Queries with parameters need to be executed with Context.prepare()"
+                ) from None
+
         # Call the Rust function to get the actual value and convert the Rust
         # type name back to a SQL type
         if literal_type == "Boolean":
@@ -0,0 +1,248 @@
+"""
+Computation and persistence of the table statistics collected by ``ANALYZE TABLE``.
+
+All statistics of all analyzed columns are computed in a single aggregation
+over the table: the row count, the number of non-null values, the minimum and
+maximum, the number of distinct values (from HyperLogLog sketches) and an
+equi-height histogram (from t-digest sketches) of numeric columns.
+Only the (small) sketches are moved between the workers.
+"""
+import datetime
+import decimal
+import json
+import logging
+import re
+from typing import Any, List, Optional
+
+import dask.dataframe as dd
+import fsspec
+import numpy as np
+import pandas as pd
+from dask.base import tokenize
+
+from dask_sql.datacontainer import ColumnStatistics, Statistics
+from dask_sql.physical.utils.groupby import ExtremumAggregation
+from dask_sql.physical.utils.sketches import (
+    HistogramAggregation,
+    HyperLogLogAggregation,
+)
+from dask_sql.utils import new_temporary_column
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the files storing the statistics of a table next to its data
+STATISTICS_FILE_SUFFIX = ".statistics.json"
+
+
+def analyze_columns(
+    df: dd.DataFrame,
+    columns: List[str],
+    hll_precision: int = 14,
+    histogram_buckets: int = 0,
+    tdigest_compression: int = 200,
+) -> dd.DataFrame:
+    """
+    Build the (lazy) aggregation computing the statistics of the given columns,
+    which can be turned into :class:`Statistics` with :func:`to_statistics`
+    after it was computed.
+    """
+    spec = {}
+    for column in columns:
+        dtype = df[column].dtype
+        aggregations = [
+            "size",
+            "count",
+            HyperLogLogAggregation("ndv", precision=hll_precision),
+        ]
+        if _is_orderable(dtype):
+            if dtype == object or isinstance(dtype, pd.CategoricalDtype):
+                # The built-in aggregations can not compare strings with NULLs
+                aggregations += [ExtremumAggregation("min"), ExtremumAggregation("max")]
+            else:
+                aggregations += ["min", "max"]
+        if histogram_buckets and _is_numeric(dtype):
+            aggregations.append(
+                HistogramAggregation(
+                    "histogram", histogram_buckets, compression=tdigest_compression
+                )
+            )
+        spec[column] = aggregations
+
+    # Aggregate everything into a single group
+    group_column = new_temporary_column(df)
+    return (
+        df[list(spec)]
+        .assign(**{group_column: 0})
+        .groupby(group_column)
+        .agg(spec, split_out=1)
+    )
+
+
+def to_statistics(result: pd.DataFrame, columns: List[str]) -> Statistics:
+    """Turn the computed result of :func:`analyze_columns` into :class:`Statistics`"""
+    if len(result) == 0:
+        # Empty table: nothing is known besides the row count
+        return Statistics(0, columns={column: ColumnStatistics() for column in columns})
+
+    row = result.iloc[0]
+    row_count = 0
+    column_statistics = {}
+    for column in columns:
+        values = row[column]
+        row_count = int(values["size"])
+        null_count = row_count - int(values["count"])
+        column_statistics[column] = ColumnStatistics(
+            ndv=int(values["ndv"]),
+            null_fraction=null_count / row_count if row_count else None,
+            min=_to_python(values.get("min")),
+            max=_to_python(values.get("max")),
+            histogram=values.get("histogram"),
+        )
+
+    return Statistics(row_count, columns=column_statistics)
+
+
+def statistics_path(filepath: str) -> str:
+    """Location of the statistics file of the table read from the given path"""
+    return filepath.rstrip("/") + STATISTICS_FILE_SUFFIX
+
+
+def save_statistics(statistics: Statistics, filepath: str) -> bool:
+    """
+    Store the statistics next to the data of a table read from the given path,
+    so that they are used again when the table is created in another session
+    (as long as the data is not changed).
+    Nothing is stored if the path is not a single file or directory
+    (e.g. a glob pattern or the name of a published dataset).
+    Returns whether the statistics were stored.
+    """
+    if re.search(r"[*?\[]", filepath):
+        return False
+    fs, path = fsspec.core.url_to_fs(filepath)
+    if not fs.exists(path):
+        return False
+
+    content = {
+        "data_version": _data_version(fs, path),
+        "row_count": _encode(statistics.row_count),
+        "columns": {
+            str(column): {
+                key: _encode(value)
+                for key, value in vars(column_statistics).items()
+                if value is not None
+            }
+            for column, column_statistics in statistics.columns.items()
+        },
+    }
+    with fsspec.open(statistics_path(filepath), "w") as f:
+        json.dump(content, f)
+
+    logger.debug(f"Stored the statistics of {filepath}")
+    return True
+
+
+def load_statistics(filepath: str) -> Optional[Statistics]:
+    """
+    Read the statistics stored with :func:`save_statistics`, if there are any
+    and the data was not changed since they were stored.
+    """
+    if re.search(r"[*?\[]", filepath):
+        return None
+    fs, path = fsspec.core.url_to_fs(statistics_path(filepath))
+    if not fs.exists(path):
+        return None
+
+    with fs.open(path, "r") as f:
+        content = json.load(f)
+
+    data_fs, data_path = fsspec.core.url_to_fs(filepath)
+    if not data_fs.exists(data_path) or content.get("data_version") != _data_version(
+        data_fs, data_path
+    ):
+        logger.debug(f"Ignoring the outdated statistics of {filepath}")
+        return None
+
+    logger.debug(f"Using the stored statistics of {filepath}")
+    return Statistics(
+        _decode(content["row_count"]),
+        columns={
+            column: ColumnStatistics(
+                **{key: _decode(value) for key, value in column_statistics.items()}
+            )
+            for column, column_statistics in content["columns"].items()
+        },
+    )
+
+
+def _data_version(fs: fsspec.AbstractFileSystem, path: str) -> str:
+    """
+    Token of the names, sizes and modification times of all files
+    of the data at the given path, which changes whenever the data is rewritten
+    """
+    files = []
+    for name, info in sorted(fs.find(path, detail=True).items()):
+        modified = next(
+            (
+                info[key]
+                for key in ["mtime", "LastModified", "last_modified", "updated"]
+                if key in info
+            ),
+            None,
+        )
+        files.append((name, info.get("size"), str(modified)))
+    return tokenize(files)
+
+
+def _is_orderable(dtype) -> bool:
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.ordered
+    return (
+        pd.api.types.is_numeric_dtype(dtype)
+        or pd.api.types.is_datetime64_any_dtype(dtype)
+        or pd.api.types.is_string_dtype(dtype)
+    )
+
+
+def _is_numeric(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+        dtype
+    )
+
+
+def _to_python(value: Any) -> Any:
+    """Turn (numpy) scalars into python values and missing values into None"""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _encode(value: Any) -> Any:
+    """Represent a statistics value in JSON, keeping the type of timestamps and dates"""
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    value = _to_python(value)
+    if isinstance(value, datetime.datetime):
+        return {"timestamp": pd.Timestamp(value).isoformat()}
+    if isinstance(value, datetime.date):
+        return {"date": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # Values without a JSON representation are dropped
+    return None
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if "timestamp" in value:
+            return pd.Timestamp(value["timestamp"])
+        if "date" in value:
+            return datetime.date.fromisoformat(value["date"])
+    return value
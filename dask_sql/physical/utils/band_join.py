@@ -0,0 +1,161 @@
+"""
+Join on range conditions, like ``a.ts BETWEEN b.start AND b.end``, without a cross join.
+
+The rows of one input (the "keys") are matched with the rows of the other input
+(the "intervals"), whose bounds enclose the key.
+Only pairs of partitions, whose key range overlaps with the range of the bounds,
+are joined at all. Within such a pair, the keys are sorted and the matching keys
+of every interval are found by a binary search for its bounds,
+so that only the matching pairs of rows are ever materialized.
+"""
+import logging
+from functools import partial
+from typing import List, Optional, Tuple
+
+import dask
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+from dask.base import tokenize
+from dask.highlevelgraph import HighLevelGraph
+
+logger = logging.getLogger(__name__)
+
+# A bound of the interval: the column holding it and whether it is inclusive
+Bound = Tuple[str, bool]
+
+
+def band_join(
+    df_lhs: dd.DataFrame,
+    df_rhs: dd.DataFrame,
+    key_column: str,
+    lower: Optional[Bound],
+    upper: Optional[Bound],
+    key_is_left: bool,
+) -> dd.DataFrame:
+    """
+    Inner join of the two dataframes, keeping all pairs of rows where
+    the key column (of the lhs if ``key_is_left``, otherwise of the rhs)
+    is within the lower and upper bound columns of the other side.
+    The result has the columns of the lhs followed by the ones of the rhs.
+
+    The minimum and maximum of the key and bound columns of every partition
+    are computed eagerly, to skip pairs of partitions without any match.
+    """
+    df_keys, df_intervals = (df_lhs, df_rhs) if key_is_left else (df_rhs, df_lhs)
+
+    key_ranges, lower_ranges, upper_ranges = dask.compute(
+        _partition_ranges(df_keys[key_column]),
+        _partition_ranges(df_intervals[lower[0]]) if lower else None,
+        _partition_ranges(df_intervals[upper[0]]) if upper else None,
+    )
+    pairs = [
+        (i, j)
+        for i, (key_min, key_max) in enumerate(key_ranges)
+        for j in range(df_intervals.npartitions)
+        if key_min is not None
+        and (not lower or _maybe_less_equal(lower_ranges[j][0], key_max))
+        and (not upper or _maybe_less_equal(key_min, upper_ranges[j][1]))
+    ]
+    logger.debug(
+        f"Joining {len(pairs)} of {df_keys.npartitions * df_intervals.npartitions} pairs of partitions"
+    )
+    if not pairs:
+        # Keep a single (empty) partition
+        pairs = [(0, 0)]
+    if not key_is_left:
+        pairs = [(j, i) for i, j in pairs]
+
+    join_partitions = partial(
+        _band_join_partitions,
+        key_column=key_column,
+        lower=lower,
+        upper=upper,
+        key_is_left=key_is_left,
+    )
+    name = "band-join-" + tokenize(df_lhs, df_rhs, key_column, lower, upper)
+    dsk = {
+        (name, k): (join_partitions, (df_lhs._name, i), (df_rhs._name, j))
+        for k, (i, j) in enumerate(sorted(pairs))
+    }
+    graph = HighLevelGraph.from_collections(name, dsk, dependencies=[df_lhs, df_rhs])
+
+    meta = dd.dispatch.concat([df_lhs._meta, df_rhs._meta], axis=1)
+    divisions = [None] * (len(dsk) + 1)
+    return dd.DataFrame(graph, name, meta=meta, divisions=divisions)
+
+
+def _partition_ranges(series: dd.Series) -> List[Tuple]:
+    """Delayed minimum and maximum of every partition, which are None for partitions without values"""
+    return [dask.delayed(_min_max)(partition) for partition in series.to_delayed()]
+
+
+def _min_max(series: pd.Series) -> Tuple:
+    series = series.dropna()
+    if len(series) == 0:
+        return None, None
+    return series.min(), series.max()
+
+
+def _maybe_less_equal(left, right) -> bool:
+    """Compare two partition bounds, which are None if the partition has no values"""
+    if left is None or right is None:
+        return False
+    return left <= right
+
+
+def _band_join_partitions(
+    lhs: pd.DataFrame,
+    rhs: pd.DataFrame,
+    key_column: str,
+    lower: Optional[Bound],
+    upper: Optional[Bound],
+    key_is_left: bool,
+) -> pd.DataFrame:
+    keys, intervals = (lhs, rhs) if key_is_left else (rhs, lhs)
+
+    # Sort the (non-null) keys
+    key_values = keys[key_column].to_numpy()
+    valid_keys = np.flatnonzero(keys[key_column].notna().to_numpy())
+    order = valid_keys[np.argsort(key_values[valid_keys], kind="stable")]
+    sorted_keys = key_values[order]
+
+    # Every interval matches a consecutive range of the sorted keys
+    start = np.zeros(len(intervals), dtype=np.int64)
+    end = np.full(len(intervals), len(sorted_keys), dtype=np.int64)
+    valid_intervals = np.ones(len(intervals), dtype=bool)
+    if lower:
+        column, inclusive = lower
+        bounds = intervals[column]
+        valid_intervals &= bounds.notna().to_numpy()
+        start[valid_intervals] = np.searchsorted(
+            sorted_keys,
+            bounds.to_numpy()[valid_intervals],
+            side="left" if inclusive else "right",
+        )
+    if upper:
+        column, inclusive = upper
+        bounds = intervals[column]
+        valid_intervals &= bounds.notna().to_numpy()
+        end[valid_intervals] = np.searchsorted(
+            sorted_keys,
+            bounds.to_numpy()[valid_intervals],
+            side="right" if inclusive else "left",
+        )
+    counts = np.where(valid_intervals, np.maximum(end - start, 0), 0)
+
+    # Enumerate the matching pairs
+    interval_rows = np.repeat(np.arange(len(intervals)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    key_rows = order[np.repeat(start, counts) + offsets]
+
+    lhs_rows, rhs_rows = (
+        (key_rows, interval_rows) if key_is_left else (interval_rows, key_rows)
+    )
+    return pd.concat(
+        [
+            lhs.iloc[lhs_rows].reset_index(drop=True),
+            rhs.iloc[rhs_rows].reset_index(drop=True),
+        ],
+        axis=1,
+    )
@@ -0,0 +1,207 @@
+import logging
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dask_sql.datacontainer import DataContainer, Statistics
+from dask_sql.mappings import sql_to_python_type
+
+try:
+    from dask_sql.physical.utils.statistics import parquet_statistics
+except ModuleNotFoundError:
+    parquet_statistics = None
+
+if TYPE_CHECKING:
+    import dask_sql
+    from dask_planner.rust import LogicalPlan, SqlTypeName
+
+logger = logging.getLogger(__name__)
+
+# Assumed size of a single value of a column with variable width (like strings)
+VARIABLE_WIDTH_BYTES = 32
+
+
+def estimate_row_count(
+    rel: "LogicalPlan", context: "dask_sql.Context"
+) -> Optional[float]:
+    """
+    Estimate the number of rows produced by the given logical plan
+    from the row counts of the tables it scans.
+    Filters are not assumed to be selective and joins are assumed to
+    match every row of the larger input at most once, so the estimate
+    is an upper bound for most plans.
+    Returns None if the row count of any of the scanned tables is unknown.
+    """
+    node_type = rel.get_current_node_type()
+
+    if node_type == "TableScan":
+        _, statistics = _scanned_table(rel, context)
+        if statistics is None or pd.isna(statistics.row_count):
+            return None
+        return float(statistics.row_count)
+
+    input_row_counts = [
+        estimate_row_count(input_rel, context) for input_rel in rel.get_inputs()
+    ]
+    if not input_row_counts or None in input_row_counts:
+        return None
+
+    if node_type == "Union":
+        return sum(input_row_counts)
+    if node_type == "CrossJoin":
+        return float(np.prod(input_row_counts))
+    return max(input_row_counts)
+
+
+def estimate_bytes(rel: "LogicalPlan", context: "dask_sql.Context") -> Optional[float]:
+    """
+    Estimate the in-memory size of the output of the given logical plan
+    from its estimated number of rows (see :func:`estimate_row_count`)
+    and the width of its output columns.
+    Columns of variable width (like strings) are assumed to take
+    ``VARIABLE_WIDTH_BYTES`` per value.
+    Returns None if the number of rows is unknown.
+    """
+    row_count = estimate_row_count(rel, context)
+    if row_count is None:
+        return None
+
+    row_width = sum(
+        _column_width(field.getType().getSqlType())
+        for field in rel.getRowType().getFieldList()
+    )
+    return row_count * row_width
+
+
+def estimate_distinct_count(
+    rel: "LogicalPlan", columns: List[str], context: "dask_sql.Context"
+) -> Optional[float]:
+    """
+    Estimate the number of distinct combinations of the given output
+    columns of the logical plan, e.g. the number of groups of a GROUP BY.
+    Columns which are read unchanged from a table are bounded by their
+    number of distinct values or the range of their values (if known from
+    the column statistics or the parquet metadata).
+    Returns None if the number of rows of the plan or the number of distinct
+    values of any of the columns is unknown: assuming unknown columns to be
+    unique would overestimate the (often few) groups of e.g. string columns.
+    """
+    row_count = estimate_row_count(rel, context)
+    if row_count is None:
+        return None
+
+    distinct_count = 1.0
+    for column in columns:
+        column_distinct_count = _column_distinct_count(rel, column, context)
+        if column_distinct_count is None:
+            return None
+        distinct_count *= column_distinct_count
+
+    return min(distinct_count, row_count)
+
+
+def _column_width(sql_type: "SqlTypeName") -> int:
+    """Bytes per value of a column of the given SQL type"""
+    try:
+        dtype = pd.api.types.pandas_dtype(sql_to_python_type(sql_type))
+    except (NotImplementedError, TypeError):
+        return VARIABLE_WIDTH_BYTES
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return VARIABLE_WIDTH_BYTES
+    return getattr(dtype, "itemsize", VARIABLE_WIDTH_BYTES)
+
+
+def _scanned_table(
+    rel: "LogicalPlan", context: "dask_sql.Context"
+) -> Tuple[DataContainer, Optional[Statistics]]:
+    schema_name, table_name = [n.lower() for n in context.fqn(rel.getTable())]
+    schema = context.schema[schema_name]
+    return schema.tables[table_name], schema.statistics.get(table_name)
+
+
+def _scanned_tables(rel: "LogicalPlan", context: "dask_sql.Context"):
+    stack = [rel]
+    while stack:
+        node = stack.pop()
+        if node.get_current_node_type() == "TableScan":
+            yield _scanned_table(node, context)
+        stack.extend(node.get_inputs())
+
+
+def _column_distinct_count(
+    rel: "LogicalPlan", column: str, context: "dask_sql.Context"
+) -> Optional[float]:
+    # Group columns might be qualified with the name of their table
+    column = column.split(".")[-1]
+
+    candidates = [
+        (dc, statistics)
+        for dc, statistics in _scanned_tables(rel, context)
+        if column in dc.column_container.columns
+    ]
+    if len(candidates) != 1:
+        # unknown or ambiguous origin of the column
+        return None
+    dc, statistics = candidates[0]
+
+    backend_column = dc.column_container.get_backend_by_frontend_name(column)
+    column_statistics = statistics.columns.get(backend_column) if statistics else None
+    if column_statistics is not None and column_statistics.ndv is not None:
+        return float(column_statistics.ndv)
+
+    dtype = dc.df[backend_column].dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return 2.0
+    if not pd.api.types.is_integer_dtype(dtype) or statistics is None:
+        return None
+
+    column_range = _column_range(dc, statistics, backend_column)
+    if column_range is None:
+        return None
+    minimum, maximum = column_range
+    return float(maximum - minimum + 1)
+
+
+def _column_range(
+    dc: DataContainer, statistics: Statistics, column: str
+) -> Optional[Tuple[Any, Any]]:
+    """
+    Minimum and maximum of a table column, taken from its column statistics
+    or read once from the parquet metadata
+    """
+    column_statistics = statistics.columns.get(column)
+    if (
+        column_statistics is not None
+        and column_statistics.min is not None
+        and column_statistics.max is not None
+    ):
+        return column_statistics.min, column_statistics.max
+
+    if column not in statistics.column_ranges:
+        column_range = None
+        if parquet_statistics is not None:
+            partition_statistics = parquet_statistics(dc.df, columns=[column])
+            column_range = _merge_ranges(partition_statistics or [], column)
+        statistics.column_ranges[column] = column_range
+        logger.debug(f"Range of column {column}: {column_range}")
+
+    return statistics.column_ranges[column]
+
+
+def _merge_ranges(partition_statistics: List[dict], column: str):
+    minimum, maximum = None, None
+    for partition in partition_statistics:
+        column_statistics = [c for c in partition["columns"] if c["name"] == column]
+        if not column_statistics:
+            return None
+        partition_min = column_statistics[0].get("min")
+        partition_max = column_statistics[0].get("max")
+        if partition_min is None or partition_max is None:
+            return None
+        minimum = partition_min if minimum is None else min(minimum, partition_min)
+        maximum = partition_max if maximum is None else max(maximum, partition_max)
+
+    if minimum is None:
+        return None
+    return minimum, maximum
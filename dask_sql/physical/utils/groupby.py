@@ -1,8 +1,10 @@
 from typing import List
 
 import dask.dataframe as dd
+import numpy as np
+import pandas as pd
 
-from dask_sql.utils import new_temporary_column
+from dask_sql.utils import is_cudf_type, new_temporary_column
 
 
 def get_groupby_with_nulls_cols(
@@ -34,3 +36,74 @@ def get_groupby_with_nulls_cols(
         group_columns_and_nulls = [additional_column_name]
 
     return group_columns_and_nulls
+
+
+def get_group_numbers(grouped) -> np.ndarray:
+    """
+    Number of the group of every row of a (pandas or cudf) groupby,
+    -1 for rows without group (e.g. dropped NaN keys)
+    """
+    group_numbers = grouped.ngroup()
+    if is_cudf_type(group_numbers):
+        group_numbers = group_numbers.to_pandas()
+    return group_numbers.fillna(-1).to_numpy().astype(np.int64)
+
+
+def get_group_index(grouped) -> pd.Index:
+    """The keys of all groups of a (pandas or cudf) groupby, in the order of their group numbers"""
+    index = grouped.size().index
+    if is_cudf_type(index):
+        index = index.to_pandas()
+    return index
+
+
+def as_groupby_result(result: pd.Series, grouped):
+    """Return the result of a groupby in the dataframe library of the input"""
+    if is_cudf_type(grouped.obj):
+        import cudf
+
+        return cudf.from_pandas(result)
+    return result
+
+
+class ExtremumAggregation(dd.Aggregation):
+    """
+    MIN or MAX for dtypes, which the dask groupby can not aggregate
+    natively (e.g. strings stored as objects or categoricals).
+    The values are sorted once and the first (or last) non-null value
+    of every group is taken, instead of calling a python function
+    on every group.
+    """
+
+    def __init__(self, function_name: str):
+        take_max = function_name == "max"
+        series_aggregate = lambda s: _extremum_of_groups(s, take_max)
+
+        super().__init__(function_name, series_aggregate, series_aggregate)
+
+
+def _extremum_of_groups(grouped, take_max: bool):
+    values = grouped.obj
+    if is_cudf_type(values):
+        values = values.to_pandas()
+    group_numbers = get_group_numbers(grouped)
+    index = get_group_index(grouped)
+
+    valid = values.notna().to_numpy() & (group_numbers >= 0)
+    values = values[valid]
+    group_numbers = group_numbers[valid]
+
+    # Sort by value and then (stable) by group,
+    # so that the extrema are at the boundaries of the groups
+    order = np.asarray(values.argsort(kind="stable"))
+    order = order[np.argsort(group_numbers[order], kind="stable")]
+    group_numbers = group_numbers[order]
+
+    all_groups = np.arange(len(index))
+    group_starts = np.searchsorted(group_numbers, all_groups)
+    group_ends = np.searchsorted(group_numbers, all_groups, side="right") - 1
+    has_values = group_ends >= group_starts
+    positions = order[(group_ends if take_max else group_starts)[has_values]]
+
+    result = values.iloc[positions].set_axis(index[has_values])
+    return as_groupby_result(result.reindex(index), grouped)
@@ -0,0 +1,223 @@
+import ast
+import logging
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import dask
+import pandas as pd
+from dask.delayed import delayed
+from dask.sizeof import sizeof
+
+if TYPE_CHECKING:
+    import dask_sql
+    from dask_planner.rust import LogicalPlan
+
+logger = logging.getLogger(__name__)
+
+
+class OperatorProfile:
+    """Measurements of a single logical operator of a profiled query"""
+
+    def __init__(self, rel: "LogicalPlan", node_type: str, depth: int):
+        self.node_type = node_type
+        self.description = rel.explain_current().splitlines()[0].strip()
+        self.depth = depth
+        # Operators converted while converting this one
+        self.children: List["OperatorProfile"] = []
+        # All operators this one consumes, including shared ones converted before
+        self.inputs: List["OperatorProfile"] = []
+
+        self.total_build_time = 0.0
+        self.dc = None
+        self.layers = set()
+        self.tasks = 0
+        self.compute_time = 0.0
+        self.rows_out = None
+        self.bytes_out = None
+
+    @property
+    def build_time(self) -> float:
+        """Time spent constructing the graph of this operator, without its inputs"""
+        return self.total_build_time - sum(
+            child.total_build_time for child in self.children
+        )
+
+    @property
+    def rows_in(self) -> Optional[int]:
+        if not self.inputs:
+            return None
+        return sum(operator.rows_out or 0 for operator in self.inputs)
+
+
+class QueryProfiler:
+    """
+    Collects per-operator measurements of a query.
+    While attached to a context, :class:`~dask_sql.physical.rel.RelConverter`
+    reports the conversion of every logical operator to it.
+    Afterwards, :func:`run` computes the query once without graph optimization,
+    so that every task can be attributed to the operator which added its layer.
+    """
+
+    def __init__(self):
+        self.operators: List[OperatorProfile] = []
+        self._stack: List[OperatorProfile] = []
+        self._operators_by_key: Dict = {}
+
+    @contextmanager
+    def attach(self, context: "dask_sql.Context"):
+        """Record all conversions done with the given context"""
+        previous_profiler = context._profiler
+        context._profiler = self
+        try:
+            yield self
+        finally:
+            context._profiler = previous_profiler
+
+    @contextmanager
+    def profile(self, rel: "LogicalPlan", node_type: str, key=None):
+        """Measure the conversion of a single operator (including its inputs)"""
+        operator = OperatorProfile(rel, node_type, depth=len(self._stack))
+        if self._stack:
+            self._stack[-1].children.append(operator)
+            self._stack[-1].inputs.append(operator)
+        self.operators.append(operator)
+        if key is not None:
+            self._operators_by_key[key] = operator
+
+        self._stack.append(operator)
+        start = time.perf_counter()
+        try:
+            yield operator
+        finally:
+            operator.total_build_time = time.perf_counter() - start
+            self._stack.pop()
+
+    def annotate(self, details: str):
+        """Add details (like the chosen algorithm) to the description of the current operator"""
+        if self._stack:
+            self._stack[-1].description += f", {details}"
+
+    def reuse(self, key):
+        """Mark an already converted operator as input of the current one"""
+        operator = self._operators_by_key.get(key)
+        if operator is not None and self._stack:
+            self._stack[-1].inputs.append(operator)
+
+    def run(self, df) -> pd.DataFrame:
+        """Compute the query and return the collected measurements per operator"""
+        layer_owners = self._assign_layers()
+
+        partition_stats = [
+            [
+                delayed(_partition_stats)(partition)
+                for partition in operator.dc.df.to_delayed(optimize_graph=False)
+            ]
+            for operator in self.operators
+        ]
+
+        start = time.perf_counter()
+        with _collect_task_times() as task_times:
+            result, *partition_stats = dask.compute(
+                df, *partition_stats, optimize_graph=False
+            )
+        wall_time = time.perf_counter() - start
+
+        for key, duration in task_times:
+            operator = layer_owners.get(_key_name(key))
+            if operator is not None:
+                operator.compute_time += duration
+
+        for operator, stats in zip(self.operators, partition_stats):
+            operator.rows_out = sum(rows for rows, _ in stats)
+            operator.bytes_out = sum(nbytes for _, nbytes in stats)
+
+        logger.debug(f"Profiled query with {len(result)} rows in {wall_time:.3f}s")
+
+        return pd.DataFrame(
+            {
+                "Operator": [
+                    "  " * operator.depth + operator.description
+                    for operator in self.operators
+                ],
+                "Build (ms)": [
+                    operator.build_time * 1e3 for operator in self.operators
+                ],
+                "Tasks": [operator.tasks for operator in self.operators],
+                "Compute (s)": [operator.compute_time for operator in self.operators],
+                "Rows in": [operator.rows_in for operator in self.operators],
+                "Rows out": [operator.rows_out for operator in self.operators],
+                "Bytes out": [operator.bytes_out for operator in self.operators],
+            }
+        )
+
+    def _assign_layers(self) -> Dict[str, OperatorProfile]:
+        """Attribute every graph layer to the operator which created it"""
+        layer_owners = {}
+        # Inputs are converted (and therefore finished) before their consumers
+        for operator in sorted(self.operators, key=lambda o: -o.depth):
+            input_layers = set()
+            for input_operator in operator.inputs:
+                input_layers |= set(input_operator.dc.df.dask.layers)
+
+            graph = operator.dc.df.dask
+            for layer_name in set(graph.layers) - input_layers:
+                if layer_name not in layer_owners:
+                    layer_owners[layer_name] = operator
+                    operator.layers.add(layer_name)
+                    operator.tasks += len(graph.layers[layer_name])
+
+        return layer_owners
+
+
+def _partition_stats(partition):
+    return len(partition), sizeof(partition)
+
+
+def _key_name(key) -> str:
+    """Name of the layer a task key belongs to"""
+    if isinstance(key, str) and key.startswith("("):
+        # older versions of distributed report stringified keys
+        try:
+            key = ast.literal_eval(key)
+        except (ValueError, SyntaxError):
+            pass
+    if isinstance(key, tuple):
+        return key[0]
+    return key
+
+
+@contextmanager
+def _collect_task_times():
+    """
+    Collect the compute time of every task executed within the block,
+    either from the task stream of the distributed client or
+    from the profiler of the local schedulers.
+    """
+    task_times = []
+
+    try:
+        from distributed import default_client, get_task_stream
+
+        client = default_client()
+    except (ImportError, ValueError):
+        client = None
+
+    if client is not None:
+        with get_task_stream(client) as task_stream:
+            yield task_times
+        for task in task_stream.data:
+            duration = sum(
+                startstop["stop"] - startstop["start"]
+                for startstop in task["startstops"]
+                if startstop["action"] == "compute"
+            )
+            task_times.append((task["key"], duration))
+    else:
+        from dask.diagnostics import Profiler
+
+        with Profiler() as profiler:
+            yield task_times
+        task_times.extend(
+            (task.key, task.end_time - task.start_time) for task in profiler.results
+        )
@@ -0,0 +1,171 @@
+"""
+Runtime filters, which reduce one input of a join by the join keys of the other one.
+
+Before the join, the join keys of the smaller (build) input are summarized into a
+bloom filter and the minimum and maximum of every key column.
+The larger (probe) input is then filtered by these value ranges (which are pushed
+into the parquet reader, so that row groups without matching keys are not read at all)
+and by the bloom filter, before it is shuffled for the join.
+Only rows are removed, which would not have been joined with any row anyway.
+"""
+import math
+from typing import Any, List, Optional, Tuple
+
+import dask
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from dask_sql.physical.utils.sketches import hash_values
+from dask_sql.utils import is_cudf_type
+
+# False positive rate of the bloom filters
+BLOOM_FILTER_FPP = 0.01
+
+
+class BloomFilter:
+    """
+    Set of 64 bit hashes, which can report false positives but no false negatives.
+    The ``num_hashes`` bit positions of a hash are derived from its two
+    32 bit halves (double hashing).
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = np.zeros((num_bits + 7) // 8, dtype=np.uint8)
+
+    @classmethod
+    def from_hashes(
+        cls, hashes: np.ndarray, fpp: float = BLOOM_FILTER_FPP
+    ) -> "BloomFilter":
+        """Bloom filter of the given (distinct) hashes with the given false positive rate"""
+        num_bits = max(64, math.ceil(-len(hashes) * math.log(fpp) / math.log(2) ** 2))
+        num_hashes = max(1, round(-math.log2(fpp)))
+
+        bloom_filter = cls(num_bits, num_hashes)
+        bloom_filter.add(hashes)
+        return bloom_filter
+
+    def add(self, hashes: np.ndarray):
+        for positions in self._positions(hashes):
+            np.bitwise_or.at(
+                self.bits,
+                positions >> np.uint64(3),
+                np.left_shift(1, positions & np.uint64(7)).astype(np.uint8),
+            )
+
+    def might_contain(self, hashes: np.ndarray) -> np.ndarray:
+        result = np.ones(len(hashes), dtype=bool)
+        for positions in self._positions(hashes):
+            bits = self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7))
+            result &= (bits & np.uint64(1)).astype(bool)
+        return result
+
+    def _positions(self, hashes: np.ndarray):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        lower = hashes & np.uint64(0xFFFFFFFF)
+        upper = (hashes >> np.uint64(32)) | np.uint64(1)
+        for i in range(self.num_hashes):
+            yield (lower + np.uint64(i) * upper) % np.uint64(self.num_bits)
+
+
+class RuntimeFilter:
+    """
+    Summary of the (non-null) join keys of the build side of a join:
+    their number, a bloom filter of their hashes (or None, if it was not requested)
+    and the minimum and maximum of every key column (or None, if it was not requested
+    or there are no keys).
+    """
+
+    def __init__(
+        self,
+        num_keys: int,
+        bloom_filter: Optional[BloomFilter],
+        ranges: List[Optional[Tuple[Any, Any]]],
+    ):
+        self.num_keys = num_keys
+        self.bloom_filter = bloom_filter
+        self.ranges = ranges
+
+    def __repr__(self):
+        return f"RuntimeFilter(num_keys={self.num_keys}, ranges={self.ranges})"
+
+
+def compute_runtime_filter(
+    df: dd.DataFrame,
+    columns: List[str],
+    with_bloom_filter: bool,
+    with_ranges: List[bool],
+) -> RuntimeFilter:
+    """
+    Compute the runtime filter of the given key columns of the (small) build side.
+    This is done eagerly, as the value ranges are needed to push them into the
+    parquet reader of the probe side.
+    """
+    keys = df[columns].dropna()
+    summaries = [
+        dask.delayed(_summarize_keys)(partition, with_bloom_filter, with_ranges)
+        for partition in keys.to_delayed()
+    ]
+    (runtime_filter,) = dask.compute(
+        dask.delayed(_combine_summaries)(summaries, with_bloom_filter, with_ranges)
+    )
+    return runtime_filter
+
+
+def filter_partition(
+    partition: pd.DataFrame, columns: List[str], bloom_filter: BloomFilter
+) -> pd.DataFrame:
+    """Keep only the rows of a partition of the probe side, whose keys might be in the bloom filter"""
+    keys = partition[columns]
+    valid = keys.notna().all(axis=1).to_numpy()
+    contained = np.zeros(len(partition), dtype=bool)
+    contained[valid] = bloom_filter.might_contain(hash_values(keys[valid]))
+    return partition[contained]
+
+
+def _summarize_keys(
+    partition: pd.DataFrame, with_bloom_filter: bool, with_ranges: List[bool]
+):
+    if is_cudf_type(partition):
+        partition = partition.to_pandas()
+
+    hashes = np.unique(hash_values(partition)) if with_bloom_filter else None
+    ranges = [
+        (partition.iloc[:, i].min(), partition.iloc[:, i].max())
+        if with_range and len(partition)
+        else None
+        for i, with_range in enumerate(with_ranges)
+    ]
+    return len(partition), hashes, ranges
+
+
+def _combine_summaries(
+    summaries: list, with_bloom_filter: bool, with_ranges: List[bool]
+) -> RuntimeFilter:
+    num_keys = sum(num_keys for num_keys, _, _ in summaries)
+
+    bloom_filter = None
+    if with_bloom_filter:
+        hashes = np.unique(
+            np.concatenate(
+                [np.empty(0, dtype=np.uint64)] + [hashes for _, hashes, _ in summaries]
+            )
+        )
+        bloom_filter = BloomFilter.from_hashes(hashes)
+
+    ranges = []
+    for i, with_range in enumerate(with_ranges):
+        partition_ranges = [r[i] for _, _, r in summaries if r[i] is not None]
+        if with_range and partition_ranges:
+            ranges.append(
+                (
+                    min(r[0] for r in partition_ranges),
+                    max(r[1] for r in partition_ranges),
+                )
+            )
+        else:
+            ranges.append(None)
+
+    return RuntimeFilter(num_keys, bloom_filter, ranges)
@@ -0,0 +1,327 @@
+"""
+Mergeable sketches for approximate aggregations.
+
+Every sketch is implemented as a :class:`dask.dataframe.Aggregation`:
+the chunk step builds one sketch per group and partition, the aggregation
+step merges the sketches of the same group (also in the intermediate steps
+of the tree reduction) and the finalize step turns them into the result.
+This way, approximate aggregations only ever move the (small) sketches
+between workers instead of shuffling the data itself.
+"""
+import math
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from dask_sql.physical.utils.groupby import get_group_index, get_group_numbers
+from dask_sql.utils import is_cudf_type
+
+# Number of bits of the HyperLogLog sketch entries used for the rank
+_RANK_BITS = 6
+# Bias correction of HyperLogLog for small numbers of registers
+_HLL_ALPHA = {16: 0.673, 32: 0.697, 64: 0.709}
+# A t-digest without any values (one row of means, one row of weights)
+_EMPTY_DIGEST = np.empty((2, 0), dtype=np.float64)
+
+
+class HyperLogLogAggregation(dd.Aggregation):
+    """
+    Approximate number of distinct (non-null) values, using HyperLogLog sketches
+    with ``2 ** precision`` registers (the relative standard error
+    is about ``1.04 / sqrt(2 ** precision)``).
+
+    To keep the sketches of groups with only a few values small,
+    they are stored sparsely as the (sorted) non-zero registers,
+    each encoded as ``register << 6 | rank``.
+    """
+
+    def __init__(self, name: str, precision: int = 14):
+        if not 4 <= precision <= 16:
+            raise ValueError(
+                f"The precision of HyperLogLog sketches must be between 4 and 16, got {precision}"
+            )
+
+        super().__init__(
+            name,
+            chunk=lambda s: _hll_chunk(s, precision),
+            agg=_hll_merge,
+            finalize=lambda s: _hll_finalize(s, precision),
+        )
+
+
+def hash_values(series: pd.Series) -> np.ndarray:
+    """64 bit hashes of the values, which are the same on every worker"""
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def _hll_chunk(grouped, precision: int) -> pd.Series:
+    values = grouped.obj
+    if is_cudf_type(values):
+        values = values.to_pandas()
+    group_numbers = get_group_numbers(grouped)
+
+    valid = values.notna().to_numpy() & (group_numbers >= 0)
+    hashes = hash_values(values[valid])
+    registers = hashes >> np.uint64(64 - precision)
+
+    # The rank is the position of the first 1-bit in the remaining bits.
+    # They are exactly representable as float, so frexp gives their bit length.
+    remaining = hashes & np.uint64((1 << (64 - precision)) - 1)
+    _, bit_length = np.frexp(remaining.astype(np.float64))
+    ranks = (64 - precision) - bit_length + 1
+
+    codes = (registers.astype(np.int64) << _RANK_BITS) | ranks
+    return _to_sketches(group_numbers[valid], codes, get_group_index(grouped))
+
+
+def _hll_merge(grouped) -> pd.Series:
+    sketches = grouped.obj
+    group_numbers = get_group_numbers(grouped)
+    lengths = np.array([len(sketch) for sketch in sketches], dtype=np.int64)
+
+    codes = (
+        np.concatenate(list(sketches)) if len(sketches) else np.empty(0, dtype=np.int64)
+    )
+    return _to_sketches(
+        np.repeat(group_numbers, lengths), codes, get_group_index(grouped)
+    )
+
+
+def _to_sketches(group_numbers: np.ndarray, codes: np.ndarray, index: pd.Index):
+    """Build one sparse sketch per group, keeping the maximal rank per register"""
+    order = np.lexsort((codes, group_numbers))
+    group_numbers = group_numbers[order]
+    codes = codes[order]
+
+    # After sorting, the last entry of every register has the maximal rank
+    registers = codes >> _RANK_BITS
+    is_last = np.ones(len(codes), dtype=bool)
+    is_last[:-1] = (group_numbers[1:] != group_numbers[:-1]) | (
+        registers[1:] != registers[:-1]
+    )
+    group_numbers = group_numbers[is_last]
+    codes = codes[is_last]
+
+    boundaries = np.searchsorted(group_numbers, np.arange(len(index) + 1))
+    sketches = np.empty(len(index), dtype=object)
+    for i in range(len(index)):
+        sketches[i] = codes[boundaries[i] : boundaries[i + 1]]
+
+    return pd.Series(sketches, index=index)
+
+
+def _hll_finalize(sketches: pd.Series, precision: int) -> pd.Series:
+    return pd.Series(
+        [_hll_estimate(sketch, precision) for sketch in sketches],
+        index=sketches.index,
+        dtype="int64",
+    )
+
+
+def _hll_estimate(codes: np.ndarray, precision: int) -> int:
+    num_registers = 1 << precision
+    registers = np.zeros(num_registers, dtype=np.float64)
+    registers[codes >> _RANK_BITS] = codes & ((1 << _RANK_BITS) - 1)
+
+    alpha = _HLL_ALPHA.get(num_registers, 0.7213 / (1 + 1.079 / num_registers))
+    estimate = alpha * num_registers**2 / np.sum(2.0**-registers)
+
+    # Use linear counting for small cardinalities, where HyperLogLog is biased
+    num_zeros = num_registers - len(codes)
+    if estimate <= 2.5 * num_registers and num_zeros > 0:
+        estimate = num_registers * math.log(num_registers / num_zeros)
+
+    return int(round(estimate))
+
+
+class TDigestAggregation(dd.Aggregation):
+    """
+    Approximate quantile of the (non-null) values, using t-digest sketches
+    of at most about ``compression / 2`` centroids per group.
+
+    The centroids are sized with the arcsine scale function, so that they
+    are small close to the minimum and maximum (where quantiles are most
+    sensitive) and larger around the median.
+    Groups with at most ``compression`` values keep all of them, so their
+    quantiles are exact (interpolated linearly as in ``PERCENTILE_CONT``).
+    Every sketch is stored as a 2 x n array of the sorted centroid means and their weights.
+    """
+
+    def __init__(self, name: str, quantile: float, compression: int = 200):
+        if not 0 <= quantile <= 1:
+            raise ValueError(f"The quantile must be between 0 and 1, got {quantile}")
+        if compression < 10:
+            raise ValueError(
+                f"The compression of t-digest sketches must be at least 10, got {compression}"
+            )
+
+        super().__init__(
+            name,
+            chunk=lambda s: _tdigest_chunk(s, compression),
+            agg=lambda s: _tdigest_merge(s, compression),
+            finalize=lambda s: _tdigest_finalize(s, quantile),
+        )
+
+
+class HistogramAggregation(dd.Aggregation):
+    """
+    Approximate equi-height histogram of the (non-null) values,
+    given as the ``buckets + 1`` boundaries of buckets holding
+    the same number of values each (the minimum, the ``1 / buckets``
+    quantile, ..., the maximum).
+    The boundaries are read from the same t-digest sketches
+    as in :class:`TDigestAggregation`.
+    """
+
+    def __init__(self, name: str, buckets: int, compression: int = 200):
+        if buckets < 1:
+            raise ValueError(
+                f"A histogram needs at least a single bucket, got {buckets}"
+            )
+        if compression < 10:
+            raise ValueError(
+                f"The compression of t-digest sketches must be at least 10, got {compression}"
+            )
+
+        quantiles = np.linspace(0, 1, buckets + 1)
+        super().__init__(
+            name,
+            chunk=lambda s: _tdigest_chunk(s, compression),
+            agg=lambda s: _tdigest_merge(s, compression),
+            finalize=lambda s: _histogram_finalize(s, quantiles),
+        )
+
+
+def _tdigest_chunk(grouped, compression: int) -> pd.Series:
+    values = grouped.obj
+    if is_cudf_type(values):
+        values = values.to_pandas()
+    group_numbers = get_group_numbers(grouped)
+
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(values) & (group_numbers >= 0)
+    values = values[valid]
+
+    return _to_digests(
+        *_compress(
+            group_numbers[valid], values, np.ones(len(values)), compression=compression
+        ),
+        get_group_index(grouped),
+    )
+
+
+def _tdigest_merge(grouped, compression: int) -> pd.Series:
+    digests = grouped.obj
+    group_numbers = get_group_numbers(grouped)
+    lengths = np.array([digest.shape[1] for digest in digests], dtype=np.int64)
+
+    means, weights = (
+        np.concatenate(list(digests), axis=1) if len(digests) else _EMPTY_DIGEST
+    )
+    return _to_digests(
+        *_compress(
+            np.repeat(group_numbers, lengths), means, weights, compression=compression
+        ),
+        get_group_index(grouped),
+    )
+
+
+def _compress(
+    group_numbers: np.ndarray,
+    means: np.ndarray,
+    weights: np.ndarray,
+    compression: int,
+):
+    """
+    Merge neighbouring centroids of every group, such that each of the
+    merged centroids spans at most one unit of the arcsine scale function
+    (which goes from 0 to ``compression / 2``).
+    All groups are compressed at once, without a loop over the groups.
+    """
+    order = np.lexsort((means, group_numbers))
+    group_numbers = group_numbers[order]
+    means = means[order]
+    weights = weights[order]
+    if len(means) == 0:
+        return group_numbers, means, weights
+
+    is_first = np.ones(len(means), dtype=bool)
+    is_first[1:] = group_numbers[1:] != group_numbers[:-1]
+    group_starts = np.flatnonzero(is_first)
+    group_lengths = np.diff(np.append(group_starts, len(means)))
+
+    # Position of every centroid within its group, by count and by weight
+    cumulative_weights = np.cumsum(weights) - weights
+    weight_before = cumulative_weights - np.repeat(
+        cumulative_weights[group_starts], group_lengths
+    )
+    position = np.arange(len(means)) - np.repeat(group_starts, group_lengths)
+    total_weights = np.repeat(np.add.reduceat(weights, group_starts), group_lengths)
+
+    quantiles = (weight_before + weights / 2) / total_weights
+    buckets = np.floor(
+        compression / (2 * np.pi) * (np.arcsin(2 * quantiles - 1) + np.pi / 2)
+    )
+    # Small groups are kept as they are
+    buckets = np.where(total_weights <= compression, position, buckets)
+
+    is_new_centroid = is_first.copy()
+    is_new_centroid[1:] |= buckets[1:] != buckets[:-1]
+    centroid_starts = np.flatnonzero(is_new_centroid)
+
+    merged_weights = np.add.reduceat(weights, centroid_starts)
+    merged_means = np.add.reduceat(means * weights, centroid_starts) / merged_weights
+    return group_numbers[centroid_starts], merged_means, merged_weights
+
+
+def _to_digests(
+    group_numbers: np.ndarray,
+    means: np.ndarray,
+    weights: np.ndarray,
+    index: pd.Index,
+) -> pd.Series:
+    """Split the (sorted) centroids into one sketch per group"""
+    boundaries = np.searchsorted(group_numbers, np.arange(len(index) + 1))
+    digests = np.empty(len(index), dtype=object)
+    for i in range(len(index)):
+        digests[i] = np.stack(
+            [
+                means[boundaries[i] : boundaries[i + 1]],
+                weights[boundaries[i] : boundaries[i + 1]],
+            ]
+        )
+
+    return pd.Series(digests, index=index)
+
+
+def _tdigest_finalize(digests: pd.Series, quantile: float) -> pd.Series:
+    return pd.Series(
+        [_tdigest_quantile(digest, quantile) for digest in digests],
+        index=digests.index,
+        dtype="float64",
+    )
+
+
+def _tdigest_quantile(digest: np.ndarray, quantile):
+    """The quantile (or array of quantiles) of the values summarized by the t-digest"""
+    means, weights = digest
+    if len(means) == 0:
+        return np.nan
+
+    # Every centroid is located at the center of the values it represents.
+    # For single values, this is the linear interpolation between the closest ranks.
+    centers = np.cumsum(weights) - weights / 2
+    target = quantile * (weights.sum() - 1) + 0.5
+    return np.interp(target, centers, means)
+
+
+def _histogram_finalize(digests: pd.Series, quantiles: np.ndarray) -> pd.Series:
+    histograms = np.empty(len(digests), dtype=object)
+    for i, digest in enumerate(digests):
+        histograms[i] = (
+            [float(value) for value in _tdigest_quantile(digest, quantiles)]
+            if digest.shape[1]
+            else None
+        )
+    return pd.Series(histograms, index=digests.index)
@@ -0,0 +1,128 @@
+"""
+Detection of skewed join keys ("hot keys"), which account for a large fraction
+of the rows of one input of a join.
+
+A shuffle join sends all rows with the same key to the same partition,
+so that a few hot keys leave a single worker with most of the data.
+The frequencies of the keys are therefore estimated from a sample of every partition
+before the join. The rows with hot keys are then joined without a shuffle:
+they stay in their partitions and are joined with the (few) rows of the other input
+with the same keys, which are replicated to all of them.
+All other rows are shuffled as usual.
+"""
+import logging
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import dask
+import dask.dataframe as dd
+import pandas as pd
+
+from dask_sql.utils import is_cudf_type
+
+logger = logging.getLogger(__name__)
+
+# Maximal number of rows sampled from every partition
+SAMPLE_ROWS_PER_PARTITION = 1000
+
+
+class KeyFrequencies:
+    """
+    Estimated number of rows of a dataframe (``num_rows``)
+    and of its rows with every (sampled, non-null) key (``counts``).
+    """
+
+    def __init__(self, num_rows: int, counts: Counter):
+        self.num_rows = num_rows
+        self.counts = counts
+
+    def fraction(self, key: tuple) -> float:
+        """Estimated fraction of the rows with the given key"""
+        return self.counts.get(key, 0) / self.num_rows if self.num_rows else 0.0
+
+
+def find_hot_keys(
+    df_lhs: dd.DataFrame,
+    df_rhs: dd.DataFrame,
+    columns: List[str],
+    skewed_sides: List[str],
+    threshold: float,
+) -> Optional[Tuple[str, List[tuple]]]:
+    """
+    Find the keys of the given columns, which are in at least the fraction
+    ``threshold`` of the rows of one of the ``skewed_sides`` ("left" or "right")
+    but not of the other side (as the rows of the other side with these keys
+    are replicated).
+    Returns the side with most rows with hot keys together with its hot keys
+    (the most frequent first), or None if there are none.
+    This is done eagerly on a sample of both inputs.
+    """
+    frequencies = dict(
+        zip(
+            ["left", "right"],
+            dask.compute(
+                sample_key_frequencies(df_lhs, columns),
+                sample_key_frequencies(df_rhs, columns),
+            ),
+        )
+    )
+
+    candidates = []
+    for side in skewed_sides:
+        other_side = "right" if side == "left" else "left"
+        hot_keys = [
+            key
+            for key, _ in frequencies[side].counts.most_common()
+            if frequencies[side].fraction(key) >= threshold
+            and frequencies[other_side].fraction(key) < threshold
+        ]
+        if hot_keys:
+            hot_fraction = sum(frequencies[side].fraction(key) for key in hot_keys)
+            candidates.append((hot_fraction, side, hot_keys))
+
+    if not candidates:
+        return None
+    hot_fraction, side, hot_keys = max(candidates)
+    logger.debug(
+        f"Found {len(hot_keys)} hot keys in {hot_fraction:.0%} of the {side} rows of the join"
+    )
+    return side, hot_keys
+
+
+def sample_key_frequencies(df: dd.DataFrame, columns: List[str]):
+    """Delayed :class:`KeyFrequencies` of the given columns of the dataframe"""
+    samples = [
+        dask.delayed(_sample_partition)(partition, columns)
+        for partition in df.to_delayed()
+    ]
+    return dask.delayed(_combine_samples)(samples)
+
+
+def hot_key_mask(
+    partition: pd.DataFrame, columns: List[str], hot_keys: pd.MultiIndex
+) -> pd.Series:
+    """Mark the rows of the partition with any of the hot keys"""
+    keys = pd.MultiIndex.from_frame(partition[columns])
+    return pd.Series(keys.isin(hot_keys), index=partition.index)
+
+
+def _sample_partition(partition: pd.DataFrame, columns: List[str]):
+    if is_cudf_type(partition):
+        partition = partition.to_pandas()
+
+    keys = partition[columns].dropna()
+    num_keys = len(keys)
+    if num_keys > SAMPLE_ROWS_PER_PARTITION:
+        keys = keys.sample(SAMPLE_ROWS_PER_PARTITION, random_state=42)
+    # Every sampled row stands for this number of rows of the partition
+    weight = num_keys / len(keys) if len(keys) else 0
+    counts = keys.value_counts()
+    return len(partition), {key: count * weight for key, count in counts.items()}
+
+
+def _combine_samples(samples: list) -> KeyFrequencies:
+    num_rows = sum(num_rows for num_rows, _ in samples)
+    counts = Counter()
+    for _, partition_counts in samples:
+        counts.update(partition_counts)
+    return KeyFrequencies(num_rows, counts)
@@ -4,7 +4,7 @@ import itertools
 import logging
 from collections import defaultdict
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 import dask
 import dask.dataframe as dd
@@ -16,6 +16,7 @@ from dask.delayed import delayed
 from dask.layers import DataFrameIOLayer
 from dask.utils_test import hlg_layer
 
+from dask_sql.datacontainer import ColumnStatistics
 from dask_sql.utils import make_pickable_without_dask_sql
 
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ def parquet_statistics(
     ddf
         Dask-DataFrame object to extract Parquet statistics from.
     columns
-        List of columns to collect min/max statistics for. If ``None``
+        List of columns to collect min/max/null-count statistics for. If ``None``
         (the default), only 'num-rows' statistics will be collected.
     parallel
         The number of distinct files to collect statistics for
@@ -60,9 +61,11 @@ def parquet_statistics(
 
         If column statistics are available, each element of the
         list stored under the "columns" key will correspond to
-        a dictionary with "name", "min", and "max" keys::
+        a dictionary with "name", "min", "max" and "null_count" keys::
 
-            ``{'name': 'col0', 'min': 0, 'max': 100}``
+            ``{'name': 'col0', 'min': 0, 'max': 100, 'null_count': 0}``
+
+        The "null_count" is None if it is not stored for all row groups.
     """
 
     # Check that we have a supported `ddf` object
@@ -145,6 +148,57 @@ def parquet_statistics(
         return _read_partition_stats_group(parts, fs, engine, columns=columns)
 
 
+def merge_column_statistics(statistics: List[dict]) -> Dict[str, ColumnStatistics]:
+    """Merge the partition statistics of ``parquet_statistics`` into column statistics
+
+    Parameters
+    ----------
+    statistics
+        List of Parquet statistics as returned by ``parquet_statistics``.
+
+    Returns
+    -------
+    column_statistics
+        The minimum, maximum and fraction of NULLs of every column,
+        for which they are stored for all partitions.
+    """
+    row_count = sum(partition["num-rows"] for partition in statistics)
+    merged = None
+    for partition in statistics:
+        partition_columns = {column["name"]: column for column in partition["columns"]}
+        if merged is None:
+            merged = {name: dict(column) for name, column in partition_columns.items()}
+            continue
+
+        for name in list(merged):
+            column = partition_columns.get(name)
+            if column is None:
+                # not stored for this partition
+                del merged[name]
+                continue
+            merged[name]["min"] = min(merged[name]["min"], column["min"])
+            merged[name]["max"] = max(merged[name]["max"], column["max"])
+            if merged[name].get("null_count") is not None:
+                merged[name]["null_count"] = (
+                    None
+                    if column.get("null_count") is None
+                    else merged[name]["null_count"] + column["null_count"]
+                )
+
+    return {
+        name: ColumnStatistics(
+            null_fraction=(
+                column["null_count"] / row_count
+                if column.get("null_count") is not None and row_count
+                else None
+            ),
+            min=column["min"],
+            max=column["max"],
+        )
+        for name, column in (merged or {}).items()
+    }
+
+
 @make_pickable_without_dask_sql
 def _read_partition_stats_group(parts, fs, engine, columns=None):
     def _read_partition_stats(part, fs, columns=None):
@@ -155,6 +209,7 @@ def _read_partition_stats_group(parts, fs, engine, columns=None):
             part = [part]
 
         column_stats = {}
+        null_counts = {}
         num_rows = 0
         columns = columns or []
         for p in part:
@@ -171,6 +226,14 @@ def _read_partition_stats_group(parts, fs, engine, columns=None):
                     col = row_group.column(i)
                     name = col.path_in_schema
                     if name in columns:
+                        if col.statistics and col.statistics.has_null_count:
+                            if null_counts.get(name, 0) is not None:
+                                null_counts[name] = (
+                                    null_counts.get(name, 0) + col.statistics.null_count
+                                )
+                        else:
+                            # unknown in at least one row group
+                            null_counts[name] = None
                         if col.statistics and col.statistics.has_min_max:
                             if name in column_stats:
                                 column_stats[name]["min"] = min(
@@ -192,6 +255,7 @@ def _read_partition_stats_group(parts, fs, engine, columns=None):
                 "name": name,
                 "min": column_stats[name]["min"],
                 "max": column_stats[name]["max"],
+                "null_count": null_counts.get(name),
             }
             for name in column_stats.keys()
         ]
@@ -0,0 +1,94 @@
+import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from dask import config as dask_config
+
+from dask_sql.utils import parse_hints
+
+if TYPE_CHECKING:
+    import dask_sql
+    from dask_planner.rust import LogicalPlan
+
+logger = logging.getLogger(__name__)
+
+
+class PreparedStatement:
+    """
+    A query which was parsed, planned and optimized once (see :func:`dask_sql.Context.prepare`)
+    and can be executed many times with different parameter values.
+    The parameter values are bound as literals when the plan is turned into
+    a dask graph, so executing the statement does not touch the SQL planner.
+
+    If the registered tables or the configuration change in between,
+    the query is transparently planned again on the next execution.
+    """
+
+    def __init__(self, context: "dask_sql.Context", sql: str, num_parameters: int):
+        self.context = context
+        self.sql = sql
+        self.num_parameters = num_parameters
+        self.hints = parse_hints(sql)
+
+        with dask_config.set(self.hints):
+            self._plan()
+
+    def execute(self, *parameters: Any, return_futures: bool = True):
+        """
+        Execute the prepared query with the given parameter values,
+        which are bound to the placeholders in order of their number.
+
+        Args:
+            parameters: One python value for each of the placeholders in the query
+            return_futures (:obj:`bool`): Return the unexecuted dask dataframe or the data itself.
+                Defaults to returning the dask dataframe.
+        Returns:
+            :obj:`dask.dataframe.DataFrame`: the created data frame of this query.
+        """
+        if len(parameters) != self.num_parameters:
+            raise ValueError(
+                f"The prepared query expects {self.num_parameters} parameters, got {len(parameters)}"
+            )
+
+        with self.context._record_timings(self.sql), dask_config.set(self.hints):
+            if self.context._get_plan_cache_key(self.sql) != self._cache_key:
+                logger.debug(
+                    "Catalog or configuration changed, planning the query again"
+                )
+                self._plan()
+
+            bound_parameters = {
+                f"${i}": _to_literal(value)
+                for i, value in enumerate(parameters, start=1)
+            }
+            with self.context._bind_parameters(bound_parameters):
+                return self.context._compute_table_from_rel(self.rel, return_futures)
+
+    __call__ = execute
+
+    def explain(self) -> str:
+        """Return the stringified relational algebra of the prepared query"""
+        return self.rel_string
+
+    def _plan(self):
+        rel, rel_string = self.context._get_ral(self.sql)
+
+        # An explicit PREPARE statement only wraps the query
+        # (and the types of the parameters) in an additional node
+        if rel.get_current_node_type() == "Prepare":
+            (rel,) = rel.get_inputs()
+
+        self.rel: "LogicalPlan" = rel
+        self.rel_string = rel_string
+        self._cache_key = self.context._get_plan_cache_key(self.sql)
+
+    def __repr__(self) -> str:
+        return f"PreparedStatement({self.sql!r})"
+
+
+def _to_literal(value: Any) -> Any:
+    """Turn python date and time objects into the same representation as SQL literals"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return np.datetime64(value)
+    return value
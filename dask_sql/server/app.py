@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import re
 from argparse import ArgumentParser
 from uuid import uuid4
 
@@ -15,6 +16,10 @@ from dask_sql.server.responses import DataResults, ErrorResults, QueryResults
 app = FastAPI()
 logger = logging.getLogger(__name__)
 
+PREPARE_PATTERN = re.compile(r"^PREPARE\s+(\w+)\s+FROM\s+(.+)$", re.I | re.S)
+EXECUTE_PATTERN = re.compile(r"^EXECUTE\s+(\w+)(?:\s+USING\s+(.+))?$", re.I | re.S)
+DEALLOCATE_PATTERN = re.compile(r"^DEALLOCATE\s+PREPARE\s+(\w+)$", re.I)
+
 
 @app.get("/v1/empty")
 async def empty(request: Request):
@@ -80,7 +85,7 @@ async def query(request: Request):
         # TODO: explore Trino which should make JDBC compatibility easier but requires
         # changing response headers (see https://github.com/dask-contrib/dask-sql/pull/351)
         sql = sql.replace("system.jdbc", "system_jdbc")
-        df = request.app.c.sql(sql)
+        df = _execute_statement(request.app, sql)
 
         if df is None:
             return DataResults(df, request)
@@ -100,6 +105,48 @@ async def query(request: Request):
         return ErrorResults(e, request=request)
 
 
+def _execute_statement(app: FastAPI, sql: str):
+    """
+    Run a single statement, which might be one of the
+    presto statements to handle prepared queries:
+    ``PREPARE name FROM <query>``, ``EXECUTE name [USING value, ...]``
+    and ``DEALLOCATE PREPARE name``.
+    """
+    statement = sql.rstrip("; ")
+
+    match = PREPARE_PATTERN.match(statement)
+    if match:
+        name, query = match.groups()
+        app.prepared_statements[name.lower()] = app.c.prepare(query)
+        return None
+
+    match = EXECUTE_PATTERN.match(statement)
+    if match:
+        name, values = match.groups()
+        try:
+            prepared_statement = app.prepared_statements[name.lower()]
+        except KeyError:
+            raise KeyError(f"Prepared statement {name} does not exist") from None
+
+        parameters = []
+        if values:
+            # Let the SQL engine evaluate the given literals
+            parameters = app.c.sql(f"SELECT {values}", return_futures=False)
+            parameters = parameters.iloc[0].tolist()
+        return prepared_statement.execute(*parameters)
+
+    match = DEALLOCATE_PATTERN.match(statement)
+    if match:
+        (name,) = match.groups()
+        try:
+            del app.prepared_statements[name.lower()]
+        except KeyError:
+            raise KeyError(f"Prepared statement {name} does not exist") from None
+        return None
+
+    return app.c.sql(sql)
+
+
 def run_server(
     context: Context = None,
     client: dask.distributed.Client = None,
@@ -272,6 +319,7 @@ def _init_app(
 ):
     app.c = context
     app.future_list = {}
+    app.prepared_statements = {}
 
     try:
         client = client or dask.distributed.Client.current()
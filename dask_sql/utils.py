@@ -1,8 +1,12 @@
 import importlib
+import itertools
 import logging
-from collections import defaultdict
+import re
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from unittest.mock import patch
 from uuid import uuid4
 
@@ -10,6 +14,9 @@ import cloudpickle
 import dask.dataframe as dd
 import numpy as np
 import pandas as pd
+from dask.sizeof import sizeof
+from dask.utils import stringify
+from distributed import futures_of, wait
 
 from dask_planner.rust import SqlTypeName
 from dask_sql.datacontainer import DataContainer
@@ -120,6 +127,241 @@ class OptimizationException(Exception):
         super().__init__(exception_string.strip())
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    Small mapping with a maximal size, which evicts the least
+    recently used entries when full. By default every entry has
+    a size of 1, so the maximal size is the maximal number of entries.
+    Hits and misses of lookups are counted to help sizing the cache.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.currsize = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """Return the stored value (and mark it as recently used) or the default"""
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, size: int = 1):
+        """Store the value, evicting the least recently used entries if needed"""
+        self.pop(key)
+        self._data[key] = (value, size)
+        self.currsize += size
+
+        while self.currsize > max(self.maxsize, 0):
+            _, (_, evicted_size) = self._data.popitem(last=False)
+            self.currsize -= evicted_size
+
+    def pop(self, key, default=None):
+        """Remove the entry and return its value (or the default if there is none)"""
+        try:
+            value, size = self._data.pop(key)
+        except KeyError:
+            return default
+
+        self.currsize -= size
+        return value
+
+    def clear(self):
+        """Remove all entries (but keep the statistics)"""
+        self._data.clear()
+        self.currsize = 0
+
+    def info(self) -> CacheInfo:
+        """Statistics of this cache, in the same form as ``functools.lru_cache``"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, self.currsize)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def persisted_nbytes(df: dd.DataFrame) -> int:
+    """
+    Memory used by the partitions of a persisted dataframe, as already known to dask
+    (for a distributed cluster, as tracked by the scheduler), without computing anything.
+    Waits until all partitions are in memory.
+    """
+    futures = futures_of(df)
+    if futures:
+        wait(futures)
+        nbytes = futures[0].client.nbytes(
+            [stringify(future.key) for future in futures], summary=False
+        )
+        return sum(nbytes.values())
+
+    graph = df.__dask_graph__()
+    return sum(sizeof(graph[key]) for key in df.__dask_keys__())
+
+
+class QueryTimings:
+    """
+    Wall clock time (in seconds) spent in the different phases of a single query:
+    parsing the SQL, creating the logical plan, optimizing it (also split up by
+    optimizer rule), converting it into a dask graph and computing the result.
+    Phases which did not run are None, e.g. parsing, planning and optimization
+    if the plan was taken from the plan cache, or the computation if the
+    query returned an uncomputed dataframe.
+    """
+
+    PHASES = ("parse", "plan", "optimize", "convert", "compute")
+
+    def __init__(self, sql: str = None):
+        self.sql = sql
+        self.parse = None
+        self.plan = None
+        self.optimize = None
+        self.convert = None
+        self.compute = None
+        self.optimizer_rules: List[Tuple[str, float]] = []
+        self.plan_cache_hit = False
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Add the time spent in the block to the given phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            setattr(self, phase, (getattr(self, phase) or 0.0) + elapsed)
+
+    @property
+    def planning(self) -> float:
+        """Time spent in the SQL planner (parsing, planning and optimization)"""
+        return sum(getattr(self, phase) or 0.0 for phase in self.PHASES[:3])
+
+    @property
+    def total(self) -> float:
+        return sum(getattr(self, phase) or 0.0 for phase in self.PHASES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The timings as a flat dictionary, e.g. for exporting them to a metrics system"""
+        timings = {phase: getattr(self, phase) for phase in self.PHASES}
+        timings.update(
+            {f"optimize.{rule}": elapsed for rule, elapsed in self.optimizer_rules}
+        )
+        return timings
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            f"{phase}={getattr(self, phase):.6f}"
+            for phase in self.PHASES
+            if getattr(self, phase) is not None
+        )
+        return f"QueryTimings({phases})"
+
+
+_QUOTED_SQL_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+# Quoted literals and identifiers as well as line and block comments
+_QUOTED_OR_COMMENT_SQL_PATTERN = re.compile(
+    r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/)", re.DOTALL
+)
+
+
+def _is_comment(part: str) -> bool:
+    return part.startswith("--") or part.startswith("/*")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalize the whitespace of a SQL string and remove its comments
+    (but not the ``/*+ ... */`` optimizer hints), so that
+    queries which only differ in their formatting are treated the same.
+    Quoted literals and identifiers are left untouched.
+    """
+    parts = _QUOTED_OR_COMMENT_SQL_PATTERN.split(sql)
+    sql = "".join(
+        " " if i % 2 and _is_comment(part) and not part.startswith("/*+") else part
+        for i, part in enumerate(parts)
+    )
+
+    parts = _QUOTED_SQL_PATTERN.split(sql.strip())
+    return "".join(
+        part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts)
+    ).rstrip("; ")
+
+
+def number_placeholders(sql: str) -> Tuple[str, int]:
+    """
+    Replace the positional ``?`` placeholders of a SQL string by numbered
+    ``$1``, ``$2``, ... placeholders, which is what the planner understands.
+    Both kinds of placeholders can not be mixed.
+    Quoted literals and identifiers as well as comments are left untouched.
+    Returns the rewritten SQL and the number of parameters it expects.
+    """
+    parts = _QUOTED_OR_COMMENT_SQL_PATTERN.split(sql)
+    code_parts = parts[::2]
+    if any("?" in part for part in code_parts) and any(
+        re.search(r"\$\d", part) for part in code_parts
+    ):
+        raise ValueError(
+            "Positional (?) and numbered ($1) parameters can not be mixed in one query"
+        )
+
+    counter = itertools.count(1)
+    num_parameters = 0
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\?", lambda _: f"${next(counter)}", parts[i])
+        ids = [int(n) for n in re.findall(r"\$(\d+)", parts[i])]
+        num_parameters = max(ids + [num_parameters])
+    return "".join(parts), num_parameters
+
+
+# Optimizer hints which can be given in a ``/*+ ... */`` comment of a query
+# and the configuration option they set for this query
+QUERY_HINTS = {
+    "split_out": "sql.aggregate.split_out",
+    "split_every": "sql.aggregate.split_every",
+    "skew_threshold": "sql.join.skew_threshold",
+}
+
+_HINT_COMMENT_PATTERN = re.compile(r"/\*\+(.*?)\*/", re.DOTALL)
+_HINT_PATTERN = re.compile(r"(\w+)\s*\(\s*([^)]*?)\s*\)")
+
+
+def parse_hints(sql: str) -> Dict[str, Any]:
+    """
+    Extract the optimizer hints of a SQL string, e.g. ``/*+ SPLIT_OUT(16) */``,
+    as a mapping of the configuration options they set to their values.
+    Unknown hints are ignored with a warning.
+    Quoted literals and identifiers are left untouched.
+    """
+    config_options = {}
+    parts = _QUOTED_SQL_PATTERN.split(sql)
+    for comment in _HINT_COMMENT_PATTERN.findall("".join(parts[::2])):
+        for name, value in _HINT_PATTERN.findall(comment):
+            try:
+                key = QUERY_HINTS[name.lower()]
+            except KeyError:
+                logger.warning(f"Ignoring unknown query hint {name}")
+                continue
+            try:
+                config_options[key] = float(value) if "." in value else int(value)
+            except ValueError:
+                raise ValueError(
+                    f"Query hint {name} expects a number, got {value!r}"
+                ) from None
+    return config_options
+
+
 class LoggableDataFrame:
     """Small helper class to print resulting dataframes or series in logging messages"""
 
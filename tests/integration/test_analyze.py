@@ -1,5 +1,7 @@
 import pandas as pd
+from dask import config as dask_config
 
+from dask_sql import Context
 from dask_sql.mappings import python_to_sql_type
 from tests.utils import assert_eq
 
@@ -33,3 +35,71 @@ def test_analyze(c, df):
     result_df = c.sql("ANALYZE TABLE df COMPUTE STATISTICS FOR COLUMNS a")
 
     assert_eq(result_df, expected_df[["a"]])
+
+
+def test_analyze_collects_statistics(c, df):
+    c.sql("ANALYZE TABLE df COMPUTE STATISTICS FOR ALL COLUMNS")
+
+    statistics = c.schema["root"].statistics["df"]
+    assert c.schema["root"].tables["df"].statistics == statistics
+    assert statistics.row_count == len(df)
+
+    a_statistics = statistics.columns["a"]
+    assert a_statistics.ndv == 3
+    assert a_statistics.null_fraction == 0
+    assert a_statistics.min == 1.0
+    assert a_statistics.max == 3.0
+    assert a_statistics.histogram[0] == 1.0
+    assert a_statistics.histogram[-1] == 3.0
+    assert len(a_statistics.histogram) == 33
+
+    b_statistics = statistics.columns["b"]
+    assert b_statistics.min == df["b"].min()
+    assert b_statistics.max == df["b"].max()
+
+    # Analyzing single columns keeps the statistics of the others
+    c.sql("ANALYZE TABLE df COMPUTE STATISTICS FOR COLUMNS a")
+    assert c.schema["root"].statistics["df"].columns["b"] == b_statistics
+
+    # Strings with NULLs
+    c.create_table(
+        "strings",
+        pd.DataFrame({"s": ["b", None, "a", "c"]}),
+        npartitions=3,
+    )
+    c.sql("ANALYZE TABLE strings COMPUTE STATISTICS FOR ALL COLUMNS")
+
+    s_statistics = c.schema["root"].statistics["strings"].columns["s"]
+    assert s_statistics.ndv == 3
+    assert s_statistics.null_fraction == 0.25
+    assert s_statistics.min == "a"
+    assert s_statistics.max == "c"
+
+
+def test_analyze_persists_statistics(tmpdir):
+    path = str(tmpdir.join("table.parquet"))
+    pd.DataFrame({"a": [1, 2, None, 4], "b": ["x", "y", "x", "y"]}).to_parquet(path)
+
+    c = Context()
+    c.create_table("df", path)
+    with dask_config.set({"sql.statistics.persist": True}):
+        c.sql("ANALYZE TABLE df COMPUTE STATISTICS FOR ALL COLUMNS")
+    statistics = c.schema["root"].statistics["df"]
+    assert statistics.columns["a"].null_fraction == 0.25
+    assert statistics.columns["b"].ndv == 2
+
+    # Another context uses the stored statistics only if they should be persisted
+    c = Context()
+    c.create_table("df", path)
+    assert c.schema["root"].statistics["df"] != statistics
+
+    with dask_config.set({"sql.statistics.persist": True}):
+        c = Context()
+        c.create_table("df", path)
+        assert c.schema["root"].statistics["df"] == statistics
+
+        # ... and the data was not changed in between
+        pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": ["x", "y", "z"]}).to_parquet(path)
+        c = Context()
+        c.create_table("df", path)
+        assert c.schema["root"].statistics["df"] != statistics
@@ -34,3 +34,34 @@ def test_statistics_explain(c, gpu):
     assert sql_string.startswith(
         "DaskTableScan(table=[[root, df]]): rowcount = 1337.0, cumulative cost = {1337.0 rows, 1338.0 cpu, 0.0 io}, id = "
     )
+
+
+def test_sql_query_explain_analyze(c):
+    df = dd.from_pandas(pd.DataFrame({"a": [1, 2, 3, 1], "b": [1, 2, 3, 4]}), 2)
+    c.create_table("df", df)
+
+    sql_string = c.sql(
+        "EXPLAIN ANALYZE SELECT a, SUM(b) AS s FROM df WHERE b > 1 GROUP BY a"
+    )
+
+    lines = sql_string.splitlines()
+    assert lines[0].split() == [
+        "Operator",
+        "Build",
+        "(ms)",
+        "Tasks",
+        "Compute",
+        "(s)",
+        "Rows",
+        "in",
+        "Rows",
+        "out",
+        "Bytes",
+        "out",
+    ]
+    assert lines[1].strip().startswith("Projection")
+    assert any("Aggregate" in line for line in lines)
+    assert any("TableScan" in line for line in lines)
+
+    # The filter keeps 3 rows, which end up in 2 groups
+    assert lines[1].split()[-2] == "2"
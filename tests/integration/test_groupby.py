@@ -116,7 +116,10 @@ def test_group_by_filtered(c):
     FROM user_table_1
     """
     )
-    expected_df = pd.DataFrame({"S1": [4], "S2": [10]}, dtype="int64")
+    # filtered aggregations are nullable, as no row might match the filter
+    expected_df = pd.DataFrame({"S1": [4], "S2": [10]}).astype(
+        {"S1": "Int64", "S2": "int64"}
+    )
 
     assert_eq(return_df, expected_df)
 
@@ -147,10 +150,48 @@ def test_group_by_filtered(c):
     FROM user_table_1
     """
     )
-    expected_df = pd.DataFrame({"S1": [4]})
+    expected_df = pd.DataFrame({"S1": [4]}, dtype="Int64")
     assert_eq(return_df, expected_df)
 
 
+def test_group_by_filtered_single_pass(c):
+    return_df = c.sql(
+        """
+    SELECT
+        user_id,
+        SUM(b) FILTER (WHERE b = 3) AS "S3",
+        SUM(b) FILTER (WHERE b = 1) AS "S1",
+        COUNT(*) FILTER (WHERE b > 1) AS "C",
+        MAX(b) FILTER (WHERE user_id > 1) AS "M",
+        AVG(b) AS "A"
+    FROM user_table_1
+    GROUP BY user_id
+    """
+    )
+    expected_df = pd.DataFrame(
+        {
+            "user_id": [1, 2, 3],
+            "S3": [3, 3, 3],
+            "S1": pd.array([None, 1, None], dtype="Int64"),
+            "C": [1, 1, 1],
+            "M": pd.array([None, 3, 3], dtype="Int64"),
+            "A": [3.0, 2.0, 3.0],
+        }
+    )
+    assert_eq(
+        return_df.sort_values("user_id"),
+        expected_df,
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # all filtered aggregations are computed with a single groupby
+    aggregation_layers = [
+        name for name in return_df.dask.layers if name.startswith("aggregate-agg")
+    ]
+    assert len(aggregation_layers) == 1
+
+
 @pytest.mark.xfail(reason="WIP DataFusion")
 def test_group_by_case(c):
     return_df = c.sql(
@@ -273,6 +314,43 @@ def test_aggregations(c):
     assert_eq(return_df.reset_index(drop=True), expected_df)
 
 
+def test_aggregations_on_objects(c):
+    df = pd.DataFrame(
+        {
+            "g": [1, 1, 2, 2, 3, 3],
+            "s": ["b", "a", "c", None, None, None],
+            "i": [6, 3, 5, 5, 7, 1],
+        }
+    )
+    c.create_table("object_table", dd.from_pandas(df, npartitions=3))
+
+    return_df = c.sql(
+        """
+    SELECT
+        g,
+        MIN(s) AS "min",
+        MAX(s) AS "max",
+        BIT_XOR(i) AS "xor"
+    FROM object_table
+    GROUP BY g
+    """
+    )
+    expected_df = pd.DataFrame(
+        {
+            "g": [1, 2, 3],
+            "min": ["a", "c", None],
+            "max": ["b", "c", None],
+            "xor": [5, 0, 6],
+        }
+    )
+
+    assert_eq(
+        return_df.sort_values("g").reset_index(drop=True),
+        expected_df,
+        check_dtype=False,
+    )
+
+
 @pytest.mark.parametrize(
     "gpu",
     [
@@ -422,9 +500,6 @@ def test_regr_aggregation(c, timeseries_df, gpu):
     )
 
 
-@pytest.mark.xfail(
-    reason="WIP DataFusion - https://github.com/dask-contrib/dask-sql/issues/753"
-)
 def test_covar_aggregation(c, timeseries_df):
     # test covar_pop
     covar_pop = c.sql(
@@ -481,6 +556,61 @@ def test_covar_aggregation(c, timeseries_df):
     )
 
 
+def test_moments_aggregation(c):
+    df = pd.DataFrame(
+        {
+            "g": [1, 1, 1, 1, 2, 2, 3] * 10,
+            "x": [1e9 + 1, 1e9 + 2, 1e9 + 3, np.nan, 1e9, 1e9 + 5, 5] * 10,
+            "y": [1.0, 3.0, 5.0, 2.0, np.nan, 4.0, 6.0] * 10,
+        }
+    )
+    c.create_table("moments_table", dd.from_pandas(df, npartitions=4))
+
+    return_df = c.sql(
+        """
+    SELECT
+        g,
+        VAR_POP(x) AS var_pop,
+        VAR_SAMP(x) AS var_samp,
+        STDDEV_POP(y) AS stddev_pop,
+        COVAR_POP(y, x) AS covar_pop,
+        COVAR_SAMP(y, x) AS covar_samp,
+        CORR(y, x) AS corr,
+        REGR_SLOPE(y, x) AS slope,
+        REGR_INTERCEPT(y, x) AS intercept,
+        REGR_SXX(y, x) AS sxx,
+        REGR_SYY(y, x) AS syy
+    FROM moments_table
+    GROUP BY g
+    """
+    )
+
+    def expected(group):
+        pairs = group.dropna()
+        slope = pairs.x.cov(pairs.y) / pairs.x.var()
+        return pd.Series(
+            {
+                "var_pop": group.x.var(ddof=0),
+                "var_samp": group.x.var(),
+                "stddev_pop": group.y.std(ddof=0),
+                "covar_pop": pairs.x.cov(pairs.y, ddof=0),
+                "covar_samp": pairs.x.cov(pairs.y),
+                "corr": pairs.x.corr(pairs.y),
+                "slope": slope,
+                "intercept": pairs.y.mean() - slope * pairs.x.mean(),
+                "sxx": ((pairs.x - pairs.x.mean()) ** 2).sum(),
+                "syy": ((pairs.y - pairs.y.mean()) ** 2).sum(),
+            }
+        )
+
+    expected_df = df.groupby("g").apply(expected).reset_index()
+    return_df = return_df.compute().sort_values("g").reset_index(drop=True)
+
+    assert_eq(return_df, expected_df, check_dtype=False)
+    # Large values of x do not lead to cancellation
+    assert return_df["var_pop"][0] == pytest.approx(2 / 3)
+
+
 @pytest.mark.parametrize(
     "input_table",
     [
@@ -596,3 +726,199 @@ def test_groupby_split_every(c, gpu):
     assert_eq(split_every_4_df, expected_df, check_index=False)
 
     c.drop_table("split_every_input")
+
+
+def test_groupby_split_out_from_statistics(c, tmpdir):
+    df = pd.DataFrame(
+        {"a": range(100), "b": [1, 2, 3, 4] * 25, "c": 1.0, "d": ["x", "y"] * 50}
+    )
+    dd.from_pandas(df, npartitions=10).to_parquet(str(tmpdir))
+    c.create_table("split_out_input", str(tmpdir), format="parquet")
+
+    config_options = {"sql.aggregate.rows_per_partition": 25}
+
+    # 100 distinct values of a (known from the parquet metadata)
+    return_df = c.sql(
+        "SELECT a, SUM(c) AS s FROM split_out_input GROUP BY a",
+        config_options=config_options,
+    )
+    assert return_df.npartitions == 4
+    assert_eq(
+        return_df.sort_values("a"),
+        df.groupby("a").agg({"c": "sum"}).reset_index().rename(columns={"c": "s"}),
+        check_index=False,
+    )
+
+    # only 4 distinct values of b
+    return_df = c.sql(
+        "SELECT b, SUM(c) AS s FROM split_out_input GROUP BY b",
+        config_options=config_options,
+    )
+    assert return_df.npartitions == 1
+
+    # the distinct values of (not analyzed) strings are unknown:
+    # the default of a single output partition is kept
+    return_df = c.sql(
+        "SELECT d, SUM(c) AS s FROM split_out_input GROUP BY d",
+        config_options=config_options,
+    )
+    assert return_df.npartitions == 1
+
+    # hints take precedence over the estimate and the configuration
+    return_df = c.sql(
+        "SELECT /*+ SPLIT_OUT(3) */ a, SUM(c) AS s FROM split_out_input GROUP BY a",
+        config_options=config_options,
+    )
+    assert return_df.npartitions == 3
+
+    return_df = c.sql(
+        "SELECT /*+ SPLIT_OUT(2) */ DISTINCT b FROM split_out_input",
+        config_options={"sql.aggregate.split_out": 4},
+    )
+    assert return_df.npartitions == 2
+    assert_eq(
+        return_df.sort_values("b"), df[["b"]].drop_duplicates(), check_index=False
+    )
+
+
+def test_approx_count_distinct(c):
+    df = pd.DataFrame(
+        {
+            "a": [1, 2, 1, 2, 1, 3] * 100,
+            "b": list(range(300)) * 2,
+            "c": ["x", "y", None] * 200,
+        }
+    )
+    c.create_table("approx_input", dd.from_pandas(df, npartitions=4))
+
+    return_df = c.sql(
+        """
+        SELECT
+            a,
+            APPROX_COUNT_DISTINCT(b) AS b,
+            APPROX_COUNT_DISTINCT(c) AS c
+        FROM approx_input
+        GROUP BY a
+        """
+    )
+    expected_df = df.groupby("a").agg({"b": "nunique", "c": "nunique"}).reset_index()
+
+    # Small cardinalities are exact (linear counting)
+    assert_eq(
+        return_df.sort_values("a"),
+        expected_df,
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # COUNT(DISTINCT) is only approximated if configured
+    query = "SELECT COUNT(DISTINCT b) AS b FROM approx_input"
+    return_df = c.sql(query)
+    assert any(
+        name.startswith("drop-duplicates") for name in return_df.__dask_graph__().layers
+    )
+
+    return_df = c.sql(
+        query, config_options={"sql.aggregate.approx_count_distinct": True}
+    )
+    assert not any(
+        name.startswith("drop-duplicates") for name in return_df.__dask_graph__().layers
+    )
+    assert_eq(return_df, pd.DataFrame({"b": [300]}), check_dtype=False)
+
+
+def test_quantile_aggregations(c):
+    df = pd.DataFrame(
+        {
+            "a": [1, 2, 1, 2, 1, 3] * 50,
+            "b": np.arange(300, dtype="float64"),
+        }
+    )
+    df.loc[::7, "b"] = np.nan
+    c.create_table("quantile_input", dd.from_pandas(df, npartitions=4))
+
+    return_df = c.sql(
+        """
+        SELECT
+            a,
+            MEDIAN(b) AS m,
+            APPROX_MEDIAN(b) AS am,
+            PERCENTILE_CONT(b, 0.25) AS p25,
+            APPROX_PERCENTILE(b, 0.9) AS p90,
+            APPROX_PERCENTILE_CONT(b, 0.9) FILTER (WHERE b > 100) AS p90_filtered
+        FROM quantile_input
+        GROUP BY a
+        """
+    )
+    grouped = df.groupby("a")["b"]
+    expected_df = pd.DataFrame(
+        {
+            "m": grouped.median(),
+            "am": grouped.median(),
+            "p25": grouped.quantile(0.25),
+            "p90": grouped.quantile(0.9),
+            "p90_filtered": df[df.b > 100].groupby("a")["b"].quantile(0.9),
+        }
+    ).reset_index()
+
+    # Groups of at most 200 values are exact
+    assert_eq(return_df.sort_values("a"), expected_df, check_index=False)
+
+    # Larger groups are approximated
+    return_df = c.sql(
+        "SELECT PERCENTILE_CONT(b, 0.5) AS m FROM quantile_input",
+        config_options={"sql.aggregate.tdigest_compression": 50},
+    )
+    median = return_df.compute()["m"].iloc[0]
+    assert abs((df["b"].dropna() < median).mean() - 0.5) < 0.02
+
+
+@pytest.mark.parametrize(
+    "group_by,grouping_sets",
+    [
+        ("ROLLUP(user_id, b)", [["user_id", "b"], ["user_id"], []]),
+        ("CUBE(user_id, b)", [["user_id", "b"], ["user_id"], ["b"], []]),
+        ("GROUPING SETS ((user_id), (b), ())", [["user_id"], ["b"], []]),
+    ],
+)
+@pytest.mark.parametrize("distinct", [False, True])
+def test_grouping_sets(c, user_table_1, group_by, grouping_sets, distinct):
+    return_df = c.sql(
+        f"""
+    SELECT
+        user_id,
+        b,
+        SUM(b) AS s,
+        COUNT({"DISTINCT " if distinct else ""}b) AS n,
+        AVG(b) AS m,
+        MIN(b) AS mi,
+        GROUPING(user_id, b) AS g
+    FROM user_table_1
+    GROUP BY {group_by}
+    """
+    )
+
+    expected_dfs = []
+    for grouping_set in grouping_sets:
+        grouped = user_table_1.assign(_all=1).groupby(grouping_set or ["_all"])["b"]
+        expected_df = pd.DataFrame(
+            {
+                "s": grouped.sum(),
+                "n": grouped.nunique() if distinct else grouped.count(),
+                "m": grouped.mean(),
+                "mi": grouped.min(),
+            }
+        ).reset_index(drop=not grouping_set)
+        expected_df = expected_df.reindex(columns=["user_id", "b", "s", "n", "m", "mi"])
+        expected_df["g"] = ("user_id" not in grouping_set) * 2 + (
+            "b" not in grouping_set
+        )
+        expected_dfs.append(expected_df)
+    expected_df = pd.concat(expected_dfs)
+
+    assert_eq(
+        return_df.sort_values(["g", "user_id", "b"]),
+        expected_df.sort_values(["g", "user_id", "b"]),
+        check_index=False,
+        check_dtype=False,
+    )
@@ -1,12 +1,17 @@
+from unittest import mock
+
 import dask.dataframe as dd
 import numpy as np
 import pandas as pd
 import pytest
+from dask import config as dask_config
 from dask.utils_test import hlg_layer
 
 from dask_sql import Context
 from dask_sql._compat import BROADCAST_JOIN_SUPPORT_WORKING
-from dask_sql.datacontainer import Statistics
+from dask_sql.datacontainer import ColumnStatistics, Statistics
+from dask_sql.physical.rel.logical.aggregate import DaskAggregatePlugin
+from dask_sql.physical.rel.logical.join import DaskJoinPlugin
 from tests.utils import assert_eq
 
 
@@ -467,6 +472,87 @@ def test_join_reorder(c):
     assert_eq(result_df, expected_df)
 
 
+def test_join_reorder_column_statistics(c):
+    df = pd.DataFrame({"a1": [1, 2, 3, 4, 5] * 2, "a2": [1, 1, 2, 2, 2] * 2})
+    df2 = pd.DataFrame({"b1": [1, 1, 2, 2, 3] * 10000, "b2": [2, 2, 2, 2, 2] * 10000})
+    df3 = pd.DataFrame({"c2": [1, 1, 2, 2, 3], "c3": [2, 3, 4, 5, 6]})
+    # a1 < 3 selects only ~2% of the rows of a according to its statistics,
+    # so the filtered a is estimated to be smaller than c
+    c.create_table(
+        "a",
+        df,
+        statistics=Statistics(10, columns={"a1": ColumnStatistics(min=1, max=100)}),
+    )
+    c.create_table("b", df2, statistics=Statistics(50000))
+    c.create_table("c", df3, statistics=Statistics(5))
+
+    query = """
+        SELECT a1, b2, c3
+        FROM a, b, c
+        WHERE b1 < 3 AND c3 < 5 AND a1 = b1 AND b2 = c2
+        LIMIT 10
+    """
+
+    explain_string = c.explain(query)
+
+    first_join = "Inner Join: b.b1 = a.a1"
+    second_join = "Inner Join: b.b2 = c.c2"
+    assert first_join in explain_string and second_join in explain_string
+    assert explain_string.index(second_join) < explain_string.index(first_join)
+
+    result_df = c.sql(query)
+    expected_df = pd.DataFrame({"a1": [1] * 10, "b2": [2] * 10, "c3": [4] * 10})
+    assert_eq(result_df, expected_df)
+
+
+def test_join_strategy_from_statistics(c):
+    large_df = pd.DataFrame({"id": range(100), "x": range(100)})
+    small_df = pd.DataFrame({"id": [1, 2, 3], "y": [4, 5, 6]})
+    c.create_table(
+        "large",
+        dd.from_pandas(large_df, npartitions=4),
+        statistics=Statistics(10**9),
+    )
+    c.create_table(
+        "small", dd.from_pandas(small_df, npartitions=2), statistics=Statistics(3)
+    )
+
+    # The small table is broadcasted
+    query = "SELECT large.id, x, y FROM large JOIN small ON large.id = small.id"
+    assert "strategy=broadcast(right)" in c.explain(query)
+
+    result_df = c.sql(query)
+    assert not any("shuffle" in name for name in result_df.dask.layers)
+    assert_eq(
+        result_df,
+        large_df.merge(small_df, on="id"),
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # The preserved side of an outer join can not be broadcasted
+    query = "SELECT small.id, x, y FROM small LEFT JOIN large ON large.id = small.id"
+    assert "strategy=shuffle" in c.explain(query)
+
+    result_df = c.sql(query)
+    assert any("shuffle" in name for name in result_df.dask.layers)
+    assert_eq(
+        result_df,
+        small_df.merge(large_df, on="id", how="left")[["id", "x", "y"]],
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # Nothing is broadcasted above the threshold
+    query = "SELECT large.id, x, y FROM large JOIN small ON large.id = small.id"
+    with dask_config.set({"sql.join.broadcast_threshold": 10}):
+        assert "strategy=shuffle" in c.explain(query)
+
+    # The configured algorithm is used for all joins
+    with dask_config.set({"sql.join.broadcast": False}):
+        assert "strategy=" not in c.explain(query)
+
+
 @pytest.mark.xfail(
     not BROADCAST_JOIN_SUPPORT_WORKING,
     reason="Broadcast Joins do not work as expected with dask<2023.1.1",
@@ -526,3 +612,434 @@ def test_broadcast_join(c, client, gpu):
     with pytest.raises(KeyError):
         hlg_layer(res_df.dask, "bcast-join")
     assert_eq(res_df, expected_df, check_index=False, scheduler="distributed")
+
+
+def test_self_join_shares_subplan(c, user_table_1):
+    with mock.patch.object(
+        DaskAggregatePlugin,
+        "convert",
+        autospec=True,
+        side_effect=DaskAggregatePlugin.convert,
+    ) as convert:
+        return_df = c.sql(
+            """
+        WITH t AS (
+            SELECT user_id, SUM(b) AS s FROM user_table_1 GROUP BY user_id
+        )
+        SELECT lhs.user_id, lhs.s, rhs.s AS s2
+        FROM t AS lhs
+        JOIN t AS rhs
+        ON lhs.user_id = rhs.user_id
+        """
+        )
+
+    # Both sides of the join are the very same subplan
+    assert convert.call_count == 1
+
+    t = user_table_1.groupby("user_id", as_index=False).agg(s=("b", "sum"))
+    expected_df = t.merge(t.rename(columns={"s": "s2"}), on="user_id")
+    assert_eq(return_df, expected_df, check_index=False, check_dtype=False)
+
+
+def test_aggregate_pushed_below_join(c):
+    fact = pd.DataFrame(
+        {
+            "dim_id": [1, 2, 3, 1, 2, 3, 1, 4] * 10,
+            "amount": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, 8.0] * 10,
+        }
+    )
+    dim = pd.DataFrame({"id": [1, 2, 3, 4], "region": ["a", "b", "a", "c"]})
+    c.create_table("fact", dd.from_pandas(fact, npartitions=3))
+    c.create_table("dim", dim)
+
+    query = """
+        SELECT
+            d.region,
+            SUM(f.amount) AS s,
+            COUNT(*) AS n,
+            COUNT(f.amount) AS n_amount,
+            MIN(f.amount) AS mi,
+            MAX(f.amount) AS ma,
+            AVG(f.amount) AS m
+        FROM fact f
+        JOIN dim d
+        ON f.dim_id = d.id
+        GROUP BY d.region
+    """
+
+    # The fact table is aggregated per join key before the join
+    explain_string = c.explain(query)
+    assert "aggr=[[SUM(f.amount) AS __partial_agg_0" in explain_string
+
+    return_df = c.sql(query)
+    expected_df = (
+        fact.merge(dim, left_on="dim_id", right_on="id")
+        .groupby("region")
+        .agg(
+            s=("amount", "sum"),
+            n=("amount", "size"),
+            n_amount=("amount", "count"),
+            mi=("amount", "min"),
+            ma=("amount", "max"),
+            m=("amount", "mean"),
+        )
+        .reset_index()
+    )
+    assert_eq(
+        return_df.sort_values("region"),
+        expected_df,
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # Aggregations of columns from both sides can not be pushed down
+    explain_string = c.explain(
+        "SELECT d.region, SUM(f.amount + d.id) FROM fact f JOIN dim d ON f.dim_id = d.id GROUP BY d.region"
+    )
+    assert "__partial_agg_0" not in explain_string
+
+    # ... and the rule can be disabled
+    with dask_config.set({"sql.optimizer.push_down_aggregate": False}):
+        assert "__partial_agg_0" not in c.explain(query)
+
+    # Nothing is pushed down if the join keys are (almost) unique
+    c.create_table(
+        "fact",
+        dd.from_pandas(fact, npartitions=3),
+        statistics=Statistics(len(fact), columns={"dim_id": ColumnStatistics(ndv=75)}),
+    )
+    assert "__partial_agg_0" not in c.explain(query)
+
+
+def test_join_co_partitioned(c):
+    lhs_df = pd.DataFrame({"id": range(100), "x": range(100)})
+    rhs_df = pd.DataFrame({"id": list(range(0, 100, 2)) * 2, "y": range(100)})
+    c.create_table(
+        "lhs",
+        dd.from_pandas(lhs_df, npartitions=3).shuffle(["id"], npartitions=4),
+        partitioned_by=["id"],
+    )
+    c.create_table(
+        "rhs",
+        dd.from_pandas(rhs_df, npartitions=5).shuffle(["id"], npartitions=4),
+        partitioned_by=["id"],
+    )
+
+    # Only the shuffles of the inputs are in the graph
+    query = "SELECT lhs.id, x, y FROM lhs JOIN rhs ON lhs.id = rhs.id"
+    assert "strategy=partitionwise" in c.explain(query)
+    result_df = c.sql(query)
+    assert len([name for name in result_df.dask.layers if "shuffle" in name]) == 2
+    assert result_df.npartitions == 4
+    assert_eq(
+        result_df,
+        lhs_df.merge(rhs_df, on="id"),
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # The partitioning is kept for following joins
+    query = """
+    SELECT l.id, x, r1.y AS y1, r2.y AS y2
+    FROM lhs AS l
+    JOIN rhs AS r1 ON l.id = r1.id
+    JOIN rhs AS r2 ON l.id = r2.id
+    """
+    assert c.explain(query).count("strategy=partitionwise") == 2
+    result_df = c.sql(query)
+    assert len([name for name in result_df.dask.layers if "shuffle" in name]) == 2
+    expected_df = lhs_df.merge(rhs_df, on="id").merge(rhs_df, on="id")
+    assert_eq(
+        result_df,
+        expected_df.rename(columns={"y_x": "y1", "y_y": "y2"}),
+        check_index=False,
+        check_dtype=False,
+    )
+
+    # Tables with a different number of partitions are shuffled again
+    c.create_table(
+        "rhs",
+        dd.from_pandas(rhs_df, npartitions=5).shuffle(["id"], npartitions=3),
+        partitioned_by=["id"],
+    )
+    query = "SELECT lhs.id, x, y FROM lhs JOIN rhs ON lhs.id = rhs.id"
+    assert "strategy=partitionwise" not in c.explain(query)
+    result_df = c.sql(query)
+    assert len([name for name in result_df.dask.layers if "shuffle" in name]) > 2
+    assert_eq(
+        result_df,
+        lhs_df.merge(rhs_df, on="id"),
+        check_index=False,
+        check_dtype=False,
+    )
+
+
+def test_join_co_partitioned_unknown_column(c):
+    with pytest.raises(ValueError):
+        c.create_table(
+            "lhs",
+            dd.from_pandas(pd.DataFrame({"id": [1]}), npartitions=1),
+            partitioned_by=["missing"],
+        )
+
+
+def test_join_runtime_filter(c, tmpdir):
+    fact_df = pd.DataFrame({"store_id": range(1000), "amount": range(1000)})
+    stores_df = pd.DataFrame(
+        {"id": [5, 17, 42, 500], "city": ["Atlanta", "Seattle", "Seattle", "Boston"]}
+    )
+    dd.from_pandas(fact_df, npartitions=10).to_parquet(str(tmpdir))
+    c.create_table(
+        "fact", dd.read_parquet(str(tmpdir)), statistics=Statistics(len(fact_df))
+    )
+    c.create_table(
+        "stores",
+        dd.from_pandas(stores_df, npartitions=2),
+        statistics=Statistics(len(stores_df)),
+    )
+
+    with dask_config.set({"sql.join.runtime_filter_threshold": "16MB"}):
+        query = """
+        SELECT store_id, amount
+        FROM fact
+        JOIN stores ON fact.store_id = stores.id
+        WHERE stores.city = 'Seattle'
+        """
+        result_df = c.sql(query)
+
+        # The range of the keys of the filtered dimension is pushed into the parquet reader
+        assert hlg_layer(result_df.dask, "read-parquet").creation_info["kwargs"][
+            "filters"
+        ] == [[("store_id", ">=", 17), ("store_id", "<=", 42)]]
+        assert_eq(
+            result_df,
+            fact_df[fact_df.store_id.isin([17, 42])],
+            check_index=False,
+            check_dtype=False,
+        )
+
+        # Without a filter on the dimension, all keys are needed anyway
+        query = (
+            "SELECT store_id, amount FROM fact JOIN stores ON fact.store_id = stores.id"
+        )
+        result_df = c.sql(query)
+        assert (
+            hlg_layer(result_df.dask, "read-parquet").creation_info["kwargs"]["filters"]
+            is None
+        )
+
+        # The preserved side of an outer join is not filtered
+        query = """
+        SELECT store_id, amount
+        FROM fact
+        LEFT JOIN (SELECT * FROM stores WHERE city = 'Seattle') AS s
+        ON fact.store_id = s.id
+        """
+        result_df = c.sql(query)
+        assert (
+            hlg_layer(result_df.dask, "read-parquet").creation_info["kwargs"]["filters"]
+            is None
+        )
+        assert_eq(result_df, fact_df, check_index=False, check_dtype=False)
+
+    # Runtime filters are disabled by default
+    query = """
+    SELECT store_id, amount
+    FROM fact
+    JOIN stores ON fact.store_id = stores.id
+    WHERE stores.city = 'Seattle'
+    """
+    result_df = c.sql(query)
+    assert (
+        hlg_layer(result_df.dask, "read-parquet").creation_info["kwargs"]["filters"]
+        is None
+    )
+
+
+def test_join_semi_anti(c, user_table_1, user_table_2):
+    # Every row of the lhs is returned at most once
+    return_df = c.sql(
+        "SELECT * FROM user_table_2 WHERE c IN (SELECT b FROM user_table_1)"
+    )
+    assert_eq(
+        return_df,
+        user_table_2[user_table_2.c.isin(user_table_1.b)],
+        check_index=False,
+    )
+
+    return_df = c.sql(
+        "SELECT * FROM user_table_2 WHERE c NOT IN (SELECT b FROM user_table_1)"
+    )
+    assert_eq(
+        return_df,
+        user_table_2[~user_table_2.c.isin(user_table_1.b)],
+        check_index=False,
+    )
+
+    # Additional conditions are checked for the pairs of rows
+    query = """
+    SELECT *
+    FROM user_table_2
+    WHERE {} (
+        SELECT *
+        FROM user_table_1
+        WHERE user_table_1.user_id = user_table_2.user_id
+        AND user_table_1.b > user_table_2.c
+    )
+    """
+    return_df = c.sql(query.format("EXISTS"))
+    assert_eq(return_df, user_table_2.iloc[:2], check_index=False)
+
+    return_df = c.sql(query.format("NOT EXISTS"))
+    assert_eq(return_df, user_table_2.iloc[2:], check_index=False)
+
+
+def test_join_anti_nulls():
+    c = Context()
+    lhs_df = pd.DataFrame({"x": [1.0, np.nan, 3.0, 4.0]})
+    c.create_table("lhs", lhs_df, npartitions=2)
+    c.create_table("rhs", pd.DataFrame({"y": [1.0, 2.0]}))
+    c.create_table("rhs_with_null", pd.DataFrame({"y": [1.0, np.nan]}))
+    c.create_table("rhs_empty", pd.DataFrame({"y": pd.Series([], dtype=float)}))
+
+    # A NULL is never NOT IN a non-empty subquery
+    return_df = c.sql("SELECT x FROM lhs WHERE x NOT IN (SELECT y FROM rhs)")
+    assert_eq(return_df, lhs_df.iloc[[2, 3]], check_index=False)
+
+    # ... and nothing is NOT IN a subquery with a NULL
+    return_df = c.sql("SELECT x FROM lhs WHERE x NOT IN (SELECT y FROM rhs_with_null)")
+    assert_eq(return_df, lhs_df.iloc[:0], check_index=False)
+
+    # ... but everything is NOT IN an empty subquery
+    return_df = c.sql("SELECT x FROM lhs WHERE x NOT IN (SELECT y FROM rhs_empty)")
+    assert_eq(return_df, lhs_df, check_index=False)
+
+    # NOT EXISTS only compares the non-null values
+    return_df = c.sql(
+        """
+        SELECT x FROM lhs
+        WHERE NOT EXISTS (SELECT y FROM rhs_with_null WHERE rhs_with_null.y = lhs.x)
+        """
+    )
+    assert_eq(return_df, lhs_df.iloc[1:], check_index=False)
+
+
+def test_join_band(c):
+    events_df = pd.DataFrame(
+        {"ts": pd.date_range("2023-01-01", periods=100, freq="H"), "id": range(100)}
+    )
+    windows_df = pd.DataFrame(
+        {
+            "t_start": pd.to_datetime(
+                ["2023-01-01 05:00", "2023-01-02 00:00", "2023-01-04 10:00"]
+            ),
+            "t_end": pd.to_datetime(
+                ["2023-01-01 07:30", "2023-01-02 00:00", "2023-01-05 00:00"]
+            ),
+            "w": [1, 2, 3],
+        }
+    )
+    c.create_table("events", dd.from_pandas(events_df, npartitions=5))
+    c.create_table("windows", dd.from_pandas(windows_df, npartitions=2))
+    cross_df = events_df.merge(windows_df, how="cross")
+
+    query = """
+    SELECT id, w
+    FROM events
+    JOIN windows ON events.ts BETWEEN windows.t_start AND windows.t_end
+    """
+    assert "strategy=band(" in c.explain(query)
+    result_df = c.sql(query)
+    assert hlg_layer(result_df.dask, "band-join")
+    # Only the pairs of partitions with overlapping ranges are joined
+    assert result_df.npartitions < 10
+    expected_df = cross_df[
+        (cross_df.ts >= cross_df.t_start) & (cross_df.ts <= cross_df.t_end)
+    ]
+    assert_eq(result_df, expected_df[["id", "w"]], check_index=False, check_dtype=False)
+
+    # Bounds given by comparisons on both sides, with an additional condition
+    result_df = c.sql(
+        """
+        SELECT id, w
+        FROM events
+        JOIN windows
+        ON windows.t_start < events.ts AND events.ts < windows.t_end AND id > w
+        """
+    )
+    assert hlg_layer(result_df.dask, "band-join")
+    expected_df = cross_df[
+        (cross_df.ts > cross_df.t_start)
+        & (cross_df.ts < cross_df.t_end)
+        & (cross_df.id > cross_df.w)
+    ]
+    assert_eq(result_df, expected_df[["id", "w"]], check_index=False, check_dtype=False)
+
+
+def test_join_cross_with_filter(c):
+    lhs_df = pd.DataFrame({"a": range(20), "x": [None, 1.0, 2.0, 3.0] * 5})
+    rhs_df = pd.DataFrame({"b": range(30)})
+    c.create_table("lhs", dd.from_pandas(lhs_df, npartitions=3))
+    c.create_table("rhs", dd.from_pandas(rhs_df, npartitions=2))
+    cross_df = lhs_df.merge(rhs_df, how="cross")
+
+    # The condition is applied within the cross join (in several batches)
+    with mock.patch.object(DaskJoinPlugin, "CROSS_JOIN_BATCH_ROWS", 50):
+        result_df = c.sql(
+            """
+            SELECT a, b
+            FROM lhs
+            JOIN rhs ON lhs.a + rhs.b = 25 OR lhs.x > rhs.b
+            """
+        )
+    assert hlg_layer(result_df.dask, "cross-join")
+    assert "strategy=cross" in c.explain(
+        "SELECT a, b FROM lhs JOIN rhs ON lhs.a + rhs.b = 25 OR lhs.x > rhs.b"
+    )
+    with pytest.raises(KeyError):
+        hlg_layer(result_df.dask, "fillna")
+    expected_df = cross_df[(cross_df.a + cross_df.b == 25) | (cross_df.x > cross_df.b)]
+    assert_eq(result_df, expected_df[["a", "b"]], check_index=False, check_dtype=False)
+
+
+def test_join_skewed_keys(c):
+    rng = np.random.default_rng(42)
+    user_ids = rng.integers(0, 100, 2000)
+    # A third of the events belongs to a single user
+    user_ids[rng.random(2000) < 0.3] = -1
+    events_df = pd.DataFrame({"user_id": user_ids, "event": range(2000)})
+    users_df = pd.DataFrame({"id": range(-1, 90), "name": range(91)})
+    c.create_table("events", dd.from_pandas(events_df, npartitions=8))
+    c.create_table("users", dd.from_pandas(users_df, npartitions=2))
+
+    for join_type in ["INNER", "LEFT"]:
+        query = """
+        SELECT {hint} event, name
+        FROM events {join_type} JOIN users ON events.user_id = users.id
+        """
+        result_df = c.sql(query.format(hint="", join_type=join_type))
+        with pytest.raises(KeyError):
+            hlg_layer(result_df.dask, "hot_key_mask")
+
+        # The rows of the hot key are joined without a shuffle
+        result_df = c.sql(
+            query.format(hint="/*+ SKEW_THRESHOLD(0.1) */", join_type=join_type)
+        )
+        assert hlg_layer(result_df.dask, "hot_key_mask")
+        expected_df = events_df.merge(
+            users_df, left_on="user_id", right_on="id", how=join_type.lower()
+        )
+        assert_eq(
+            result_df,
+            expected_df[["event", "name"]],
+            check_index=False,
+            check_dtype=False,
+        )
+
+    # The preserved side of an outer join is not replicated
+    with dask_config.set({"sql.join.skew_threshold": 0.1}):
+        result_df = c.sql(
+            "SELECT event, name FROM events RIGHT JOIN users ON events.user_id = users.id"
+        )
+    with pytest.raises(KeyError):
+        hlg_layer(result_df.dask, "hot_key_mask")
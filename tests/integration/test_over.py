@@ -115,6 +115,31 @@ def test_over_calls(c, user_table_1):
     assert_eq(return_df, expected_df, check_dtype=False, check_index=False)
 
 
+def test_over_quantiles(c, user_table_1):
+    return_df = c.sql(
+        """
+    SELECT
+        user_id,
+        b,
+        MEDIAN(b) OVER (PARTITION BY user_id ORDER BY b) AS "Q1",
+        PERCENTILE_CONT(b, 0.25) OVER (PARTITION BY user_id) AS "Q2",
+        APPROX_PERCENTILE_CONT(user_id, 0.5) OVER (ORDER BY user_id, b) AS "Q3"
+    FROM user_table_1
+    """
+    )
+    expected_df = pd.DataFrame(
+        {
+            "user_id": user_table_1.user_id,
+            "b": user_table_1.b,
+            "Q1": [2, 3, 1, 3],
+            "Q2": [1.5, 3, 1.5, 3],
+            "Q3": [2, 1, 1.5, 2],
+        }
+    )
+
+    assert_eq(return_df, expected_df, check_dtype=False, check_index=False)
+
+
 @pytest.mark.xfail(
     reason="Need to add single_value window function, see https://github.com/dask-contrib/dask-sql/issues/651"
 )
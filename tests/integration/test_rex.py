@@ -529,7 +529,6 @@ def test_integer_div(c, df_simple):
     assert_eq(df, expected_df)
 
 
-@pytest.mark.xfail(reason="Subquery expressions not yet enabled")
 def test_subqueries(c, user_table_1, user_table_2):
     df = c.sql(
         """
@@ -187,6 +187,33 @@ def test_register_and_query(app_client, df):
     assert "error" not in result
 
 
+def test_prepared_statement(app_client):
+    app_client.app.c.create_table(
+        "prepared_table", pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "x"]})
+    )
+
+    response = app_client.post(
+        "/v1/statement",
+        data="PREPARE my_query FROM SELECT a FROM prepared_table WHERE a > ? AND b = ?",
+    )
+    assert response.status_code == 200
+    assert "error" not in response.json()
+
+    response = app_client.post("/v1/statement", data="EXECUTE my_query USING 1, 'x'")
+    assert response.status_code == 200
+
+    result = get_result_or_error(app_client, response)
+    assert result["data"] == [[3]]
+
+    response = app_client.post("/v1/statement", data="DEALLOCATE PREPARE my_query")
+    assert response.status_code == 200
+    assert "error" not in response.json()
+
+    response = app_client.post("/v1/statement", data="EXECUTE my_query USING 1, 'x'")
+    assert response.status_code == 200
+    assert "error" in response.json()
+
+
 def test_inf_table(app_client, user_table_inf):
     app_client.app.c.create_table("new_table", user_table_inf)
 
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from benchmarks.datagen import TABLES, generate, table_sizes
+
+SCALE_FACTOR = 0.001
+
+
+@pytest.fixture(scope="module")
+def tpch_dir(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp("tpch"))
+    generate(SCALE_FACTOR, data_dir, partition_size=500)
+    return data_dir
+
+
+def read_table(data_dir, table_name):
+    return pd.read_parquet(f"{data_dir}/{table_name}")
+
+
+def test_datagen(tpch_dir):
+    sizes = table_sizes(SCALE_FACTOR)
+    tables = {table_name: read_table(tpch_dir, table_name) for table_name in TABLES}
+
+    assert len(tables["region"]) == 5
+    assert len(tables["nation"]) == 25
+    for table_name in ["supplier", "customer", "part", "orders"]:
+        assert len(tables[table_name]) == sizes[table_name]
+    assert len(tables["partsupp"]) == 4 * sizes["part"]
+
+    orders = tables["orders"]
+    lineitem = tables["lineitem"]
+    assert orders["o_orderkey"].is_unique
+    assert set(lineitem["l_orderkey"]) == set(orders["o_orderkey"])
+    assert (orders["o_custkey"] % 3 != 0).all()
+    assert set(lineitem["l_partkey"]) <= set(tables["part"]["p_partkey"])
+
+    # Every line item is delivered by one of the suppliers of its part
+    partsupp = tables["partsupp"]
+    supplied_parts = set(zip(partsupp["ps_partkey"], partsupp["ps_suppkey"]))
+    assert set(zip(lineitem["l_partkey"], lineitem["l_suppkey"])) <= supplied_parts
+
+    assert (lineitem["l_receiptdate"] > lineitem["l_shipdate"]).all()
+    assert set(lineitem["l_returnflag"]) <= {"R", "A", "N"}
+    assert set(orders["o_orderstatus"]) <= {"F", "O", "P"}
+
+
+def test_datagen_is_reproducible(tpch_dir, tmp_path):
+    generate(SCALE_FACTOR, str(tmp_path), partition_size=500)
+
+    for table_name in TABLES:
+        pd.testing.assert_frame_equal(
+            read_table(tpch_dir, table_name), read_table(str(tmp_path), table_name)
+        )
+
+
+@pytest.mark.queries
+def test_benchmark_queries(tpch_dir, client):
+    from benchmarks.run import create_context, load_queries, run_benchmark
+
+    queries = load_queries()
+    assert len(queries) == 22
+
+    c = create_context(tpch_dir)
+    results = run_benchmark(c, client, queries)
+
+    for name, result in results.items():
+        assert result["status"] == "ok", f"{name}: {result.get('error')}"
+        assert result["planning_time"] > 0
+        assert result["execution_time"] > 0
+        assert result["tasks"] > 0
@@ -1,11 +1,16 @@
 import os
 import sys
+from unittest import mock
 
 import dask.dataframe as dd
+import numpy as np
 import pandas as pd
 import pytest
+from dask import config as dask_config
 
 from dask_sql import Context
+from dask_sql.physical.rel import RelConverter
+from dask_sql.utils import ParsingException
 from tests.utils import assert_eq
 
 try:
@@ -342,3 +347,167 @@ def test_filepath(tmpdir):
     assert c.schema["root"].tables["df"].filepath is None
     with pytest.raises(KeyError):
         c.schema["root"].filepaths["df"]
+
+
+def test_incremental_schema_registration():
+    c = Context()
+    c.create_table("df", pd.DataFrame({"a": [1, 2, 3]}))
+    assert c.schema[c.schema_name].version == 1
+
+    # Registered tables are synced on registration, not on every query
+    with mock.patch.object(c, "_prepare_schemas", side_effect=AssertionError):
+        assert_eq(c.sql("SELECT a FROM df"), pd.DataFrame({"a": [1, 2, 3]}))
+
+        c.alter_table("df", "other_df")
+        assert c.schema[c.schema_name].version == 2
+        c.sql("SELECT a FROM other_df")
+        with pytest.raises(ParsingException):
+            c.sql("SELECT a FROM df")
+
+        c.drop_table("other_df")
+        assert c.schema[c.schema_name].version == 3
+        with pytest.raises(ParsingException):
+            c.sql("SELECT a FROM other_df")
+
+    # Changing the identifier case sensitivity requires a full rebuild
+    c.create_table("df", pd.DataFrame({"A": [1, 2, 3]}))
+    result = c.sql(
+        "SELECT a FROM df", config_options={"sql.identifier.case_sensitive": False}
+    )
+    assert_eq(result, pd.DataFrame({"a": [1, 2, 3]}))
+
+
+def test_plan_cache():
+    c = Context()
+    c.create_table("df", pd.DataFrame({"a": [1, 2, 3]}))
+
+    c.sql("SELECT a FROM df WHERE a > 1")
+    assert c.plan_cache_info().misses == 1
+    assert c.plan_cache_info().currsize == 1
+
+    # Formatting differences do not matter ...
+    with mock.patch.object(c, "_plan_sql", side_effect=AssertionError):
+        result = c.sql("SELECT  a\n FROM df WHERE a > 1;")
+    assert_eq(result, pd.DataFrame({"a": [2, 3]}), check_index=False)
+    assert c.plan_cache_info().hits == 1
+
+    # ... but literals, configuration and catalog changes do
+    c.sql("SELECT a FROM df WHERE a > 2")
+    c.sql("SELECT a FROM df WHERE a > 1", config_options={"sql.optimize": False})
+    c.create_table("df", pd.DataFrame({"a": [1, 2, 3, 4]}))
+    result = c.sql("SELECT a FROM df WHERE a > 1")
+    assert_eq(result, pd.DataFrame({"a": [2, 3, 4]}), check_index=False)
+    assert c.plan_cache_info().hits == 1
+    assert c.plan_cache_info().misses == 4
+
+    c.sql("SELECT a FROM df", config_options={"sql.plan_cache.size": 0})
+    assert c.plan_cache_info().misses == 4
+
+
+def test_prepare():
+    c = Context()
+    c.create_table("df", pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "x"]}))
+
+    query = c.prepare("SELECT a FROM df WHERE a > ? AND b = '?'")
+    assert query.num_parameters == 1
+
+    query = c.prepare("SELECT a FROM df WHERE a >= ? AND b = ?")
+    assert query.num_parameters == 2
+
+    # Executing does neither parse nor optimize again
+    with mock.patch.object(c, "_plan_sql", side_effect=AssertionError):
+        result = query.execute(1, "x")
+        assert_eq(result, pd.DataFrame({"a": [1, 3]}), check_index=False)
+
+        result = query(2, "x", return_futures=False)
+        assert_eq(result, pd.DataFrame({"a": [3]}), check_index=False)
+
+    with pytest.raises(ValueError):
+        query.execute(1)
+
+    # Catalog changes are picked up
+    c.create_table("df", pd.DataFrame({"a": [4, 5], "b": ["x", "x"]}))
+    result = query.execute(5, "x")
+    assert_eq(result, pd.DataFrame({"a": [5]}), check_index=False)
+
+    query = c.prepare("SELECT a + $1 AS a FROM df WHERE a > $1")
+    result = query.execute(4)
+    assert_eq(result, pd.DataFrame({"a": [9]}), check_index=False)
+
+    with pytest.raises(Exception):
+        c.sql("SELECT a FROM df WHERE a > $1")
+
+
+def test_result_cache():
+    c = Context()
+    c.create_table("df", pd.DataFrame({"a": [1, 2, 3]}))
+
+    with dask_config.set({"sql.result_cache.size": "1MB"}):
+        result = c.sql("SELECT a FROM df WHERE a > 1")
+        assert c.result_cache_info().misses == 1
+        assert 0 < c.result_cache_info().currsize <= 1e6
+
+        # The same plan on the same tables is not computed again
+        with mock.patch.object(RelConverter, "convert", side_effect=AssertionError):
+            cached_result = c.sql("SELECT a FROM df WHERE a > 1")
+        assert cached_result is result
+        assert c.result_cache_info().hits == 1
+
+        # Changed tables are picked up
+        c.create_table("df", pd.DataFrame({"a": [1, 2, 3, 4]}))
+        result = c.sql("SELECT a FROM df WHERE a > 1", return_futures=False)
+        assert_eq(result, pd.DataFrame({"a": [2, 3, 4]}), check_index=False)
+        assert c.result_cache_info().misses == 2
+
+        # Results of volatile functions are not cached at all
+        cache_info = c.result_cache_info()
+        c.sql("SELECT a, RAND() AS r FROM df")
+        c.sql("SELECT a, RAND() AS r FROM df")
+        c.sql("SELECT a, CURRENT_TIMESTAMP AS t FROM df")
+        assert c.result_cache_info() == cache_info
+
+        # Replaced functions are picked up
+        c.register_function(lambda x: x + 1, "f", [("x", np.int64)], np.int64)
+        c.sql("SELECT f(a) AS b FROM df")
+        c.register_function(
+            lambda x: x + 2, "f", [("x", np.int64)], np.int64, replace=True
+        )
+        result = c.sql("SELECT f(a) AS b FROM df", return_futures=False)
+        assert_eq(result, pd.DataFrame({"b": [3, 4, 5, 6]}), check_index=False)
+        assert c.result_cache_info().misses == 4
+
+        # Results larger than the budget are not kept
+        with dask_config.set({"sql.result_cache.size": 1}):
+            c.sql("SELECT a + 1 AS b FROM df")
+        assert c.result_cache_info().currsize == 0
+
+    c.sql("SELECT a FROM df WHERE a > 1")
+    assert c.result_cache_info().misses == 5
+
+
+def test_query_timings():
+    c = Context()
+    c.create_table("df", pd.DataFrame({"a": [1, 2, 3]}))
+
+    reported_timings = []
+    c.register_timings_callback(reported_timings.append)
+
+    c.sql("SELECT a FROM df WHERE a > 1", return_futures=False)
+    timings = c.last_query_timings
+    assert reported_timings == [timings]
+    assert timings.sql == "SELECT a FROM df WHERE a > 1"
+    assert not timings.plan_cache_hit
+    for phase in ["parse", "plan", "optimize", "convert", "compute"]:
+        assert getattr(timings, phase) >= 0
+    assert timings.planning <= timings.total
+    assert "push_down_filter" in [rule for rule, _ in timings.optimizer_rules]
+    assert "optimize.push_down_filter" in timings.to_dict()
+
+    # Cached plans skip the planner and lazy results are not computed
+    c.sql("SELECT a FROM df WHERE a > 1")
+    timings = c.last_query_timings
+    assert len(reported_timings) == 2
+    assert timings.plan_cache_hit
+    assert timings.parse is None and timings.optimize is None
+    assert timings.convert >= 0
+    assert timings.compute is None
@@ -0,0 +1,47 @@
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from dask_sql.physical.utils.runtime_filter import (
+    BloomFilter,
+    compute_runtime_filter,
+    filter_partition,
+)
+from dask_sql.physical.utils.sketches import hash_values
+
+
+def test_bloom_filter():
+    rng = np.random.default_rng(42)
+    values = pd.Series(rng.choice(10**9, size=10_000, replace=False))
+    bloom_filter = BloomFilter.from_hashes(hash_values(values[:5_000]))
+
+    # No false negatives and about the requested rate of false positives
+    assert bloom_filter.might_contain(hash_values(values[:5_000])).all()
+    assert bloom_filter.might_contain(hash_values(values[5_000:])).mean() < 0.02
+
+
+def test_compute_runtime_filter():
+    df = pd.DataFrame(
+        {
+            "a": [1, 5, None, 3, 8, 2],
+            "b": ["x", "y", "z", "x", None, "y"],
+        }
+    )
+    ddf = dd.from_pandas(df, npartitions=3)
+
+    runtime_filter = compute_runtime_filter(ddf, ["a", "b"], True, [True, False])
+    # Rows with NULL keys are ignored
+    assert runtime_filter.num_keys == 4
+    assert runtime_filter.ranges == [(1, 5), None]
+
+    probe_df = pd.DataFrame(
+        {"a": [1.0, 5.0, 5.0, None, 4.0], "b": ["x", "y", "x", "z", "x"]}
+    )
+    result = filter_partition(probe_df, ["a", "b"], runtime_filter.bloom_filter)
+    keys = set(zip(result["a"], result["b"]))
+    assert {(1.0, "x"), (5.0, "y")} <= keys
+    assert not result["a"].isna().any()
+
+    runtime_filter = compute_runtime_filter(ddf[ddf.a > 10], ["a"], True, [True])
+    assert runtime_filter.num_keys == 0
+    assert runtime_filter.ranges == [None]
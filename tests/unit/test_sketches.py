@@ -0,0 +1,90 @@
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+import pytest
+
+from dask_sql.physical.utils.sketches import HyperLogLogAggregation, TDigestAggregation
+from tests.utils import assert_eq
+
+
+@pytest.mark.parametrize("precision", [10, 14])
+def test_hyperloglog_aggregation(precision):
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        {
+            "key": rng.integers(0, 4, size=100_000),
+            "value": rng.integers(0, 50_000, size=100_000).astype("float64"),
+        }
+    )
+    df.loc[::10, "value"] = np.nan
+    ddf = dd.from_pandas(df, npartitions=8)
+
+    result = (
+        ddf.groupby("key")["value"]
+        .agg(HyperLogLogAggregation("hll", precision=precision), split_every=2)
+        .compute()
+        .sort_index()
+    )
+    expected = df.groupby("key")["value"].nunique().sort_index()
+
+    assert result.dtype == "int64"
+    assert (result.index == expected.index).all()
+    # at least four standard errors
+    tolerance = 4 * 1.04 / np.sqrt(2**precision)
+    assert (abs(result - expected) / expected < tolerance).all()
+
+
+def test_hyperloglog_aggregation_small_groups():
+    df = pd.DataFrame(
+        {"key": [1, 1, 2, 2, 2, 3], "value": ["a", "a", "b", "c", "d", None]}
+    )
+    ddf = dd.from_pandas(df, npartitions=3)
+
+    result = ddf.groupby("key")["value"].agg(HyperLogLogAggregation("hll")).compute()
+
+    assert result.sort_index().tolist() == [1, 3, 0]
+
+
+def test_hyperloglog_aggregation_bad_precision():
+    with pytest.raises(ValueError):
+        HyperLogLogAggregation("hll", precision=20)
+
+
+@pytest.mark.parametrize("quantile", [0.01, 0.5, 0.99])
+def test_tdigest_aggregation(quantile):
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        {"key": rng.integers(0, 4, size=100_000), "value": rng.normal(size=100_000)}
+    )
+    df.loc[::10, "value"] = np.nan
+    ddf = dd.from_pandas(df, npartitions=8)
+
+    result = (
+        ddf.groupby("key")["value"]
+        .agg(TDigestAggregation("tdigest", quantile), split_every=2)
+        .compute()
+    )
+
+    assert result.dtype == "float64"
+    for key, value in result.items():
+        values = df.loc[df.key == key, "value"].dropna()
+        # compare the ranks, as the values are dense around the median
+        assert abs((values < value).mean() - quantile) < 0.005
+
+
+def test_tdigest_aggregation_small_groups():
+    df = pd.DataFrame(
+        {"key": [1, 1, 1, 2, 2, 3], "value": [1.0, 5.0, 2.0, 4.0, None, None]}
+    )
+    ddf = dd.from_pandas(df, npartitions=3)
+
+    result = ddf.groupby("key")["value"].agg(TDigestAggregation("tdigest", 0.3))
+
+    assert_eq(result, df.groupby("key")["value"].quantile(0.3), check_names=False)
+
+
+def test_tdigest_aggregation_bad_arguments():
+    with pytest.raises(ValueError):
+        TDigestAggregation("tdigest", 1.5)
+    with pytest.raises(ValueError):
+        TDigestAggregation("tdigest", 0.5, compression=5)
@@ -0,0 +1,35 @@
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from dask_sql.physical.utils.skew import find_hot_keys, hot_key_mask
+
+
+def test_find_hot_keys():
+    rng = np.random.default_rng(42)
+    keys = rng.integers(0, 1000, 20_000)
+    keys[rng.random(20_000) < 0.3] = 7
+    keys[rng.random(20_000) < 0.1] = 13
+    lhs = dd.from_pandas(pd.DataFrame({"a": keys}), npartitions=5)
+    rhs = dd.from_pandas(pd.DataFrame({"a": range(1000)}), npartitions=2)
+
+    assert find_hot_keys(lhs, rhs, ["a"], ["left", "right"], 0.05) == (
+        "left",
+        [(7,), (13,)],
+    )
+    assert find_hot_keys(lhs, rhs, ["a"], ["left"], 0.2) == ("left", [(7,)])
+    assert find_hot_keys(lhs, rhs, ["a"], ["right"], 0.05) is None
+
+    # Keys, which are hot on both sides, are not replicated
+    assert find_hot_keys(lhs, lhs, ["a"], ["left", "right"], 0.05) is None
+
+
+def test_hot_key_mask():
+    df = pd.DataFrame({"a": [1, 2, None, 1], "b": ["x", "x", "x", "y"]})
+    hot_keys = pd.MultiIndex.from_tuples([(1.0, "x"), (2.0, "y")])
+    assert hot_key_mask(df, ["a", "b"], hot_keys).tolist() == [
+        True,
+        False,
+        False,
+        False,
+    ]
@@ -3,8 +3,11 @@ import pandas as pd
 import pytest
 
 from dask_sql import Context
-from dask_sql.datacontainer import Statistics
-from dask_sql.physical.utils.statistics import parquet_statistics
+from dask_sql.datacontainer import ColumnStatistics
+from dask_sql.physical.utils.statistics import (
+    merge_column_statistics,
+    parquet_statistics,
+)
 
 
 @pytest.mark.parametrize("parallel", [None, False, 2])
@@ -57,5 +60,37 @@ def test_dc_statistics(parquet_ddf):
     c = Context()
     c.create_table("df", parquet_ddf)
 
-    assert c.schema["root"].tables["df"].statistics == Statistics(row_count=15)
-    assert c.schema["root"].statistics["df"] == Statistics(row_count=15)
+    statistics = c.schema["root"].tables["df"].statistics
+    assert statistics.row_count == 15
+    assert c.schema["root"].statistics["df"] == statistics
+
+    # Column statistics are read from the parquet metadata
+    assert statistics.columns["b"] == ColumnStatistics(null_fraction=0.0, min=0, max=14)
+    assert statistics.columns["c"] == ColumnStatistics(
+        null_fraction=0.0, min="A", max="A"
+    )
+
+
+def test_merge_column_statistics():
+    statistics = [
+        {
+            "num-rows": 3,
+            "columns": [
+                {"name": "a", "min": 1, "max": 5, "null_count": 1},
+                {"name": "b", "min": 0.5, "max": 1.5, "null_count": None},
+            ],
+        },
+        {
+            "num-rows": 1,
+            "columns": [
+                {"name": "a", "min": 0, "max": 3, "null_count": 0},
+                {"name": "b", "min": 0.0, "max": 2.5, "null_count": 0},
+                {"name": "c", "min": 0, "max": 1, "null_count": 0},
+            ],
+        },
+    ]
+
+    assert merge_column_statistics(statistics) == {
+        "a": ColumnStatistics(null_fraction=0.25, min=0, max=5),
+        "b": ColumnStatistics(min=0.0, max=2.5),
+    }
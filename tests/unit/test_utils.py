@@ -2,7 +2,15 @@ import pandas as pd
 import pytest
 from dask import dataframe as dd
 
-from dask_sql.utils import Pluggable, is_frame
+from dask_sql.utils import (
+    LRUCache,
+    Pluggable,
+    QueryTimings,
+    is_frame,
+    normalize_sql,
+    number_placeholders,
+    parse_hints,
+)
 
 
 def test_is_frame_for_frame():
@@ -52,3 +60,126 @@ def test_overwrite():
 
     assert PluginTest1.get_plugin("some_key") == "value_2"
     assert PluginTest1().get_plugin("some_key") == "value_2"
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    # "b" was the least recently used entry
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.info() == (2, 1, 2, 2)
+
+    cache.maxsize = 0
+    cache.put("d", 4)
+    assert len(cache) == 0
+
+
+def test_lru_cache_sizes():
+    cache = LRUCache(maxsize=10)
+
+    cache.put("a", 1, size=4)
+    cache.put("b", 2, size=4)
+    assert cache.info().currsize == 8
+
+    # Replacing an entry does not count twice
+    cache.put("b", 3, size=5)
+    assert cache.info().currsize == 9
+    assert cache.get("b") == 3
+
+    cache.put("c", 4, size=3)
+    assert "a" not in cache
+    assert cache.info().currsize == 8
+
+    # Entries larger than the cache are not kept
+    cache.put("d", 5, size=11)
+    assert len(cache) == 0
+    assert cache.info().currsize == 0
+
+    cache.put("e", 6, size=2)
+    assert cache.pop("e") == 6
+    assert cache.pop("e") is None
+    assert cache.info().currsize == 0
+
+
+def test_normalize_sql():
+    assert normalize_sql("SELECT  a,\n\tb FROM df ;") == "SELECT a, b FROM df"
+    assert (
+        normalize_sql("SELECT 'a  b', \"c  d\"  FROM df")
+        == "SELECT 'a  b', \"c  d\" FROM df"
+    )
+    assert normalize_sql("SELECT 'it''s  ok'  ") == "SELECT 'it''s  ok'"
+
+    # Comments are removed, but not the line breaks ending them
+    assert (
+        normalize_sql("SELECT a FROM df -- comment\nWHERE a > 1")
+        == "SELECT a FROM df WHERE a > 1"
+    )
+    assert normalize_sql("SELECT a FROM df -- comment WHERE a > 1") == (
+        "SELECT a FROM df"
+    )
+    assert normalize_sql("SELECT /* a\n comment */ a, '--' FROM df") == (
+        "SELECT a, '--' FROM df"
+    )
+    assert normalize_sql("SELECT /*+ SPLIT_OUT(2) */ a FROM df") == (
+        "SELECT /*+ SPLIT_OUT(2) */ a FROM df"
+    )
+
+
+def test_number_placeholders():
+    assert number_placeholders("SELECT a FROM df") == ("SELECT a FROM df", 0)
+    assert number_placeholders("SELECT ? + ? FROM df WHERE b = '?'") == (
+        "SELECT $1 + $2 FROM df WHERE b = '?'",
+        2,
+    )
+    assert number_placeholders('SELECT "?" FROM df WHERE a > $2') == (
+        'SELECT "?" FROM df WHERE a > $2',
+        2,
+    )
+    assert number_placeholders("SELECT ? -- why?\nFROM df /* or ? */") == (
+        "SELECT $1 -- why?\nFROM df /* or ? */",
+        1,
+    )
+
+    with pytest.raises(ValueError):
+        number_placeholders("SELECT a FROM df WHERE a = $1 AND b = ?")
+
+
+def test_parse_hints():
+    assert parse_hints("SELECT a FROM df") == {}
+    assert parse_hints(
+        "SELECT /*+ SPLIT_OUT(16) split_every( 4 ) */ a FROM df GROUP BY a"
+    ) == {"sql.aggregate.split_out": 16, "sql.aggregate.split_every": 4}
+    assert parse_hints("SELECT '/*+ SPLIT_OUT(16) */' FROM df") == {}
+    assert parse_hints("SELECT /*+ UNKNOWN(1) */ a FROM df") == {}
+    assert parse_hints("SELECT /*+ SKEW_THRESHOLD(0.1) */ a FROM df") == {
+        "sql.join.skew_threshold": 0.1
+    }
+
+    with pytest.raises(ValueError):
+        parse_hints("SELECT /*+ SPLIT_OUT(many) */ a FROM df")
+
+
+def test_query_timings():
+    timings = QueryTimings("SELECT 1")
+    assert timings.total == 0
+    assert timings.to_dict()["parse"] is None
+
+    with timings.measure("parse"):
+        pass
+    with timings.measure("compute"):
+        pass
+    timings.optimizer_rules = [("simplify_expressions", 0.5)]
+
+    assert timings.parse >= 0
+    assert timings.plan is None
+    assert timings.planning == timings.parse
+    assert timings.total == timings.parse + timings.compute
+    assert timings.to_dict()["optimize.simplify_expressions"] == 0.5
+    assert repr(timings).startswith("QueryTimings(parse=")